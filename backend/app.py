@@ -1,30 +1,45 @@
 # backend/app.py
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Header, Depends, Body
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Header, Depends, Body, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from typing import List, Optional, Dict, Any, Tuple, Iterable
 from fastapi import Form
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
+from pathlib import Path
 from datetime import datetime
 import logging
 import uuid
-import json
+import orjson
 import hashlib
-import hmac
 import secrets
+import threading
+import time
+from itertools import islice
+from collections import OrderedDict
 from backend.services.parser import DocumentParser
-from backend.services.embedding import EmbeddingService
+from backend.services.embedding import EmbeddingService, quantize_embedding, dequantize_embedding
 from backend.services.scoring import ScoringEngine
 from backend.config import Config
 from backend.database.mongodb import MongoDB 
+from backend.utils.security import hash_password, verify_password, needs_rehash, PASSWORD_ALGO, DUMMY_RECORD
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Simple JSON file-backed storage (fallback to local storage so app runs without MongoDB)
+# Each collection is loaded once into memory (dict keyed by _id). Writes mutate the
+# in-memory dict and are appended to a per-collection JSONL write-ahead log; the JSON
+# snapshot is only rewritten when the WAL grows past WAL_COMPACT_THRESHOLD entries.
+# Reads are served from memory; writes are write-through to the WAL, so async handlers
+# call the insert_* methods via asyncio.to_thread to keep file I/O off the event loop.
 class LocalStorage:
+    WAL_COMPACT_THRESHOLD = int(os.getenv('WAL_COMPACT_THRESHOLD', 200))
+
     def __init__(self, data_dir="data"):
         os.makedirs(data_dir, exist_ok=True)
         self.data_dir = data_dir
@@ -33,97 +48,257 @@ class LocalStorage:
         self.evals_path = os.path.join(data_dir, "evaluations.json")
         self.recruiters_path = os.path.join(data_dir, "recruiters.json")
         self.apps_path = os.path.join(data_dir, "applications.json")
+        # handlers may call into storage from worker threads, so guard mutations
+        self._lock = threading.RLock()
+        self._wal_counts: Dict[str, int] = {}
+        # bumped on every write to a collection; stands in for file mtime now that writes go to the WAL
+        self._versions: Dict[str, int] = {}
+        # (path, limit) -> (version, docs) for the listing endpoints
+        self._listing_cache: Dict[Tuple[str, int], Tuple[int, List[dict]]] = {}
         self._ensure_files()
 
+        self._resumes = self._load_collection(self.resumes_path)
+        self._jobs = self._load_collection(self.jobs_path)
+        self._evals = self._load_collection(self.evals_path)
+        self._recruiters = self._load_collection(self.recruiters_path)
+        self._apps = self._load_collection(self.apps_path)
+
+        # secondary indexes
+        self._jobs_by_job_id = {j['job_id']: j for j in self._jobs.values() if j.get('job_id')}
+        self._employees_by_api_key = {r['emp_api_key']: r for r in self._recruiters.values() if r.get('emp_api_key')}
+        self._recruiters_by_api_key = {r['api_key']: r for r in self._recruiters.values() if r.get('api_key')}
+        self._employees_by_email_lower: Dict[str, List[dict]] = {}
+        for r in self._recruiters.values():
+            self._index_employee_email(r)
+        self._evals_by_job_id: Dict[str, List[dict]] = {}
+        for e in self._evals.values():
+            self._evals_by_job_id.setdefault(e.get('job_id'), []).append(e)
+        # sha256 of the uploaded bytes / job text -> _id, used to skip re-parsing identical uploads
+        self._content_hash_index = {r['content_sha256']: r['_id'] for r in self._resumes.values() if r.get('content_sha256')}
+        self._job_hash_index = {j['content_sha256']: j['_id'] for j in self._jobs.values() if j.get('content_sha256')}
+
+        # (resume_id, job_id) -> (cached_at, evaluation), oldest first; entries expire after Config.EVAL_CACHE_TTL
+        # seconds and at most Config.EVAL_CACHE_MAX are kept
+        self._eval_cache: "OrderedDict[Tuple[str, str], Tuple[float, dict]]" = OrderedDict()
+
     def _ensure_files(self):
+        # one directory listing instead of a stat per collection file
+        with os.scandir(self.data_dir) as it:
+            existing = {e.name for e in it}
         for p in [self.resumes_path, self.jobs_path, self.evals_path,
                   self.recruiters_path, self.apps_path]:
-            if not os.path.exists(p):
-                with open(p, 'w', encoding='utf-8') as f:
-                    json.dump([], f)
+            if os.path.basename(p) not in existing:
+                with open(p, 'wb') as f:
+                    f.write(b'[]')
 
     def _load(self, path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
 
     def _save(self, path, data):
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+    def _index_employee_email(self, doc: dict):
+        # only records that can actually log in (employees with a password) go in the email index
+        if doc.get('email') and doc.get('password_hash') and doc.get('salt'):
+            self._employees_by_email_lower.setdefault(doc['email'].lower(), []).append(doc)
+
+    # embeddings stay float lists in memory but are written to disk int8-quantized (base64 + scale)
+    def _encode_doc(self, doc: dict) -> dict:
+        emb = doc.get('embeddings')
+        if not Config.QUANTIZE_STORED_EMBEDDINGS or not isinstance(emb, list) or not emb:
+            return doc
+        out = {k: v for k, v in doc.items() if k != 'embeddings'}
+        out.update(quantize_embedding(emb))
+        return out
+
+    def _decode_doc(self, doc: dict) -> dict:
+        if 'embeddings_int8' in doc:
+            doc['embeddings'] = dequantize_embedding(doc.pop('embeddings_int8'), doc.pop('embeddings_scale'))
+        return doc
+
+    def _wal_path(self, path):
+        return path + '.wal'
+
+    def _load_collection(self, path) -> Dict[str, dict]:
+        """Load the JSON snapshot and replay any WAL entries written since the last compaction."""
+        docs = {}
+        for doc in self._load(path):
+            docs[doc.get('_id') or str(uuid.uuid4())] = self._decode_doc(doc)
+        wal_count = 0
+        wal_path = self._wal_path(path)
+        if os.path.exists(wal_path):
+            with open(wal_path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        doc = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # torn write from a crash mid-append; everything before it is intact
+                        logger.warning(f"Skipping corrupt WAL entry in {wal_path}")
+                        continue
+                    docs[doc['_id']] = self._decode_doc(doc)
+                    wal_count += 1
+        self._wal_counts[path] = wal_count
+        return docs
+
+    def _append(self, path, collection: Dict[str, dict], doc: dict):
+        self._append_many(path, collection, [doc])
+
+    def _append_many(self, path, collection: Dict[str, dict], docs: List[dict]):
+        """Append several documents to the WAL in a single write."""
+        with self._lock:
+            for doc in docs:
+                collection[doc['_id']] = doc
+            self._versions[path] = self._versions.get(path, 0) + 1
+            with open(self._wal_path(path), 'ab') as f:
+                f.write(b''.join(orjson.dumps(self._encode_doc(doc), option=orjson.OPT_NON_STR_KEYS) + b'\n'
+                                 for doc in docs))
+            self._wal_counts[path] = self._wal_counts.get(path, 0) + len(docs)
+            if self._wal_counts[path] > self.WAL_COMPACT_THRESHOLD:
+                self.compact(path, collection)
+
+    def compact(self, path, collection: Dict[str, dict]):
+        """Rewrite the JSON snapshot from memory and truncate the WAL."""
+        with self._lock:
+            tmp_path = path + '.tmp'
+            self._save(tmp_path, [self._encode_doc(d) for d in collection.values()])
+            os.replace(tmp_path, path)
+            open(self._wal_path(path), 'wb').close()
+            self._wal_counts[path] = 0
+
+    def compact_all(self):
+        for path, collection in [(self.resumes_path, self._resumes), (self.jobs_path, self._jobs),
+                                 (self.evals_path, self._evals), (self.recruiters_path, self._recruiters),
+                                 (self.apps_path, self._apps)]:
+            if self._wal_counts.get(path):
+                self.compact(path, collection)
 
     # resumes
     def insert_resume(self, resume_doc: dict) -> str:
-        data = self._load(self.resumes_path)
         resume_id = str(uuid.uuid4())
         resume_doc['_id'] = resume_id
         resume_doc['created_at'] = datetime.utcnow().isoformat()
-        data.append(resume_doc)
-        self._save(self.resumes_path, data)
+        with self._lock:
+            self._append(self.resumes_path, self._resumes, resume_doc)
+            if resume_doc.get('content_sha256'):
+                self._content_hash_index[resume_doc['content_sha256']] = resume_id
         return resume_id
 
     def get_resume_by_id(self, resume_id: str) -> Optional[dict]:
-        data = self._load(self.resumes_path)
-        for r in data:
-            if r.get('_id') == resume_id:
-                return r
-        return None
+        return self._resumes.get(resume_id)
+
+    def update_resumes(self, resume_docs: List[dict], invalidate: bool = True):
+        """Re-persist resumes changed in place in one WAL write.
+
+        Pass invalidate=False for embedding write-backs: a backfilled vector changes no evaluation input.
+        """
+        if resume_docs:
+            self._append_many(self.resumes_path, self._resumes, resume_docs)
+            if invalidate:
+                # their cached evaluations were scored from the old record
+                self.invalidate_evaluations(resume_ids={doc['_id'] for doc in resume_docs})
+
+    def get_resume_id_by_content_hash(self, content_sha256: str) -> Optional[str]:
+        return self._content_hash_index.get(content_sha256)
 
     # jobs
     def insert_job_description(self, job_doc: dict) -> str:
-        data = self._load(self.jobs_path)
         job_id = job_doc.get('job_id') or str(uuid.uuid4())
         job_doc['_id'] = job_id
         job_doc['created_at'] = datetime.utcnow().isoformat()
-        data.append(job_doc)
-        self._save(self.jobs_path, data)
+        with self._lock:
+            self._append(self.jobs_path, self._jobs, job_doc)
+            if job_doc.get('job_id'):
+                self._jobs_by_job_id[job_doc['job_id']] = job_doc
+            if job_doc.get('content_sha256'):
+                self._job_hash_index[job_doc['content_sha256']] = job_id
         return job_id
 
     def get_job_by_id(self, job_id: str) -> Optional[dict]:
-        data = self._load(self.jobs_path)
-        for j in data:
-            if j.get('_id') == job_id or j.get('job_id') == job_id:
-                return j
-        return None
+        return self._jobs.get(job_id) or self._jobs_by_job_id.get(job_id)
+
+    def update_job(self, job_doc: dict, invalidate: bool = True):
+        self._append(self.jobs_path, self._jobs, job_doc)
+        if invalidate:
+            self.invalidate_evaluations(job_ids={job_doc['_id']})
+
+    def get_job_id_by_content_hash(self, content_sha256: str) -> Optional[str]:
+        return self._job_hash_index.get(content_sha256)
 
     # evaluations
     def insert_evaluation(self, eval_doc: dict) -> str:
-        data = self._load(self.evals_path)
-        eval_id = str(uuid.uuid4())
-        eval_doc['_id'] = eval_id
-        eval_doc['evaluated_at'] = datetime.utcnow().isoformat()
-        data.append(eval_doc)
-        self._save(self.evals_path, data)
-        return eval_id
+        return self.insert_evaluations([eval_doc])[0]
+
+    def insert_evaluations(self, eval_docs: List[dict]) -> List[str]:
+        # callers may pre-assign _id so they can answer before the write lands
+        evaluated_at = datetime.utcnow().isoformat()
+        for eval_doc in eval_docs:
+            eval_doc.setdefault('_id', str(uuid.uuid4()))
+            eval_doc['evaluated_at'] = evaluated_at
+        with self._lock:
+            self._append_many(self.evals_path, self._evals, eval_docs)
+            for eval_doc in eval_docs:
+                self._evals_by_job_id.setdefault(eval_doc.get('job_id'), []).append(eval_doc)
+        return [eval_doc['_id'] for eval_doc in eval_docs]
 
     def get_evaluations_by_job(self, job_id: str, min_score: Optional[int] = None) -> List[dict]:
-        data = self._load(self.evals_path)
-        res = [e for e in data if e.get('job_id') == job_id]
+        res = list(self._evals_by_job_id.get(job_id, []))
         if min_score:
             res = [e for e in res if e.get('relevance_score', 0) >= min_score]
         return res
 
+    def get_cached_evaluation(self, resume_id: str, job_id: str) -> Optional[dict]:
+        entry = self._eval_cache.get((resume_id, job_id))
+        if not entry:
+            return None
+        cached_at, evaluation = entry
+        if time.monotonic() - cached_at > Config.EVAL_CACHE_TTL:
+            with self._lock:
+                self._eval_cache.pop((resume_id, job_id), None)
+            return None
+        return evaluation
+
+    def cache_evaluation(self, resume_id: str, job_id: str, evaluation: dict):
+        now = time.monotonic()
+        with self._lock:
+            self._eval_cache[(resume_id, job_id)] = (now, evaluation)
+            self._eval_cache.move_to_end((resume_id, job_id))
+            # insertion order is age order: sweep expired entries off the front, then trim to the size bound
+            while self._eval_cache:
+                cached_at, _ = next(iter(self._eval_cache.values()))
+                if now - cached_at <= Config.EVAL_CACHE_TTL and len(self._eval_cache) <= Config.EVAL_CACHE_MAX:
+                    break
+                self._eval_cache.popitem(last=False)
+
+    def invalidate_evaluations(self, resume_ids: Iterable[str] = (), job_ids: Iterable[str] = ()):
+        """Drop cached evaluations involving any of the given resumes or jobs, in one pass over the cache."""
+        resume_ids, job_ids = set(resume_ids), set(job_ids)
+        with self._lock:
+            for key in list(self._eval_cache):
+                if key[0] in resume_ids or key[1] in job_ids:
+                    self._eval_cache.pop(key, None)
+
     # applications (student applies to a job)
     def insert_application(self, app_doc: dict) -> str:
-        data = self._load(self.apps_path)
-        app_id = str(uuid.uuid4())
-        app_doc['_id'] = app_id
+        app_id = app_doc.setdefault('_id', str(uuid.uuid4()))
         app_doc['created_at'] = datetime.utcnow().isoformat()
-        data.append(app_doc)
-        self._save(self.apps_path, data)
+        self._append(self.apps_path, self._apps, app_doc)
         return app_id
 
     # recruiters (simple API-key based auth for demo)
     def insert_employee(self, emp_doc: dict) -> str:
         """
         Create an employee record for simple email/password login.
-        Stores salted SHA256 password hash (demo only).
+        Stores a salted scrypt password hash.
         Returns generated emp_api_key.
         """
-        data = self._load(self.recruiters_path)  # reuse same file or create a new employees file if you want
         # You may want a separate file; for simplicity we use recruiters_path but mark type
         emp_id = str(uuid.uuid4())
-        salt = secrets.token_hex(8)
-        pw = emp_doc.get('password', '')
-        pw_hash = hashlib.sha256((salt + pw).encode('utf-8')).hexdigest()
+        salt, pw_hash = hash_password(emp_doc.get('password', ''))
         emp_doc_record = {
             "_id": emp_id,
             "email": emp_doc.get("email"),
@@ -131,65 +306,79 @@ class LocalStorage:
             "company": emp_doc.get("company"),
             "salt": salt,
             "password_hash": pw_hash,
+            "password_algo": PASSWORD_ALGO,
             "emp_api_key": emp_doc.get("emp_api_key") or secrets.token_hex(24),
             "role": emp_doc.get("role", "employee"),
             "created_at": datetime.utcnow().isoformat()
         }
-        # load existing employees (we'll store in the same recruiters file but with role employee)
-        data = self._load(self.recruiters_path)
-        data.append(emp_doc_record)
-        self._save(self.recruiters_path, data)
+        # we store employees in the same recruiters collection but with role employee
+        with self._lock:
+            self._append(self.recruiters_path, self._recruiters, emp_doc_record)
+            self._employees_by_api_key[emp_doc_record['emp_api_key']] = emp_doc_record
+            self._index_employee_email(emp_doc_record)
         return emp_doc_record['emp_api_key']
 
     def get_employee_by_api_key(self, api_key: str) -> Optional[dict]:
-        data = self._load(self.recruiters_path)
-        for r in data:
-            if r.get('emp_api_key') == api_key:
-                return r
-        return None
+        return self._employees_by_api_key.get(api_key)
 
     def get_employee_by_credentials(self, email: str, password: str) -> Optional[dict]:
-        data = self._load(self.recruiters_path)
-        for r in data:
-            if r.get('email') and r.get('email').lower() == email.lower() and r.get('password_hash') and r.get('salt'):
-                salt = r.get('salt', '')
-                calc = hashlib.sha256((salt + password).encode('utf-8')).hexdigest()
-                # constant-time compare
-                if hmac.compare_digest(calc, r.get('password_hash')):
-                    return r
+        # usually a single candidate, so one KDF call per login
+        candidates = self._employees_by_email_lower.get(email.lower(), [])
+        for r in candidates:
+            if verify_password(r, password):
+                if needs_rehash(r):
+                    self._upgrade_password_hash(r, password)
+                return r
+        if not candidates:
+            # unknown email: burn the same KDF work so timing doesn't reveal which accounts exist
+            verify_password(DUMMY_RECORD, password)
         return None
 
+    def _upgrade_password_hash(self, record: dict, password: str):
+        # legacy SHA256 record: re-store it with scrypt now that we know the password
+        salt, pw_hash = hash_password(password)
+        with self._lock:
+            record.update({'salt': salt, 'password_hash': pw_hash, 'password_algo': PASSWORD_ALGO})
+            self._append(self.recruiters_path, self._recruiters, record)
+
     def insert_recruiter(self, rec_doc: dict) -> str:
-        data = self._load(self.recruiters_path)
         rec_id = str(uuid.uuid4())
         rec_doc['_id'] = rec_id
-        rec_doc['api_key'] = rec_doc.get('api_key') or str(uuid.uuid4().hex)
+        rec_doc['api_key'] = rec_doc.get('api_key') or uuid.uuid4().hex
         rec_doc['created_at'] = datetime.utcnow().isoformat()
-        data.append(rec_doc)
-        self._save(self.recruiters_path, data)
+        with self._lock:
+            self._append(self.recruiters_path, self._recruiters, rec_doc)
+            self._recruiters_by_api_key[rec_doc['api_key']] = rec_doc
         return rec_doc['api_key']
 
     def get_recruiter_by_api_key(self, api_key: str) -> Optional[dict]:
-        data = self._load(self.recruiters_path)
-        for r in data:
-            if r.get('api_key') == api_key:
-                return r
-        return None
+        return self._recruiters_by_api_key.get(api_key)
 
-    @property
-    def db(self):
-        # mimic pymongo-like access for app.get_all_jobs
-        return {
-            Config.JOBS_COLLECTION: self._load(self.jobs_path),
-            Config.RESUMES_COLLECTION: self._load(self.resumes_path)
-        }
+    # listings: only materialize the first `limit` documents, and reuse them until the collection changes
+    def _list(self, path, collection: Dict[str, dict], limit: int) -> List[dict]:
+        # under the lock: writers add to the collection and bump its version while holding it
+        with self._lock:
+            version = self._versions.get(path, 0)
+            cached = self._listing_cache.get((path, limit))
+            if cached and cached[0] == version:
+                return cached[1]
+            docs = list(islice(collection.values(), max(limit, 0)))
+            self._listing_cache[(path, limit)] = (version, docs)
+            return docs
+
+    def list_jobs(self, limit: int) -> List[dict]:
+        return self._list(self.jobs_path, self._jobs, limit)
+
+    def list_resumes(self, limit: int) -> List[dict]:
+        return self._list(self.resumes_path, self._resumes, limit)
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Resume Relevance Check System",
     description="AI-powered resume evaluation system (local demo)",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -200,13 +389,63 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# evaluation and listing payloads are large, repetitive JSON
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
-# Initialize services
-parser = DocumentParser()
-embedding_service = EmbeddingService()
-scoring_engine = ScoringEngine()
+# Initialize services (model-backed ones are built on startup, see warm_services)
+parser = embedding_service = scoring_engine = None
 mongodb = LocalStorage()
 
+# One bounded pool for all asyncio.to_thread work (parsing, embedding, storage writes)
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('WORKER_THREADS', os.cpu_count() or 4)),
+    thread_name_prefix='resume-worker'
+)
+
+
+_OJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def ojson(content: Any, request: Optional[Request] = None) -> Response:
+    """Serialize straight to bytes, skipping jsonable_encoder and response model validation.
+
+    Given the request, the response carries an ETag of the body and a matching If-None-Match gets an empty 304.
+    """
+    body = orjson.dumps(content, option=_OJSON_OPTS)
+    if request is None:
+        return Response(content=body, media_type="application/json")
+    # weak: GZipMiddleware may re-encode the body, the JSON it carries is what's being validated
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    if_none_match = {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.on_event("startup")
+async def install_executor():
+    asyncio.get_running_loop().set_default_executor(_EXECUTOR)
+
+
+@app.on_event("startup")
+async def warm_services():
+    # construct in parallel so cold start is bounded by the slowest model load, not the sum
+    global parser, embedding_service, scoring_engine
+    parser, embedding_service, scoring_engine = await asyncio.gather(
+        asyncio.to_thread(DocumentParser),
+        asyncio.to_thread(EmbeddingService),
+        asyncio.to_thread(ScoringEngine)
+    )
+
+
+@app.on_event("shutdown")
+def flush_local_storage():
+    # fold outstanding WAL entries back into the JSON snapshots
+    mongodb.compact_all()
+    if embedding_service is not None:
+        embedding_service.flush()
+    _EXECUTOR.shutdown(wait=True)
+
 
 @app.get("/")
 async def root():
@@ -216,7 +455,7 @@ async def root():
 # Recruiter register (returns API key)
 
 @app.post("/api/employee/create")
-async def create_employee(email: str = Body(...), password: str = Body(...), name: str = Body(...), company: str = Body(None)):
+def create_employee(email: str = Body(...), password: str = Body(...), name: str = Body(...), company: str = Body(None)):
     """
     Create an employee credential. Use Postman to call this (no UI).
     Returns emp_api_key to be used as X-EMP-KEY in requests.
@@ -236,7 +475,7 @@ async def create_employee(email: str = Body(...), password: str = Body(...), nam
 
 
 @app.post("/api/employee/login")
-async def employee_login(email: str = Body(...), password: str = Body(...)):
+def employee_login(email: str = Body(...), password: str = Body(...)):
     """
     Employee login that returns emp_api_key. Frontend will call this with email/password.
     """
@@ -258,7 +497,7 @@ async def employee_login(email: str = Body(...), password: str = Body(...)):
 
 
 @app.post("/api/recruiter/register")
-async def register_recruiter(email: str = Query(...), name: str = Query(...), company: str = Query(...)):
+def register_recruiter(email: str = Query(...), name: str = Query(...), company: str = Query(...)):
     rec = {
         "email": email,
         "name": name,
@@ -268,9 +507,25 @@ async def register_recruiter(email: str = Query(...), name: str = Query(...), co
     return {"status": "success", "api_key": api_key, "message": "Recruiter created. Use X-API-Key header for protected endpoints."}
 
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+_ALLOWED_EXTS = frozenset({'.pdf', '.docx', '.doc'})
+
+
+def _spool_upload(upload: UploadFile, suffix: str) -> Tuple[str, str]:
+    """Stream an upload to a temp file chunk by chunk, hashing as we go. Returns (tmp_path, sha256 hex)."""
+    digest = hashlib.sha256()
+    upload.file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        for chunk in iter(lambda: upload.file.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            tmp.write(chunk)
+    return tmp.name, digest.hexdigest()
+
+
 # Student apply -> upload resume
 @app.post("/api/apply")
 async def apply_for_job(
+    background_tasks: BackgroundTasks,
     job_id: str = Query(...),
     file: UploadFile = File(...),
     candidate_email: str = Query(...),
@@ -281,49 +536,64 @@ async def apply_for_job(
         if not job_desc:
             raise HTTPException(status_code=404, detail="Job description not found")
 
-        if not file.filename.endswith(('.pdf', '.docx', '.doc')):
+        ext = Path(file.filename).suffix.lower()
+        if ext not in _ALLOWED_EXTS:
             raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        tmp_path, content_sha256 = await asyncio.to_thread(_spool_upload, file, ext)
 
-        file_type = 'pdf' if file.filename.endswith('.pdf') else 'docx'
-        parsed_data = parser.parse_resume(tmp_path, file_type)
-        parsed_data['candidate_email'] = candidate_email
-        if candidate_name:
-            parsed_data['candidate_name'] = candidate_name
-        parsed_data['file_name'] = file.filename
-        parsed_data['file_type'] = file_type
+        # identical bytes were already parsed and embedded; just record the application
+        resume_id = mongodb.get_resume_id_by_content_hash(content_sha256)
+        deduplicated = resume_id is not None
+        if deduplicated:
+            existing = mongodb.get_resume_by_id(resume_id)
+            stored_name = candidate_name or existing.get('candidate_name')
+            try:
+                os.unlink(tmp_path)
+            except:
+                pass
+        else:
+            file_type = 'pdf' if ext == '.pdf' else 'docx'
+            parsed_data = await asyncio.to_thread(parser.parse_resume, tmp_path, file_type)
+            parsed_data['candidate_email'] = candidate_email
+            if candidate_name:
+                parsed_data['candidate_name'] = candidate_name
+            parsed_data['file_name'] = file.filename
+            parsed_data['file_type'] = file_type
+            parsed_data['content_sha256'] = content_sha256
 
-        embeddings = embedding_service.generate_embeddings(parsed_data['processed_text'])
-        parsed_data['embeddings'] = embeddings
+            embeddings = await asyncio.to_thread(embedding_service.generate_embeddings, parsed_data['processed_text'])
+            parsed_data['embeddings'] = embeddings.tolist()
+            parsed_data['embedding_version'] = embedding_service.version
 
-        resume_id = mongodb.insert_resume(parsed_data)
-        embedding_service.store_resume_embedding(
-            resume_id,
-            parsed_data['processed_text'],
-            {'candidate_name': parsed_data['candidate_name'], 'email': candidate_email}
-        )
+            resume_id = await asyncio.to_thread(mongodb.insert_resume, parsed_data)
+            await asyncio.to_thread(
+                embedding_service.store_resume_embedding,
+                resume_id,
+                parsed_data['processed_text'],
+                {'candidate_name': parsed_data['candidate_name'], 'email': candidate_email},
+                embedding=embeddings
+            )
+            stored_name = parsed_data.get('candidate_name')
+
+            try:
+                os.unlink(tmp_path)
+            except:
+                pass
 
         # create application record
         app_doc = {
             "job_id": job_id,
             "resume_id": resume_id,
             "candidate_email": candidate_email,
-            "candidate_name": parsed_data.get('candidate_name'),
+            "candidate_name": stored_name,
             "status": "applied"
         }
-        mongodb.insert_application(app_doc)
-
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+        background_tasks.add_task(mongodb.insert_application, app_doc)
 
         return {
             "status": "success",
+            "deduplicated": deduplicated,
             "resume_id": resume_id,
             "message": "Resume uploaded successfully."
         }
@@ -333,6 +603,42 @@ async def apply_for_job(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_bulk_resume(tmp_path: str, filename: str, content_sha256: str) -> Dict[str, Any]:
+    """Parse one bulk-uploaded resume (runs on a worker thread) and remove its temp file."""
+    try:
+        file_type = 'pdf' if Path(filename).suffix.lower() == '.pdf' else 'docx'
+        parsed_data = parser.parse_resume(tmp_path, file_type)
+        # For bulk uploads, we may not have candidate name/email, so we can leave them blank
+        parsed_data['candidate_email'] = parsed_data.get('candidate_email') or "N/A"
+        parsed_data['candidate_name'] = parsed_data.get('candidate_name') or "Unknown"
+        parsed_data['file_name'] = filename
+        parsed_data['file_type'] = file_type
+        parsed_data['content_sha256'] = content_sha256
+        return parsed_data
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except:
+            pass
+
+
+def _store_bulk_resume(parsed_data: Dict[str, Any], job_id: str) -> str:
+    """Persist a parsed (and already embedded) resume plus its application. Returns the resume_id.
+    The FAISS index is updated afterwards for the whole batch."""
+    resume_id = mongodb.insert_resume(parsed_data)
+
+    # create application record
+    app_doc = {
+        "job_id": job_id,
+        "resume_id": resume_id,
+        "candidate_email": parsed_data.get('candidate_email'),
+        "candidate_name": parsed_data.get('candidate_name'),
+        "status": "applied"
+    }
+    mongodb.insert_application(app_doc)
+    return resume_id
+
+
 @app.post("/api/bulk-upload-resumes")
 async def bulk_upload_resumes(
     job_id: str = Query(...),
@@ -345,58 +651,99 @@ async def bulk_upload_resumes(
     successful_uploads = []
     failed_uploads = []
 
+    accepted = []
     for file in files:
-        try:
-            if not file.filename.endswith(('.pdf', '.docx', '.doc')):
-                failed_uploads.append({"filename": file.filename, "error": "Unsupported file type"})
-                continue
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-                content = await file.read()
-                tmp.write(content)
-                tmp_path = tmp.name
-
-            file_type = 'pdf' if file.filename.endswith('.pdf') else 'docx'
-            parsed_data = parser.parse_resume(tmp_path, file_type)
-            # For bulk uploads, we may not have candidate name/email, so we can leave them blank
-            parsed_data['candidate_email'] = parsed_data.get('candidate_email') or "N/A"
-            parsed_data['candidate_name'] = parsed_data.get('candidate_name') or "Unknown"
-            parsed_data['file_name'] = file.filename
-            parsed_data['file_type'] = file_type
-
-            embeddings = embedding_service.generate_embeddings(parsed_data['processed_text'])
-            parsed_data['embeddings'] = embeddings
-
-            resume_id = mongodb.insert_resume(parsed_data)
-            embedding_service.store_resume_embedding(
-                resume_id,
-                parsed_data['processed_text'],
-                {'candidate_name': parsed_data['candidate_name'], 'email': parsed_data['candidate_email']}
-            )
-
-            # create application record
-            app_doc = {
-                "job_id": job_id,
-                "resume_id": resume_id,
-                "candidate_email": parsed_data.get('candidate_email'),
-                "candidate_name": parsed_data.get('candidate_name'),
-                "status": "applied"
-            }
-            mongodb.insert_application(app_doc)
-            successful_uploads.append(resume_id)
-
+        if Path(file.filename).suffix.lower() not in _ALLOWED_EXTS:
+            failed_uploads.append({"filename": file.filename, "error": "Unsupported file type"})
+            continue
+        accepted.append(file)
+
+    # stream every upload to disk first, then parse/embed the new ones in parallel
+    spooled = await asyncio.gather(*[
+        asyncio.to_thread(_spool_upload, file, Path(file.filename).suffix.lower()) for file in accepted
+    ])
+    tmp_files = []
+    seen_hashes = set()
+    deduplicated = 0
+    for file, (tmp_path, content_sha256) in zip(accepted, spooled):
+        existing_id = mongodb.get_resume_id_by_content_hash(content_sha256)
+        if existing_id or content_sha256 in seen_hashes:
             try:
                 os.unlink(tmp_path)
             except:
                 pass
+        if existing_id:
+            # already parsed and embedded; only link it to this job
+            existing = mongodb.get_resume_by_id(existing_id)
+            await asyncio.to_thread(mongodb.insert_application, {
+                "job_id": job_id,
+                "resume_id": existing_id,
+                "candidate_email": existing.get('candidate_email'),
+                "candidate_name": existing.get('candidate_name'),
+                "status": "applied"
+            })
+            successful_uploads.append(existing_id)
+            deduplicated += 1
+            continue
+        if content_sha256 in seen_hashes:
+            # same file twice in one request
+            deduplicated += 1
+            continue
+        seen_hashes.add(content_sha256)
+        tmp_files.append((tmp_path, file.filename, content_sha256))
+
+    # cap concurrency so parsing doesn't oversubscribe the CPU
+    semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+
+    async def parse(tmp_path: str, filename: str, content_sha256: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await asyncio.to_thread(_parse_bulk_resume, tmp_path, filename, content_sha256)
+
+    # 1) parse every file in parallel
+    results = await asyncio.gather(*[parse(*t) for t in tmp_files], return_exceptions=True)
+    parsed = []
+    for (_, filename, _), result in zip(tmp_files, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to process file {filename}: {result}")
+            failed_uploads.append({"filename": filename, "error": str(result)})
+        else:
+            parsed.append((filename, result))
+
+    # 2) embed all parsed texts in one batched model call
+    if parsed:
+        embeddings = await asyncio.to_thread(
+            embedding_service.generate_embeddings_batch, [p['processed_text'] for _, p in parsed]
+        )
+        for (_, parsed_data), emb in zip(parsed, embeddings):
+            parsed_data['embeddings'] = emb.tolist()
+            parsed_data['embedding_version'] = embedding_service.version
+    else:
+        embeddings = []
+
+    # 3) persist, then add every stored resume to the vector index in one write
+    stored = []
+    for (filename, parsed_data), emb in zip(parsed, embeddings):
+        try:
+            resume_id = await asyncio.to_thread(_store_bulk_resume, parsed_data, job_id)
+            successful_uploads.append(resume_id)
+            stored.append((resume_id, parsed_data, emb))
         except Exception as e:
-            logger.error(f"Failed to process file {file.filename}: {e}")
-            failed_uploads.append({"filename": file.filename, "error": str(e)})
+            logger.error(f"Failed to process file {filename}: {e}")
+            failed_uploads.append({"filename": filename, "error": str(e)})
+    if stored:
+        await asyncio.to_thread(
+            embedding_service.store_resume_embeddings_batch,
+            [rid for rid, _, _ in stored],
+            [p['processed_text'] for _, p, _ in stored],
+            [{'candidate_name': p['candidate_name'], 'email': p['candidate_email']} for _, p, _ in stored],
+            embeddings=[emb for _, _, emb in stored]
+        )
 
     return {
         "status": "completed",
         "successful_uploads": len(successful_uploads),
         "failed_uploads": len(failed_uploads),
+        "deduplicated": deduplicated,
         "details": failed_uploads
     }
 
@@ -425,20 +772,40 @@ async def upload_job_description(
         if not job_text:
             raise HTTPException(status_code=400, detail="Either file or job_text must be provided")
 
-        parsed_job = parser.parse_job_description(job_text)
+        # the same posting re-submitted (e.g. a form retry) maps to the existing job
+        content_sha256 = hashlib.sha256(
+            "\x1f".join([job_text, job_title, company_name, location]).encode("utf-8")
+        ).hexdigest()
+        existing_id = mongodb.get_job_id_by_content_hash(content_sha256)
+        if existing_id:
+            existing = mongodb.get_job_by_id(existing_id)
+            return {
+                "status": "success",
+                "deduplicated": True,
+                "job_id": existing_id,
+                "job_title": existing.get('job_title'),
+                "required_skills": existing.get('required_skills', []),
+                "message": "Job description already uploaded"
+            }
+
+        parsed_job = await asyncio.to_thread(parser.parse_job_description, job_text)
         parsed_job['job_title'] = job_title
         parsed_job['company_name'] = company_name
         parsed_job['location'] = location
         parsed_job['posted_by'] = posted_by
         parsed_job['job_id'] = f"{company_name}_{job_title}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
-        embeddings = embedding_service.generate_embeddings(parsed_job['processed_text'])
-        parsed_job['embeddings'] = embeddings
-
-        job_id = mongodb.insert_job_description(parsed_job)
-        embedding_service.store_job_embedding(
+        parsed_job['content_sha256'] = content_sha256
+        embeddings = await asyncio.to_thread(embedding_service.generate_embeddings, parsed_job['processed_text'])
+        parsed_job['embeddings'] = embeddings.tolist()
+        parsed_job['embedding_version'] = embedding_service.version
+
+        job_id = await asyncio.to_thread(mongodb.insert_job_description, parsed_job)
+        await asyncio.to_thread(
+            embedding_service.store_job_embedding,
             job_id,
             parsed_job['processed_text'],
-            {'job_title': job_title, 'company': company_name}
+            {'job_title': job_title, 'company': company_name},
+            embeddings
         )
 
         return {
@@ -471,9 +838,19 @@ async def evaluate_single_resume(
         if not job_desc:
             raise HTTPException(status_code=404, detail="Job description not found")
 
-        evaluation = scoring_engine.evaluate_resume(resume, job_desc)
-        eval_id = mongodb.insert_evaluation(evaluation)
-        evaluation['evaluation_id'] = eval_id
+        evaluation = mongodb.get_cached_evaluation(resume['_id'], job_desc['_id'])
+        if evaluation is None:
+            resume_stale = not scoring_engine.has_current_embedding(resume)
+            job_stale = not scoring_engine.has_current_embedding(job_desc)
+            evaluation = await asyncio.to_thread(scoring_engine.evaluate_resume, resume, job_desc)
+            # evaluate_resume wrote any freshly computed vectors back onto the records
+            if resume_stale:
+                await asyncio.to_thread(mongodb.update_resumes, [resume], invalidate=False)
+            if job_stale:
+                await asyncio.to_thread(mongodb.update_job, job_desc, invalidate=False)
+            eval_id = await asyncio.to_thread(mongodb.insert_evaluation, evaluation)
+            evaluation['evaluation_id'] = eval_id
+            mongodb.cache_evaluation(resume['_id'], job_desc['_id'], evaluation)
 
         return {
             "status": "success",
@@ -489,6 +866,7 @@ async def evaluate_single_resume(
 # (existing) evaluate-batch protected
 @app.post("/api/evaluate-batch")
 async def evaluate_batch_resumes(
+    background_tasks: BackgroundTasks,
     job_id: str = Query(...),
     resume_ids: Optional[List[str]] = None
 ):
@@ -501,19 +879,41 @@ async def evaluate_batch_resumes(
             resumes = [mongodb.get_resume_by_id(rid) for rid in resume_ids]
             resumes = [r for r in resumes if r is not None]
         else:
-            similar_resumes = embedding_service.find_similar_resumes(job_desc['embeddings'], top_k=50)
+            similar_resumes = await asyncio.to_thread(embedding_service.find_similar_resumes, job_desc['embeddings'], top_k=50)
             resumes = [mongodb.get_resume_by_id(r['resume_id']) for r in similar_resumes]
             resumes = [r for r in resumes if r is not None]
 
         if not resumes:
             raise HTTPException(status_code=404, detail="No resumes found for evaluation")
 
-        evaluations = scoring_engine.batch_evaluate(resumes, job_desc)
-        for evaluation in evaluations:
-            eval_id = mongodb.insert_evaluation(evaluation)
-            evaluation['evaluation_id'] = eval_id
-
-        return {
+        # only score pairs that aren't already cached
+        evaluations = []
+        uncached = []
+        for resume in resumes:
+            cached = mongodb.get_cached_evaluation(resume['_id'], job_desc['_id'])
+            if cached is not None:
+                evaluations.append(cached)
+            else:
+                uncached.append(resume)
+
+        if uncached:
+            stale = [r for r in uncached if not scoring_engine.has_current_embedding(r)]
+            job_stale = not scoring_engine.has_current_embedding(job_desc)
+            fresh = await asyncio.to_thread(scoring_engine.batch_evaluate, uncached, job_desc)
+            # batch_evaluate wrote backfilled vectors onto the records; save them with the evaluations
+            if stale:
+                background_tasks.add_task(mongodb.update_resumes, stale, invalidate=False)
+            if job_stale:
+                background_tasks.add_task(mongodb.update_job, job_desc, invalidate=False)
+            for evaluation in fresh:
+                evaluation['_id'] = evaluation['evaluation_id'] = str(uuid.uuid4())
+                mongodb.cache_evaluation(evaluation['resume_id'], job_desc['_id'], evaluation)
+                evaluations.append(evaluation)
+            # persisted in one WAL write after the response is sent
+            background_tasks.add_task(mongodb.insert_evaluations, fresh)
+        evaluations.sort(key=lambda x: x['relevance_score'], reverse=True)
+
+        return ojson({
             "status": "success",
             "total_evaluated": len(evaluations),
             "evaluations": evaluations[:20],
@@ -522,7 +922,7 @@ async def evaluate_batch_resumes(
                 "medium_matches": len([e for e in evaluations if e['verdict'] == 'MEDIUM']),
                 "low_matches": len([e for e in evaluations if e['verdict'] == 'LOW'])
             }
-        }
+        })
 
     except Exception as e:
         logger.error(f"Error in batch evaluation: {e}")
@@ -530,7 +930,8 @@ async def evaluate_batch_resumes(
 
 
 @app.get("/api/job-evaluations/{job_id}")
-async def get_job_evaluations(
+def get_job_evaluations(
+    request: Request,
     job_id: str,
     min_score: Optional[int] = None,
     verdict: Optional[str] = None
@@ -539,12 +940,12 @@ async def get_job_evaluations(
         evaluations = mongodb.get_evaluations_by_job(job_id, min_score)
         if verdict:
             evaluations = [e for e in evaluations if e.get('verdict') == verdict.upper()]
-        return {
+        return ojson({
             "status": "success",
             "job_id": job_id,
             "total_evaluations": len(evaluations),
             "evaluations": evaluations
-        }
+        }, request)
     except Exception as e:
         logger.error(f"Error fetching evaluations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -556,30 +957,46 @@ async def upload_resume(
     candidate_name: Optional[str] = None
 ):
     try:
-        if not file.filename.endswith(('.pdf', '.docx', '.doc')):
+        ext = Path(file.filename).suffix.lower()
+        if ext not in _ALLOWED_EXTS:
             raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        tmp_path, content_sha256 = await asyncio.to_thread(_spool_upload, file, ext)
+        existing_id = mongodb.get_resume_id_by_content_hash(content_sha256)
+        if existing_id:
+            try:
+                os.unlink(tmp_path)
+            except:
+                pass
+            existing = mongodb.get_resume_by_id(existing_id)
+            return {
+                "status": "success",
+                "deduplicated": True,
+                "resume_id": existing_id,
+                "skills_extracted": len(existing.get('skills', [])),
+                "message": "Resume already uploaded"
+            }
 
-        file_type = 'pdf' if file.filename.endswith('.pdf') else 'docx'
-        parsed_data = parser.parse_resume(tmp_path, file_type)
+        file_type = 'pdf' if ext == '.pdf' else 'docx'
+        parsed_data = await asyncio.to_thread(parser.parse_resume, tmp_path, file_type)
         parsed_data['candidate_email'] = candidate_email
         if candidate_name:
             parsed_data['candidate_name'] = candidate_name
         parsed_data['file_name'] = file.filename
         parsed_data['file_type'] = file_type
+        parsed_data['content_sha256'] = content_sha256
 
-        embeddings = embedding_service.generate_embeddings(parsed_data['processed_text'])
-        parsed_data['embeddings'] = embeddings
+        embeddings = await asyncio.to_thread(embedding_service.generate_embeddings, parsed_data['processed_text'])
+        parsed_data['embeddings'] = embeddings.tolist()
+        parsed_data['embedding_version'] = embedding_service.version
 
-        resume_id = mongodb.insert_resume(parsed_data)
-        embedding_service.store_resume_embedding(
+        resume_id = await asyncio.to_thread(mongodb.insert_resume, parsed_data)
+        await asyncio.to_thread(
+            embedding_service.store_resume_embedding,
             resume_id,
             parsed_data['processed_text'],
-            {'candidate_name': parsed_data.get('candidate_name', ''), 'email': candidate_email}
+            {'candidate_name': parsed_data.get('candidate_name', ''), 'email': candidate_email},
+            embedding=embeddings
         )
 
         try:
@@ -600,32 +1017,34 @@ async def upload_resume(
 
 
 @app.get("/api/jobs")
-async def get_all_jobs(
+def get_all_jobs(
+    request: Request,
     status: Optional[str] = "active",
     limit: int = 20
 ):
     try:
-        jobs = mongodb.db.get(Config.JOBS_COLLECTION, [])[:limit]
-        return {
+        jobs = mongodb.list_jobs(limit)
+        return ojson({
             "status": "success",
             "total_jobs": len(jobs),
             "jobs": jobs
-        }
+        }, request)
     except Exception as e:
         logger.error(f"Error fetching jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/resumes")
-async def get_all_resumes(
+def get_all_resumes(
+    request: Request,
     limit: int = 10
 ):
     try:
-        resumes = mongodb.db.get(Config.RESUMES_COLLECTION, [])[:limit]
-        return {
+        resumes = mongodb.list_resumes(limit)
+        return ojson({
             "status": "success",
             "total_resumes": len(resumes),
             "resumes": resumes
-        }
+        }, request)
     except Exception as e:
         logger.error(f"Error fetching resumes: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -11,10 +11,33 @@ class Config:
 
     # Embeddings & FAISS
     EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', "all-MiniLM-L6-v2")
+    # Encode with an int8-quantized ONNX export of EMBEDDING_MODEL (needs optimum[onnxruntime]); falls back to torch
+    EMBEDDING_ONNX = os.getenv('EMBEDDING_ONNX', 'false').lower() == 'true'
+    # Intra-op threads for torch encoding (0 = one per CPU). OMP_NUM_THREADS is best set in the launcher env.
+    TORCH_THREADS = int(os.getenv('TORCH_THREADS', 0))
+    # Texts per forward pass in batch encoding; inputs are length-sorted so larger batches waste little padding
+    EMB_BATCH_SIZE = int(os.getenv('EMB_BATCH_SIZE', 1024))
     FAISS_PERSIST_DIR = os.getenv('FAISS_PERSIST_DIR', "./faiss_data")
+    # Approximate index (faiss.index_factory string, e.g. "IVF4096_HNSW32,PQ32"); empty keeps exact flat search.
+    # The flat index is trained into this type once it holds FAISS_TRAIN_MIN vectors.
+    FAISS_INDEX_TYPE = os.getenv('FAISS_INDEX_TYPE', '')
+    FAISS_TRAIN_MIN = int(os.getenv('FAISS_TRAIN_MIN', 100000))
+    FAISS_NPROBE = int(os.getenv('FAISS_NPROBE', 16))
+    FAISS_EF_SEARCH = int(os.getenv('FAISS_EF_SEARCH', 64))
+    # Index/meta files are rewritten after this many adds (and always on shutdown)
+    FAISS_FLUSH_EVERY = int(os.getenv('FAISS_FLUSH_EVERY', 64))
+    # Memory-map trained (IVF) index files read-only instead of loading them into RAM. New vectors sit in a
+    # small in-RAM flat buffer that is merged into the index file once it holds FAISS_MMAP_MERGE_EVERY vectors.
+    FAISS_MMAP = os.getenv('FAISS_MMAP', 'false').lower() == 'true'
+    FAISS_MMAP_MERGE_EVERY = int(os.getenv('FAISS_MMAP_MERGE_EVERY', 10000))
+    # Store resume/job embeddings on disk as int8 + scale instead of float lists (lossy, ~1e-3 cosine error)
+    QUANTIZE_STORED_EMBEDDINGS = os.getenv('QUANTIZE_STORED_EMBEDDINGS', 'true').lower() == 'true'
 
     # Optional cloud API key (not required for local demo)
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+    # Seconds to wait for Gemini job parsing before falling back to the local parser
+    GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', 5.0))
 
     # Collections / file names
     RESUMES_COLLECTION = "resumes"
@@ -32,5 +55,13 @@ class Config:
     HIGH_THRESHOLD = float(os.getenv('HIGH_THRESHOLD', 75.0))
     MEDIUM_THRESHOLD = float(os.getenv('MEDIUM_THRESHOLD', 50.0))
 
+    # Threads batch_evaluate spreads per-resume hard matching over (1 = sequential)
+    SCORING_THREADS = int(os.getenv('SCORING_THREADS', min(8, os.cpu_count() or 1)))
+
+    # Seconds a (resume_id, job_id) evaluation is reused before being recomputed
+    EVAL_CACHE_TTL = float(os.getenv('EVAL_CACHE_TTL', 600.0))
+    # Most cached evaluations kept in memory; the oldest are dropped first
+    EVAL_CACHE_MAX = int(os.getenv('EVAL_CACHE_MAX', 10000))
+
     # Other flags
     USE_LOCAL_DB = True
\ No newline at end of file
@@ -1,145 +1,294 @@
 # backend/database/mongodb.py
 
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
-from typing import Optional, Dict, List, Any
-from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import WriteConcern
+from pymongo.collation import Collation
+from pymongo.errors import ConnectionFailure, OperationFailure
+from typing import Optional, Dict, List, Any, AsyncIterator, Iterable
+from datetime import datetime, timezone
 from backend.config import Config
+from backend.utils.security import hash_password, verify_password, needs_rehash, PASSWORD_ALGO, DUMMY_RECORD
+import asyncio
 import logging
-import hashlib
-import hmac
 import secrets
 import uuid
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields a job dashboard needs; the per-question and feedback arrays are left on the server
+DEFAULT_SUMMARY_FIELDS = (
+    "resume_id", "job_id", "relevance_score", "hard_match_score",
+    "soft_match_score", "verdict", "created_at"
+)
+
+# case-insensitive comparison; queries must pass the same collation to use the email index
+EMAIL_COLLATION = Collation(locale="en", strength=2)
+
 class MongoDB:
     def __init__(self):
-        self.client = None
-        self.db = None
-        self.connect()
+        # Motor connects lazily; call `await connect()` from a startup hook to ping and build indexes
+        self.client = AsyncIOMotorClient(Config.MONGODB_URI)
+        self.db = self.client[Config.DATABASE_NAME]
+        # raw resume files live in GridFS so resume documents stay small
+        self.fs = AsyncIOMotorGridFSBucket(self.db, bucket_name="resume_files")
     
-    def connect(self):
+    async def connect(self):
         """Establish connection to MongoDB Atlas"""
         try:
-            self.client = MongoClient(Config.MONGODB_URI)
-            self.db = self.client[Config.DATABASE_NAME]
-            
             # Test connection
-            self.client.admin.command('ping')
+            await self.client.admin.command('ping')
             logger.info("Successfully connected to MongoDB Atlas")
             
             # Create indexes for better performance
-            self._create_indexes()
+            await self._create_indexes()
             
         except ConnectionFailure as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
     
-    def _create_indexes(self):
+    async def _create_indexes(self):
         """Create necessary indexes for optimal query performance"""
         # Resume indexes
-        self.db[Config.RESUMES_COLLECTION].create_index([("candidate_email", 1)])
-        self.db[Config.RESUMES_COLLECTION].create_index([("created_at", -1)])
+        await self.db[Config.RESUMES_COLLECTION].create_index([("candidate_email", 1)])
+        await self.db[Config.RESUMES_COLLECTION].create_index([("created_at", -1)])
         
         # Job description indexes
-        self.db[Config.JOBS_COLLECTION].create_index([("job_id", 1)], unique=True)
-        self.db[Config.JOBS_COLLECTION].create_index([("created_at", -1)])
+        await self.db[Config.JOBS_COLLECTION].create_index([("job_id", 1)], unique=True)
+        await self.db[Config.JOBS_COLLECTION].create_index([("created_at", -1)])
         
         # Evaluation indexes
-        self.db[Config.EVALUATIONS_COLLECTION].create_index([
+        await self.db[Config.EVALUATIONS_COLLECTION].create_index([
             ("resume_id", 1), 
             ("job_id", 1)
         ])
-        self.db[Config.EVALUATIONS_COLLECTION].create_index([("relevance_score", -1)])
-        self.db[Config.EVALUATIONS_COLLECTION].create_index([("verdict", 1)])
+        # equality on job_id (and verdict) then sort on relevance_score, so get_evaluations_by_job skips the SORT stage
+        await self.db[Config.EVALUATIONS_COLLECTION].create_index([("job_id", 1), ("relevance_score", -1)])
+        await self.db[Config.EVALUATIONS_COLLECTION].create_index([
+            ("job_id", 1),
+            ("verdict", 1),
+            ("relevance_score", -1)
+        ])
+        # the standalone score/verdict indexes are covered by the compound ones above
+        for name in ("relevance_score_-1", "verdict_1"):
+            try:
+                await self.db[Config.EVALUATIONS_COLLECTION].drop_index(name)
+            except OperationFailure:
+                pass
 
         # Recruiters/Employees indexes
-        self.db["recruiters"].create_index([("email", 1)], unique=True)
-        self.db["recruiters"].create_index([("api_key", 1)])
-        self.db["recruiters"].create_index([("emp_api_key", 1)])
+        # the old non-partial index rejected recruiters without an email and compared case-sensitively
+        try:
+            await self.db["recruiters"].drop_index("email_1")
+        except OperationFailure:
+            pass
+        await self.db["recruiters"].create_index(
+            [("email", 1)],
+            name="email_ci_unique",
+            unique=True,
+            partialFilterExpression={"email": {"$type": "string"}},
+            collation=EMAIL_COLLATION
+        )
+        await self.db["recruiters"].create_index([("api_key", 1)])
+        await self.db["recruiters"].create_index([("emp_api_key", 1)])
 
-    def insert_resume(self, resume_data: Dict) -> str:
+    async def insert_resume(self, resume_data: Dict) -> str:
         """Insert a resume into the database"""
-        resume_data['created_at'] = datetime.utcnow()
-        resume_data['updated_at'] = datetime.utcnow()
-        result = self.db[Config.RESUMES_COLLECTION].insert_one(resume_data)
+        now = datetime.now(timezone.utc)
+        resume_data['created_at'] = now
+        resume_data['updated_at'] = now
+        result = await self.db[Config.RESUMES_COLLECTION].insert_one(resume_data)
         return str(result.inserted_id)
     
-    def insert_job_description(self, job_data: Dict) -> str:
+    async def insert_job_description(self, job_data: Dict) -> str:
         """Insert a job description into the database"""
-        job_data['created_at'] = datetime.utcnow()
-        job_data['updated_at'] = datetime.utcnow()
-        result = self.db[Config.JOBS_COLLECTION].insert_one(job_data)
+        now = datetime.now(timezone.utc)
+        job_data['created_at'] = now
+        job_data['updated_at'] = now
+        result = await self.db[Config.JOBS_COLLECTION].insert_one(job_data)
         return str(result.inserted_id)
     
-    def insert_evaluation(self, evaluation_data: Dict) -> str:
+    async def insert_evaluation(self, evaluation_data: Dict) -> str:
         """Insert an evaluation result"""
-        evaluation_data['created_at'] = datetime.utcnow()
-        result = self.db[Config.EVALUATIONS_COLLECTION].insert_one(evaluation_data)
+        evaluation_data['created_at'] = datetime.now(timezone.utc)
+        result = await self.db[Config.EVALUATIONS_COLLECTION].insert_one(evaluation_data)
         return str(result.inserted_id)
     
-    def get_evaluations_by_job(self, job_id: str, min_score: Optional[int] = None) -> List[Dict]:
-        """Get all evaluations for a specific job"""
+    async def get_evaluations_by_job(self, job_id: str, limit: int = 50, min_score: Optional[int] = None,
+                                     verdict: Optional[str] = None,
+                                     fields: Iterable[str] = DEFAULT_SUMMARY_FIELDS) -> AsyncIterator[Dict]:
+        """Yield the top `limit` evaluations for a job, best score first, projected to `fields`"""
         query = {"job_id": job_id}
+        if verdict:
+            query["verdict"] = verdict
         if min_score:
             query["relevance_score"] = {"$gte": min_score}
         
-        return list(self.db[Config.EVALUATIONS_COLLECTION].find(
-            query
-        ).sort("relevance_score", -1))
+        cursor = self.db[Config.EVALUATIONS_COLLECTION].find(
+            query, {f: 1 for f in fields}
+        ).sort("relevance_score", -1).limit(limit).batch_size(100)
+        async for doc in cursor:
+            yield doc
     
-    def get_resume_by_id(self, resume_id: str) -> Optional[Dict]:
-        """Get resume by ID"""
+    async def get_resume_by_id(self, resume_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """Get resume by ID (metadata only; fetch the file with get_resume_file), optionally just `fields`"""
+        from bson import ObjectId
+        # older documents may still carry the file inline
+        projection = {f: 1 for f in fields} if fields else {"content_bytes": 0}
+        return await self.db[Config.RESUMES_COLLECTION].find_one({"_id": ObjectId(resume_id)}, projection)
+
+    async def get_resume_embedding(self, resume_id: str) -> Optional[List[float]]:
+        """Just the stored embedding vector, without text or metadata"""
+        from bson import ObjectId
+        doc = await self.db[Config.RESUMES_COLLECTION].find_one(
+            {"_id": ObjectId(resume_id)}, {"embeddings": 1, "_id": 0}
+        )
+        return doc.get("embeddings") if doc else None
+
+    async def store_resume_file(self, filename: str, data: bytes) -> str:
+        """Upload raw resume bytes to GridFS and return the file id"""
+        file_id = await self.fs.upload_from_stream(filename, data)
+        return str(file_id)
+
+    async def get_resume_file(self, file_id: str) -> bytes:
+        """Download raw resume bytes from GridFS"""
         from bson import ObjectId
-        return self.db[Config.RESUMES_COLLECTION].find_one({"_id": ObjectId(resume_id)})
+        stream = await self.fs.open_download_stream(ObjectId(file_id))
+        return await stream.read()
     
-    def get_job_by_id(self, job_id: str) -> Optional[Dict]:
-        """Get job description by ID"""
+    async def get_job_by_id(self, job_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """Get job description by ID, optionally just `fields`"""
         from bson import ObjectId
-        return self.db[Config.JOBS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        projection = {f: 1 for f in fields} if fields else None
+        return await self.db[Config.JOBS_COLLECTION].find_one({"_id": ObjectId(job_id)}, projection)
 
-    def insert_employee(self, emp_doc: dict) -> str:
+    async def insert_employee(self, emp_doc: dict) -> str:
         """
         Create an employee record for simple email/password login.
-        Stores salted SHA256 password hash.
+        Stores a salted scrypt password hash.
         Returns generated emp_api_key.
         """
         emp_id = str(uuid.uuid4())
-        salt = secrets.token_hex(8)
-        pw = emp_doc.get('password', '')
-        pw_hash = hashlib.sha256((salt + pw).encode('utf-8')).hexdigest()
+        # the KDF is deliberately slow; keep it off the event loop
+        salt, pw_hash = await asyncio.to_thread(hash_password, emp_doc.get('password', ''))
         emp_doc_record = {
             "_id": emp_id,
-            "email": emp_doc.get("email"),
+            "email": (emp_doc.get("email") or "").lower() or None,
             "name": emp_doc.get("name"),
             "company": emp_doc.get("company"),
             "salt": salt,
             "password_hash": pw_hash,
+            "password_algo": PASSWORD_ALGO,
             "emp_api_key": emp_doc.get("emp_api_key") or secrets.token_hex(24),
             "role": emp_doc.get("role", "employee"),
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
-        self.db["recruiters"].insert_one(emp_doc_record)
+        await self.db["recruiters"].insert_one(emp_doc_record)
         return emp_doc_record['emp_api_key']
 
-    def get_employee_by_credentials(self, email: str, password: str) -> Optional[dict]:
-        user = self.db["recruiters"].find_one({"email": email.lower()})
+    async def get_employee_by_credentials(self, email: str, password: str) -> Optional[dict]:
+        user = await self.db["recruiters"].find_one({"email": email}, collation=EMAIL_COLLATION)
         if user and user.get('password_hash') and user.get('salt'):
-            salt = user.get('salt', '')
-            calc = hashlib.sha256((salt + password).encode('utf-8')).hexdigest()
-            if hmac.compare_digest(calc, user.get('password_hash')):
+            if await asyncio.to_thread(verify_password, user, password):
+                if needs_rehash(user):
+                    # legacy SHA256 record: re-store it with scrypt now that we know the password
+                    salt, pw_hash = await asyncio.to_thread(hash_password, password)
+                    user.update({'salt': salt, 'password_hash': pw_hash, 'password_algo': PASSWORD_ALGO})
+                    await self.db["recruiters"].update_one(
+                        {"_id": user["_id"]},
+                        {"$set": {'salt': salt, 'password_hash': pw_hash, 'password_algo': PASSWORD_ALGO}}
+                    )
                 return user
+            return None
+        await asyncio.to_thread(verify_password, DUMMY_RECORD, password)
         return None
 
-    def insert_recruiter(self, rec_doc: dict) -> str:
+    async def insert_recruiter(self, rec_doc: dict) -> str:
         rec_id = str(uuid.uuid4())
         rec_doc['_id'] = rec_id
-        rec_doc['api_key'] = rec_doc.get('api_key') or str(uuid.uuid4().hex)
-        rec_doc['created_at'] = datetime.utcnow().isoformat()
-        self.db["recruiters"].insert_one(rec_doc)
+        if rec_doc.get('email'):
+            rec_doc['email'] = rec_doc['email'].lower()
+        rec_doc['api_key'] = rec_doc.get('api_key') or uuid.uuid4().hex
+        rec_doc['created_at'] = datetime.now(timezone.utc)
+        await self.db["recruiters"].insert_one(rec_doc)
         return rec_doc['api_key']
 
-    def get_recruiter_by_api_key(self, api_key: str) -> Optional[dict]:
-        return self.db["recruiters"].find_one({"api_key": api_key})
\ No newline at end of file
+    async def get_recruiter_by_api_key(self, api_key: str) -> Optional[dict]:
+        return await self.db["recruiters"].find_one({"api_key": api_key})
+
+
+class BulkWriter:
+    """
+    Buffers documents for one collection and writes them with a single unordered insert_many
+    every `max_docs` documents or `max_delay` seconds, whichever comes first.
+    Pass write_concern=WriteConcern(w=0) only for non-authoritative data such as evaluation history.
+    """
+    _STOP = object()
+
+    def __init__(self, collection, max_docs: int = 100, max_delay: float = 0.05,
+                 write_concern: Optional[WriteConcern] = None):
+        self.collection = collection.with_options(write_concern=write_concern) if write_concern else collection
+        self.max_docs = max_docs
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def add(self, doc: Dict):
+        await self._queue.put(doc)
+
+    async def close(self):
+        """Flush whatever is buffered and stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.put(self._STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            doc = await self._queue.get()
+            if doc is self._STOP:
+                return
+            batch = [doc]
+            stopping = False
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_docs:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    doc = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if doc is self._STOP:
+                    stopping = True
+                    break
+                batch.append(doc)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Dict]):
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.error(f"Bulk insert of {len(batch)} docs into {self.collection.name} failed: {e}")
+
+
+_shared: Optional[MongoDB] = None
+
+def get_mongodb() -> MongoDB:
+    """Process-wide MongoDB wrapper so every caller shares one Motor connection pool"""
+    global _shared
+    if _shared is None:
+        _shared = MongoDB()
+    return _shared
+
+def get_db():
+    """Motor database handle used by the quiz endpoints"""
+    return get_mongodb().db
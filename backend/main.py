@@ -1,13 +1,16 @@
 # backend/main.py
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from backend.api.routes import jobs, resumes, evaluations, auth
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Resume Relevance Check System",
     description="AI-powered resume evaluation system (local demo)",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -18,6 +21,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# evaluation and listing payloads are large, repetitive JSON
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Include API routers
 app.include_router(auth.router, prefix="/api", tags=["Auth"])
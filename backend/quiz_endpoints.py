@@ -1,36 +1,92 @@
 # backend/quiz_endpoints.py
 import os
+import re
+import asyncio
 import uuid
+import hashlib
+import random
 import json
-import requests
-from typing import List, Dict, Any
+import orjson
+import httpx
+import jmespath
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi import Depends
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
 from bson import ObjectId
 
-# Replace with your own DB utilities; these are placeholders that match common patterns.
-# If you use the mongodb.py you uploaded, import the client/db collection objects from there.
-from mongodb import get_db  # expected helper that returns a motor/mongo client or db instance
+# Motor (async) database handle; every call below must be awaited
+from backend.database.mongodb import get_db, get_mongodb, BulkWriter
+from pymongo import WriteConcern
 
 router = APIRouter()
 
+# Quiz evaluation history is buffered and written unacknowledged; resumes and quizzes stay on w=1 insert_one
+_eval_writer: Optional[BulkWriter] = None
+
+
+def _get_eval_writer() -> BulkWriter:
+    """The evaluation writer, started on first use so apps that mount the router without its startup hook still work."""
+    global _eval_writer
+    if _eval_writer is None:
+        _eval_writer = BulkWriter(get_db()["evaluations"], write_concern=WriteConcern(w=0))
+        _eval_writer.start()
+    return _eval_writer
+
+
+@router.on_event("startup")
+async def connect_mongodb():
+    # ping and create indexes once, off the request path
+    await get_mongodb().connect()
+    await get_db()["quiz_templates"].create_index("created_at", expireAfterSeconds=QUIZ_TEMPLATE_TTL)
+    _get_eval_writer()
+
+
+@router.on_event("shutdown")
+async def close_clients():
+    if _eval_writer is not None:
+        await _eval_writer.close()
+    await _http_client.aclose()
+
 # Config from env
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Example endpoint; you can choose the model like gemini-2.5-flash or gemini-1.5-pro depending on your quota/region.
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 GEMINI_BASE = os.getenv("GEMINI_BASE", "https://generativelanguage.googleapis.com/v1beta/models")
+# Generated questions are reused for every applicant to the same JD until the template expires
+QUIZ_TEMPLATE_TTL = int(os.getenv("QUIZ_TEMPLATE_TTL", 3 * 24 * 3600))
 
 if not GEMINI_API_KEY:
     # We allow service to start but will error at runtime if API key missing.
     pass
 
+# One pooled client for all Gemini calls so quiz requests reuse connections instead of re-handshaking
+_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=60
+)
+
+# answers are passed as answers[0]=idx, answers[1]=idx, etc.
+_ANSWER_KEY_RE = re.compile(r"answers\[(\d+)\]")
+# outermost [...] in the model text; also skips any ```json fences around it
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+# text parts of a Gemini response, tried in order: generateContent shape, then the older output-list shapes
+_GEMINI_TEXT_PATHS = (
+    jmespath.compile("candidates[].content.parts[].text"),
+    jmespath.compile("candidates[].output[?type=='text'].text | []"),
+    jmespath.compile("output[?type=='text'].text"),
+)
+
 # ---------- Pydantic models ----------
 class QuizQuestion(BaseModel):
     question: str
     options: List[str]         # multiple choice options
     correct_index: int = None  # keep for backend only, do not expose via /quiz
+    explanation: str = ""      # generated with the question, returned only after submission
+    study_tip: str = ""
 
 class QuizDoc(BaseModel):
     _id: str
@@ -41,7 +97,7 @@ class QuizDoc(BaseModel):
     meta: Dict[str, Any] = {}
 
 # ---------- Helper: call Gemini generateContent ----------
-def call_gemini(prompt: str, temperature: float = 0.0, max_output_tokens: int = 800) -> str:
+async def call_gemini(prompt: str, temperature: float = 0.0, max_output_tokens: int = 800) -> str:
     """
     Calls Gemini generateContent REST endpoint and returns the text result.
     See: official Gemini docs for request/response formats. Requires GEMINI_API_KEY.
@@ -65,36 +121,31 @@ def call_gemini(prompt: str, temperature: float = 0.0, max_output_tokens: int =
         "maxOutputTokens": max_output_tokens
     }
 
-    resp = requests.post(url, headers=headers, json=body, timeout=60)
-    if not resp.ok:
+    resp = await _http_client.post(url, headers=headers, json=body)
+    if not resp.is_success:
         raise HTTPException(status_code=502, detail=f"Gemini API error: {resp.status_code} {resp.text}")
 
-    data = resp.json()
-    # The exact path to text may vary by response shape; this follows typical responses.
-    # Inspect data to adjust if your model/endpoint responds differently.
-    # This picks textual content from the first candidate.
+    data = orjson.loads(resp.content)
+    # The exact path to text may vary by response shape; see _GEMINI_TEXT_PATHS.
     try:
-        text = ""
-        # Multiple response formats exist; handle common one:
-        if "candidates" in data and data["candidates"]:
-            for c in data["candidates"]:
-                if "output" in c and isinstance(c["output"], list):
-                    for item in c["output"]:
-                        if item.get("type") == "text":
-                            text += item.get("text", "")
-        elif "output" in data and isinstance(data["output"], list):
-            for item in data["output"]:
-                if item.get("type") == "text":
-                    text += item.get("text", "")
-        else:
-            # Fallback: stringified json
-            text = json.dumps(data)
-        return text.strip()
+        for path in _GEMINI_TEXT_PATHS:
+            parts = path.search(data)
+            if parts:
+                return "".join(p for p in parts if isinstance(p, str)).strip()
+        # Fallback: stringified json
+        return json.dumps(data).strip()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse Gemini response: {str(e)}")
 
+def _extract_json_array(text: str) -> List[Any]:
+    """Parse the JSON array embedded in a model response."""
+    m = _JSON_ARRAY_RE.search(text)
+    if not m:
+        raise ValueError("no JSON array in response")
+    return orjson.loads(m.group(0))
+
 # ---------- Utility: generate MCQs from JD & resume ----------
-def generate_quiz_from_text(job_text: str, resume_text: str, n_questions: int = 5) -> List[QuizQuestion]:
+async def generate_quiz_from_text(job_text: str, resume_text: str, n_questions: int = 5) -> List[QuizQuestion]:
     """
     Use Gemini to produce n multiple-choice questions relevant to the job_text and optionally tailored
     slightly to the resume_text (to probe candidate's claimed skills).
@@ -103,7 +154,9 @@ def generate_quiz_from_text(job_text: str, resume_text: str, n_questions: int =
     system_prompt = (
         "You are an assistant that generates short multiple-choice skill-check questions (MCQs) for job applicants. "
         "Produce exactly a JSON array of questions. Each question object must have: "
-        '"question" (string), "options" (array of 3-5 strings), "correct_index" (0-based integer).'
+        '"question" (string), "options" (array of 3-5 strings), "correct_index" (0-based integer), '
+        '"explanation" (one or two sentences on why the correct option is correct), '
+        '"study_tip" (a short study tip for a candidate who gets it wrong). '
         "Make the questions directly testable short knowledge or application of skills mentioned in the job description. "
         "If the candidate's resume includes specific tools or versions, prefer questions that check those tools/skills."
     )
@@ -115,21 +168,19 @@ def generate_quiz_from_text(job_text: str, resume_text: str, n_questions: int =
         f"Return exactly {n_questions} questions in JSON only; do not add any extra commentary."
     )
 
-    raw = call_gemini(user_prompt, temperature=0.1, max_output_tokens=900)
+    raw = await call_gemini(user_prompt, temperature=0.1, max_output_tokens=1500)
 
     # Attempt to extract JSON from the model text. Model is asked to only respond with JSON, but robust-parse anyway.
     try:
-        # find first json bracket
-        start = raw.find("[")
-        end = raw.rfind("]") + 1
-        raw_json = raw[start:end]
-        parsed = json.loads(raw_json)
+        parsed = _extract_json_array(raw)
         questions = []
         for q in parsed:
             qq = QuizQuestion(
                 question=q.get("question"),
                 options=q.get("options") or [],
-                correct_index=int(q.get("correct_index")) if q.get("correct_index") is not None else None
+                correct_index=int(q.get("correct_index")) if q.get("correct_index") is not None else None,
+                explanation=q.get("explanation") or "",
+                study_tip=q.get("study_tip") or ""
             )
             questions.append(qq)
         return questions
@@ -137,66 +188,65 @@ def generate_quiz_from_text(job_text: str, resume_text: str, n_questions: int =
         # Fallback: if parsing fails, do a naive parse split (less reliable), but still produce something
         raise HTTPException(status_code=500, detail="Failed to parse JSON from Gemini when generating quiz. Response: " + raw[:1000])
 
+def _shuffle_options(q: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a question dict with its options in a fresh random order and correct_index remapped."""
+    options = q.get("options") or []
+    old_correct = q.get("correct_index")
+    order = random.sample(range(len(options)), len(options))
+    correct = order.index(old_correct) if old_correct is not None and 0 <= old_correct < len(order) else None
+    return {**q, "options": [options[i] for i in order], "correct_index": correct}
+
+async def get_quiz_questions(job_text: str, resume_text: str, n_questions: int = 5) -> List[Dict[str, Any]]:
+    """
+    Questions for one applicant. Templates are cached per (JD text, n_questions) in `quiz_templates`,
+    so only the first applicant to a job pays for a Gemini call; every applicant gets shuffled options.
+    The resume text is not part of the key (it is only a light hint in the prompt).
+    Returns plain dicts: questions are validated once, when parsed from the Gemini output.
+    """
+    db = get_db()
+    key = f"{hashlib.sha256(job_text.encode('utf-8')).hexdigest()}:{n_questions}"
+    template = await db["quiz_templates"].find_one_and_update({"_id": key}, {"$inc": {"hits": 1}})
+    if template:
+        questions = template.get("questions", [])
+    else:
+        questions = [q.dict() for q in await generate_quiz_from_text(job_text, resume_text, n_questions=n_questions)]
+        await db["quiz_templates"].update_one(
+            {"_id": key},
+            {"$setOnInsert": {
+                "questions": questions,
+                "created_at": datetime.now(timezone.utc),
+                "hits": 0
+            }},
+            upsert=True
+        )
+    return [_shuffle_options(q) for q in questions]
+
 # ---------- Utility: evaluate answers ----------
-def evaluate_answers_with_gemini(questions: List[QuizQuestion], user_answers: List[int], user_text_answers: List[str]=None) -> Dict[str, Any]:
+def evaluate_answers(questions: List[Dict[str, Any]], user_answers: List[int], user_text_answers: List[str]=None) -> Dict[str, Any]:
     """
-    Evaluate user's selected choice indices against the correct answers, and use Gemini to provide
-    an explanatory score and short feedback. Returns per-question results and overall score.
-    For MCQs we compare indices (fast). For free-text evaluation (if you want open answers), we can send
-    the user's text and the ideal answer to Gemini to get a quality score.
+    Evaluate user's selected choice indices against the correct answers and attach the explanation and
+    study tip that were generated together with each question. Returns per-question results and overall score.
+    No LLM call happens at submit time; feedback was produced once, in generate_quiz_from_text.
     """
-    # Basic scoring for MCQs:
-    results = []
     total = 0
     max_total = len(questions) * 1  # 1 point per question
 
-    # Prepare a small prompt to ask Gemini to verify and provide feedback.
-    verify_entries = []
+    per_q_results = []
     for i, q in enumerate(questions):
-        correct_idx = q.correct_index if q.correct_index is not None else -1
+        correct_idx = q.get("correct_index")
+        if correct_idx is None:
+            correct_idx = -1
         chosen_idx = user_answers[i] if i < len(user_answers) else None
         correct = (chosen_idx == correct_idx)
-        score = 1 if correct else 0
-        total += score
-        entry = {
+        total += 1 if correct else 0
+        per_q_results.append({
             "index": i,
-            "question": q.question,
-            "options": q.options,
-            "correct_index": correct_idx,
+            "question": q.get("question"),
             "chosen_index": chosen_idx,
-            "is_correct": correct
-        }
-        verify_entries.append(entry)
-
-    # Get brief feedback from Gemini: explanation for each question and a short improvement tip
-    prompt_parts = [
-        "You are an assistant that evaluates MCQ quiz attempts. For every question entry provided below,",
-        "respond with a JSON array of same length with objects that have fields: 'explanation' and 'tip'.",
-        "The 'explanation' should say why the correct option is correct (one or two sentences). The 'tip' should be a short study tip if the candidate was incorrect, otherwise empty string."
-    ]
-    prompt_parts.append("Entries:\n" + json.dumps(verify_entries, indent=2))
-    prompt = "\n\n".join(prompt_parts)
-
-    raw = call_gemini(prompt, temperature=0.0, max_output_tokens=800)
-    try:
-        # extract JSON similarly
-        start = raw.find("[")
-        end = raw.rfind("]") + 1
-        parsed = json.loads(raw[start:end])
-    except Exception:
-        parsed = [{"explanation": "", "tip": ""} for _ in verify_entries]
-
-    per_q_results = []
-    for idx, v in enumerate(verify_entries):
-        feedback = parsed[idx] if idx < len(parsed) else {"explanation": "", "tip": ""}
-        per_q_results.append({
-            "index": v["index"],
-            "question": v["question"],
-            "chosen_index": v["chosen_index"],
-            "correct_index": v["correct_index"],
-            "is_correct": v["is_correct"],
-            "explanation": feedback.get("explanation", ""),
-            "tip": feedback.get("tip", "")
+            "correct_index": correct_idx,
+            "is_correct": correct,
+            "explanation": q.get("explanation", ""),
+            "tip": "" if correct else q.get("study_tip", "")
         })
 
     score_pct = int((total / max_total) * 100) if max_total > 0 else 0
@@ -223,21 +273,15 @@ async def apply_and_create_quiz(
     Frontend expects JSON with quiz_id and resume_id and (optionally) questions.
     """
     db = get_db()
+    now = datetime.now(timezone.utc)
     # Read resume bytes and (optionally) parse text using your parser utilities
     resume_bytes = await file.read()
-    # Save resume to DB or file storage
-    resume_doc = {
-        "candidate_name": candidate_name,
-        "candidate_email": candidate_email,
-        "filename": file.filename,
-        "content_bytes": resume_bytes,  # consider storing in GridFS or external storage in prod
-        "created_at": datetime.utcnow()
-    }
-    res = db["resumes"].insert_one(resume_doc)
-    resume_id = str(res.inserted_id)
 
-    # Pull job description from jobs collection
-    job_doc = db["jobs"].find_one({"_id": ObjectId(job_id)})
+    # Upload the file to GridFS and pull the job description concurrently; they don't depend on each other
+    file_id, job_doc = await asyncio.gather(
+        get_mongodb().store_resume_file(file.filename, resume_bytes),
+        db["jobs"].find_one({"_id": ObjectId(job_id)}, {"raw_text": 1, "processed_text": 1, "job_description": 1})
+    )
     if not job_doc:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -248,21 +292,32 @@ async def apply_and_create_quiz(
     # generate quiz
     n_questions = 5
     try:
-        questions = generate_quiz_from_text(job_text, resume_text, n_questions=n_questions)
+        questions = await get_quiz_questions(job_text, resume_text, n_questions=n_questions)
     except HTTPException as e:
         # if Gemini generation fails, fallback to an empty quiz or simple skill checks
         raise
 
+    # ids are assigned up front so the resume and quiz documents can be written together
+    resume_oid = ObjectId()
+    resume_id = str(resume_oid)
+    resume_doc = {
+        "_id": resume_oid,
+        "candidate_name": candidate_name,
+        "candidate_email": candidate_email,
+        "filename": file.filename,
+        "file_id": file_id,
+        "created_at": now
+    }
     quiz_id = str(uuid.uuid4())
     quiz_doc = {
         "_id": quiz_id,
         "job_id": job_id,
         "resume_id": resume_id,
-        "created_at": datetime.utcnow(),
-        "questions": [q.dict() for q in questions],
+        "created_at": now,
+        "questions": questions,
         "meta": {"generated_by": "gemini", "model": GEMINI_MODEL}
     }
-    db["quizzes"].insert_one(quiz_doc)
+    await asyncio.gather(db["resumes"].insert_one(resume_doc), db["quizzes"].insert_one(quiz_doc))
 
     # Return quiz id (do NOT send correct_index back in the quiz fetch endpoint)
     return {"quiz_id": quiz_id, "resume_id": resume_id, "job_id": job_id}
@@ -271,7 +326,7 @@ async def apply_and_create_quiz(
 async def get_quiz(quiz_id: str):
     """Return quiz to candidate, but strip correct_index from payload."""
     db = get_db()
-    qdoc = db["quizzes"].find_one({"_id": quiz_id})
+    qdoc = await db["quizzes"].find_one({"_id": quiz_id})
     if not qdoc:
         raise HTTPException(status_code=404, detail="Quiz not found")
     questions = qdoc.get("questions", [])
@@ -290,32 +345,31 @@ async def get_quiz(quiz_id: str):
 async def submit_quiz(quiz_id: str, resume_id: str, request: Request):
     """
     Expects answers as query params like answers[0]=1&answers[1]=2 (frontend utils prepares that).
-    Gather answers, use Gemini to provide explanations and compute score, store evaluation and return results.
+    Gather answers, compute score with the stored explanations, store evaluation and return results.
     """
     db = get_db()
-    qdoc = db["quizzes"].find_one({"_id": quiz_id})
+    qdoc = await db["quizzes"].find_one({"_id": quiz_id})
     if not qdoc:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    # Parse answers from query parameters
-    params = dict(request.query_params)
-    # answers are passed as answers[0]=idx, answers[1]=idx, etc.
-    answers = []
-    i = 0
-    while True:
-        key = f"answers[{i}]"
-        if key in params:
+    # Parse answers from query parameters in one pass over the raw items
+    by_index = {}
+    for key, value in request.query_params.multi_items():
+        m = _ANSWER_KEY_RE.fullmatch(key)
+        if m:
             try:
-                answers.append(int(params[key]))
-            except Exception:
-                answers.append(None)
-            i += 1
-        else:
-            break
+                by_index[int(m.group(1))] = int(value)
+            except ValueError:
+                by_index[int(m.group(1))] = None
+    # answers stop at the first missing index, as before
+    answers = []
+    while len(answers) in by_index:
+        answers.append(by_index[len(answers)])
 
     # Evaluate answers
-    questions = [QuizQuestion(**q) for q in qdoc.get("questions", [])]
-    eval_result = evaluate_answers_with_gemini(questions, answers)
+    # stored questions were validated at generation time; read them as plain dicts
+    questions = qdoc.get("questions", [])
+    eval_result = evaluate_answers(questions, answers)
 
     # Store evaluation
     eval_doc = {
@@ -325,9 +379,23 @@ async def submit_quiz(quiz_id: str, resume_id: str, request: Request):
         "score_raw": eval_result["score_raw"],
         "score_pct": eval_result["score_pct"],
         "per_question": eval_result["per_question"],
-        "created_at": datetime.utcnow(),
-        "meta": {"evaluated_by": "gemini", "model": GEMINI_MODEL}
+        "created_at": datetime.now(timezone.utc),
+        # scored against the answer key stored with the questions; record which model wrote them
+        "meta": {"evaluated_by": "stored_key", "questions_model": (qdoc.get("meta") or {}).get("model")}
     }
-    db["evaluations"].insert_one(eval_doc)
-
-    return {"evaluation": eval_result, "stored": True}
+    await _get_eval_writer().add(eval_doc)
+
+    # buffered and written unacknowledged (w=0), so it is queued rather than confirmed stored
+    return {"evaluation": eval_result, "queued": True}
+
+@router.get("/job-evaluations/{job_id}/stream")
+async def stream_job_evaluations(job_id: str, limit: int = 50, min_score: int = None, verdict: str = None):
+    """Stream evaluation summaries for a job as NDJSON, one document per line, best score first."""
+    async def rows():
+        cursor = get_mongodb().get_evaluations_by_job(
+            job_id, limit=limit, min_score=min_score, verdict=verdict.upper() if verdict else None
+        )
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            yield orjson.dumps(doc, default=str) + b"\n"
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
@@ -1,26 +1,187 @@
 import os
 import json
+import atexit
+import base64
+import orjson
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sentence_transformers import SentenceTransformer, util
+import torch
 import faiss
 import hashlib
 import logging
+import threading
+import sqlite3
+from collections import OrderedDict
 from backend.config import Config
 
 logger = logging.getLogger(__name__)
 
+torch.set_num_threads(Config.TORCH_THREADS or os.cpu_count() or 1)
+try:
+    # one inter-op thread: encode() is a single graph, and FAISS runs its own OpenMP pool
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # already set, or inter-op work has started in this process
+    pass
+
 def _str_to_id(s: str) -> int:
     """Deterministic 63-bit int from string (for FAISS IDMap)"""
-    m = hashlib.md5(s.encode('utf-8')).hexdigest()
-    return int(m[:15], 16)  # fits in 64-bit comfortably
+    digest = hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') >> 1  # keep within signed int64
+
+def quantize_embedding(embedding: List[float]) -> Dict[str, Any]:
+    """Symmetric int8 quantization for storage: base64 int8 bytes plus the per-vector scale."""
+    v = np.asarray(embedding, dtype='float32')
+    max_abs = float(np.abs(v).max()) if v.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    q = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+    return {'embeddings_int8': base64.b64encode(q.tobytes()).decode('ascii'), 'embeddings_scale': scale}
+
+def dequantize_embedding(data: str, scale: float) -> List[float]:
+    q = np.frombuffer(base64.b64decode(data), dtype=np.int8)
+    return (q.astype('float32') * scale).tolist()
+
+class _EmbeddingCache:
+    """sha256(model name + text) -> float32 vector, persisted in SQLite with an in-process LRU in front."""
+
+    def __init__(self, path: str, model_name: str, memory_items: int = 4096):
+        self.model_name = model_name
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self._conn.commit()
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256((self.model_name + "\0" + text).encode('utf-8')).digest()
+
+    def _remember(self, key: bytes, vec: np.ndarray):
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found = {}
+        with self._lock:
+            missing = []
+            for k in keys:
+                vec = self._memory.get(k)
+                if vec is None:
+                    missing.append(k)
+                else:
+                    self._memory.move_to_end(k)
+                    found[k] = vec
+            # stay under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                for k, blob in self._conn.execute(f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", chunk):
+                    vec = np.frombuffer(blob, dtype='float32')
+                    self._remember(bytes(k), vec)
+                    found[bytes(k)] = vec
+        return found
+
+    def put_many(self, items: List[tuple]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                [(k, np.asarray(v, dtype='float32').tobytes()) for k, v in items]
+            )
+            self._conn.commit()
+            for k, v in items:
+                self._remember(k, np.asarray(v, dtype='float32'))
+
+
+class _OnnxEncoder:
+    """
+    Drop-in for the SentenceTransformer.encode calls used here, backed by a dynamically int8-quantized
+    ONNX export of the model (exported once under FAISS_PERSIST_DIR). Mean pooling + L2 norm as in SBERT.
+    """
+
+    # sentence-transformers truncates MiniLM-family models at 256 tokens
+    MAX_LENGTH = 256
+
+    def __init__(self, model_name: str, cache_dir: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        repo_id = model_name if '/' in model_name else f"sentence-transformers/{model_name}"
+        export_dir = os.path.join(cache_dir, "onnx", repo_id.replace('/', '__'))
+        model_path = os.path.join(export_dir, "model_quantized.onnx")
+        if not os.path.exists(model_path):
+            self._export(repo_id, export_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in ort.get_available_providers()]
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=providers)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.dim = int(self.encode(["dimension probe"]).shape[1])
+
+    @staticmethod
+    def _export(repo_id: str, export_dir: str):
+        from optimum.exporters.onnx import main_export
+        from optimum.onnxruntime import ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        logger.info(f"Exporting {repo_id} to ONNX under {export_dir}")
+        main_export(repo_id, output=export_dir, task="feature-extraction")
+        quantizer = ORTQuantizer.from_pretrained(export_dir, file_name="model.onnx")
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=True)
+        quantizer.quantize(save_dir=export_dir, quantization_config=qconfig)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dim), dtype='float32')
+        # length-sort like SentenceTransformer.encode so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            enc = self.tokenizer(batch, padding=True, truncation=True,
+                                 max_length=self.MAX_LENGTH, return_tensors="np")
+            feeds = {k: v.astype('int64') for k, v in enc.items() if k in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+            mask = enc["attention_mask"][..., None].astype('float32')
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.sqrt(np.einsum('ij,ij->i', pooled, pooled))[:, None], 1e-12, None)
+            chunks.append(pooled.astype('float32'))
+        out = np.empty((len(texts), chunks[0].shape[1]), dtype='float32')
+        out[order] = np.vstack(chunks)
+        return out[0] if single else out
+
 
 class EmbeddingService:
     def __init__(self):
         model_name = Config.EMBEDDING_MODEL or "all-MiniLM-L6-v2"
-        logger.info(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.model = None
+        if Config.EMBEDDING_ONNX:
+            try:
+                logger.info(f"Loading ONNX embedding model: {model_name}")
+                self.model = _OnnxEncoder(model_name, Config.FAISS_PERSIST_DIR)
+                # int8 vectors differ slightly from torch ones; keep their cache entries apart
+                cache_model_name = model_name + ":onnx-int8"
+            except Exception as e:
+                logger.warning(f"ONNX embedding model unavailable ({e}); falling back to sentence-transformers")
+                self.model = None
+        if self.model is None:
+            logger.info(f"Loading embedding model: {model_name}")
+            self.model = SentenceTransformer(model_name)
+            cache_model_name = model_name
         self.dim = self.model.get_sentence_embedding_dimension()
+        # leave a core for the event loop; FAISS parallelises batched searches across the rest
+        faiss.omp_set_num_threads(max(1, (os.cpu_count() or 1) - 1))
 
         os.makedirs(Config.FAISS_PERSIST_DIR, exist_ok=True)
         # Two indexes: resumes and jobs
@@ -30,16 +191,43 @@ class EmbeddingService:
         self.job_meta_path = os.path.join(Config.FAISS_PERSIST_DIR, "job_meta.json")
 
         # Load or create index and metadata
+        self._mmapped = set()
         self.resume_index = self._load_or_create_index(self.resume_index_path)
         self.job_index = self._load_or_create_index(self.job_index_path)
+        # kind -> flat buffer of vectors added since its memory-mapped (read-only) index file was last merged
+        self._buffers = {kind: self._load_buffer(getattr(self, f'{kind}_index_path'))
+                         for kind in ('resume', 'job') if getattr(self, f'{kind}_index_path') in self._mmapped}
         self.resume_meta = self._load_meta(self.resume_meta_path)
         self.job_meta = self._load_meta(self.job_meta_path)
+        # FAISS indexes and the meta dicts are not safe for concurrent writers
+        self._index_lock = threading.Lock()
+        # (1, dim) vector / id rows reused by single-document adds of a caller-supplied vector (guarded by _index_lock)
+        self._add_buf = np.empty((1, self.dim), dtype=np.float32)
+        self._id_buf = np.empty(1, dtype=np.int64)
+        # adds since the last save, per kind; written every Config.FAISS_FLUSH_EVERY adds, on flush() and at exit
+        self._dirty = {'resume': 0, 'job': 0}
+        atexit.register(self.flush)
+        # unchanged text (re-uploads, re-indexing) skips the forward pass
+        self._cache = _EmbeddingCache(os.path.join(Config.FAISS_PERSIST_DIR, "embedding_cache.sqlite3"),
+                                      cache_model_name)
+        # stored on resume/job records next to their vectors; a mismatch means the vector came from another model
+        self.version = cache_model_name
 
     def _load_or_create_index(self, path: str):
         if os.path.exists(path):
             try:
-                idx = faiss.read_index(path)
-                logger.info(f"Loaded FAISS index from {path}")
+                idx = None
+                if Config.FAISS_MMAP:
+                    idx = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                    if faiss.try_extract_index_ivf(faiss.downcast_index(idx.index)) is None:
+                        # only IVF inverted lists are served from the mapping; flat indexes are read normally
+                        idx = None
+                    else:
+                        self._mmapped.add(path)
+                if idx is None:
+                    idx = faiss.read_index(path)
+                logger.info(f"Loaded FAISS index from {path}{' (mmap)' if path in self._mmapped else ''}")
+                self._apply_search_params(idx)
                 return idx
             except Exception as e:
                 logger.warning(f"Failed to read index at {path}: {e}. Creating new one.")
@@ -48,6 +236,86 @@ class EmbeddingService:
         id_index = faiss.IndexIDMap(index)
         return id_index
 
+    def _load_buffer(self, path: str):
+        buffer_path = path + '.buffer'
+        if os.path.exists(buffer_path):
+            try:
+                return faiss.read_index(buffer_path)
+            except Exception as e:
+                logger.warning(f"Failed to read index buffer at {buffer_path}: {e}. Starting empty.")
+        return faiss.IndexIDMap(faiss.IndexFlatIP(self.dim))
+
+    def _merge_buffer(self, kind: str):
+        """Fold the in-RAM buffer into the index file and re-map it; the mapping itself cannot be written to."""
+        path = getattr(self, f'{kind}_index_path')
+        buffer = self._buffers[kind]
+        index = faiss.read_index(path)
+        vectors = faiss.downcast_index(buffer.index).reconstruct_n(0, buffer.ntotal)
+        index.add_with_ids(vectors, faiss.vector_to_array(buffer.id_map).astype('int64'))
+        if not self._save_index(index, path):
+            self._save_index(buffer, path + '.buffer')
+            return
+        mapped = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        self._apply_search_params(mapped)
+        setattr(self, f'{kind}_index', mapped)
+        self._buffers[kind] = faiss.IndexIDMap(faiss.IndexFlatIP(self.dim))
+        if os.path.exists(path + '.buffer'):
+            os.remove(path + '.buffer')
+        logger.info(f"Merged {len(vectors)} buffered vectors into {path}")
+
+    def _search(self, kind: str, q: np.ndarray, k: int):
+        """Search the index plus any unmerged buffer, keeping the k best per query."""
+        index = getattr(self, f'{kind}_index')
+        buffer = self._buffers.get(kind)
+        if buffer is None or buffer.ntotal == 0:
+            return index.search(q, k)
+        if index.ntotal == 0:
+            return buffer.search(q, k)
+        d_main, i_main = index.search(q, min(k, index.ntotal))
+        d_buf, i_buf = buffer.search(q, min(k, buffer.ntotal))
+        distances = np.concatenate([d_main, d_buf], axis=1)
+        ids = np.concatenate([i_main, i_buf], axis=1)
+        order = np.argsort(-distances, axis=1)[:, :k]
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+    def _ntotal(self, kind: str) -> int:
+        buffer = self._buffers.get(kind)
+        return getattr(self, f'{kind}_index').ntotal + (buffer.ntotal if buffer is not None else 0)
+
+    def _apply_search_params(self, index):
+        """Set nprobe / efSearch on approximate indexes; flat indexes are left alone."""
+        inner = faiss.downcast_index(index.index) if hasattr(index, 'index') else faiss.downcast_index(index)
+        ivf = faiss.try_extract_index_ivf(inner)
+        if ivf is not None:
+            ivf.nprobe = Config.FAISS_NPROBE
+            quantizer = faiss.downcast_index(ivf.quantizer)
+            if isinstance(quantizer, faiss.IndexHNSW):
+                quantizer.hnsw.efSearch = Config.FAISS_EF_SEARCH
+        elif isinstance(inner, faiss.IndexHNSW):
+            inner.hnsw.efSearch = Config.FAISS_EF_SEARCH
+
+    def _maybe_upgrade_index(self, index):
+        """
+        Once a flat index holds Config.FAISS_TRAIN_MIN vectors, train a Config.FAISS_INDEX_TYPE index
+        (e.g. "IVF4096_HNSW32,PQ32") on them and re-add everything with the same ids.
+        Returns the index to keep using (unchanged when no upgrade applies).
+        """
+        if not Config.FAISS_INDEX_TYPE or index.ntotal < Config.FAISS_TRAIN_MIN:
+            return index
+        inner = faiss.downcast_index(index.index)
+        if not isinstance(inner, faiss.IndexFlat):
+            return index
+        vectors = inner.reconstruct_n(0, inner.ntotal)
+        ids = faiss.vector_to_array(index.id_map).astype('int64')
+        logger.info(f"Training {Config.FAISS_INDEX_TYPE} index on {len(ids)} vectors")
+        trained = faiss.IndexIDMap2(
+            faiss.index_factory(self.dim, Config.FAISS_INDEX_TYPE, faiss.METRIC_INNER_PRODUCT)
+        )
+        trained.train(vectors)
+        trained.add_with_ids(vectors, ids)
+        self._apply_search_params(trained)
+        return trained
+
     def _load_meta(self, path: str) -> Dict[str, Any]:
         if os.path.exists(path):
             try:
@@ -58,59 +326,161 @@ class EmbeddingService:
         return {}
 
     def _save_meta(self, path: str, meta: Dict[str, Any]):
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, path)
 
-    def _save_index(self, index, path: str):
+    def _save_index(self, index, path: str) -> bool:
         try:
-            faiss.write_index(index, path)
+            tmp_path = path + '.tmp'
+            faiss.write_index(index, tmp_path)
+            os.replace(tmp_path, path)
+            return True
         except Exception as e:
             logger.error(f"Failed to write FAISS index to {path}: {e}")
+            return False
+
+    def _persist(self, kind: str):
+        self._save_meta(getattr(self, f'{kind}_meta_path'), getattr(self, f'{kind}_meta'))
+        buffer = self._buffers.get(kind)
+        if buffer is None:
+            self._save_index(getattr(self, f'{kind}_index'), getattr(self, f'{kind}_index_path'))
+        elif buffer.ntotal >= Config.FAISS_MMAP_MERGE_EVERY:
+            self._merge_buffer(kind)
+        else:
+            self._save_index(buffer, getattr(self, f'{kind}_index_path') + '.buffer')
+        self._dirty[kind] = 0
 
-    def generate_embeddings(self, text: str) -> List[float]:
+    def flush(self):
+        """Write any unsaved index/meta changes to disk."""
+        with self._index_lock:
+            for kind, dirty in self._dirty.items():
+                if dirty:
+                    self._persist(kind)
+
+    def generate_embeddings(self, text: str) -> np.ndarray:
+        """float32 (dim,) vector; convert with .tolist() only where it is written to JSON/the DB."""
         if not text:
-            return [0.0] * self.dim
-        emb = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
-        return emb.tolist()
+            return np.zeros(self.dim, dtype='float32')
+        key = self._cache.key(text)
+        cached = self._cache.get_many([key]).get(key)
+        if cached is not None:
+            return cached
+        emb = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True).astype('float32', copy=False)
+        self._cache.put_many([(key, emb)])
+        return emb
+
+    def generate_embeddings_batch(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Encode many texts in one forward pass per batch into an (N, dim) float32 matrix; empty texts get zero rows."""
+        results = np.zeros((len(texts), self.dim), dtype='float32')
+        keys = {i: self._cache.key(t) for i, t in enumerate(texts) if t}
+        cached = self._cache.get_many(list(set(keys.values())))
+        # encode each distinct uncached text once
+        to_encode: Dict[bytes, str] = {}
+        for i, k in keys.items():
+            if k not in cached:
+                to_encode.setdefault(k, texts[i])
+        if to_encode:
+            # encode() length-sorts internally (and restores order), so no pre-sorting here
+            embs = self.model.encode(list(to_encode.values()), batch_size=batch_size or Config.EMB_BATCH_SIZE,
+                                     show_progress_bar=False, convert_to_numpy=True, normalize_embeddings=True)
+            fresh = list(zip(to_encode.keys(), embs))
+            self._cache.put_many(fresh)
+            cached.update(fresh)
+        for i, k in keys.items():
+            results[i] = cached[k]
+        return results
 
+    # Embeddings are produced with normalize_embeddings=True (empty text gives the zero vector),
+    # so cosine similarity is a plain dot product. Int8-dequantized vectors are within ~1e-3 of unit length.
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
-        v1 = np.array(embedding1)
-        v2 = np.array(embedding2)
-        if np.linalg.norm(v1) == 0 or np.linalg.norm(v2) == 0:
-            return 0.0
-        cosine = float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
-        return cosine * 100.0
-
-    def store_resume_embedding(self, resume_id: str, text: str, metadata: Dict = None):
-        embedding = np.array(self.generate_embeddings(text), dtype='float32')
-        id_int = _str_to_id(resume_id)
-        try:
-            self.resume_index.add_with_ids(np.array([embedding]), np.array([id_int], dtype='int64'))
-        except Exception as e:
-            logger.warning(f"Could not add id {id_int} directly: {e}. Recreating index and re-adding.")
-            # fallback: recreate index, re-add existing vectors
-            self._rebuild_index_from_meta(self.resume_index, self.resume_meta)
-            self.resume_index.add_with_ids(np.array([embedding]), np.array([id_int], dtype='int64'))
-
-        self.resume_meta[str(id_int)] = {'resume_id': resume_id, 'metadata': metadata or {}}
-        self._save_meta(self.resume_meta_path, self.resume_meta)
-        self._save_index(self.resume_index, self.resume_index_path)
-        return embedding.tolist()
-
-    def store_job_embedding(self, job_id: str, text: str, metadata: Dict = None):
-        embedding = np.array(self.generate_embeddings(text), dtype='float32')
-        id_int = _str_to_id(job_id)
-        try:
-            self.job_index.add_with_ids(np.array([embedding]), np.array([id_int], dtype='int64'))
-        except Exception as e:
-            logger.warning(f"Could not add job id {id_int}: {e}. Rebuilding index.")
-            self._rebuild_index_from_meta(self.job_index, self.job_meta)
-            self.job_index.add_with_ids(np.array([embedding]), np.array([id_int], dtype='int64'))
+        v1 = np.asarray(embedding1, dtype='float32')
+        v2 = np.asarray(embedding2, dtype='float32')
+        return float(np.dot(v1, v2)) * 100.0
+
+    def calculate_similarities(self, embeddings: List[List[float]], target: List[float]) -> np.ndarray:
+        """Cosine similarity (0-100) of every row of `embeddings` against `target`, as one matrix-vector product."""
+        m = np.ascontiguousarray(embeddings, dtype='float32')
+        if m.size == 0:
+            return np.zeros(0, dtype='float32')
+        return self.score_many(m, np.asarray(target, dtype='float32')) * 100.0
+
+    @staticmethod
+    def score_many(matrix: np.ndarray, vec: np.ndarray) -> np.ndarray:
+        """Raw dot products of an (N, dim) float32 matrix of unit vectors against one unit vector."""
+        return matrix @ vec
+
+    def store_resume_embedding(self, resume_id: str, text: str, metadata: Dict = None,
+                               embedding: Optional[np.ndarray] = None):
+        # callers that already encoded the text can pass the vector in to skip a second encode
+        embs = self.store_resume_embeddings_batch(
+            [resume_id], [text], [metadata], embeddings=None if embedding is None else [embedding]
+        )
+        return embs[0].tolist()
+
+    def store_resume_embeddings_batch(self, resume_ids: List[str], texts: List[str],
+                                      metadatas: Optional[List[Dict]] = None,
+                                      embeddings: Optional[List[List[float]]] = None) -> np.ndarray:
+        """Encode (unless `embeddings` is given) and index many resumes with one FAISS add and one save."""
+        return self._store_batch('resume', resume_ids, texts, metadatas, embeddings)
+
+    def store_job_embedding(self, job_id: str, text: str, metadata: Dict = None,
+                            embedding: Optional[np.ndarray] = None):
+        # as store_resume_embedding: pass an already-encoded vector to skip the second encode
+        embs = self.store_job_embeddings_batch(
+            [job_id], [text], [metadata], embeddings=None if embedding is None else [embedding]
+        )
+        return embs[0].tolist()
 
-        self.job_meta[str(id_int)] = {'job_id': job_id, 'metadata': metadata or {}}
-        self._save_meta(self.job_meta_path, self.job_meta)
-        self._save_index(self.job_index, self.job_index_path)
-        return embedding.tolist()
+    def store_job_embeddings_batch(self, job_ids: List[str], texts: List[str],
+                                   metadatas: Optional[List[Dict]] = None,
+                                   embeddings: Optional[List[List[float]]] = None) -> np.ndarray:
+        return self._store_batch('job', job_ids, texts, metadatas, embeddings)
+
+    def _store_batch(self, kind: str, doc_ids: List[str], texts: List[str], metadatas: Optional[List[Dict]],
+                     embeddings: Optional[List[List[float]]]) -> np.ndarray:
+        """Shared resume/job path; `kind` selects the <kind>_index / <kind>_meta attributes."""
+        if not doc_ids:
+            return np.zeros((0, self.dim), dtype='float32')
+        scratch = len(doc_ids) == 1 and embeddings is not None
+        if not scratch:
+            embs = np.asarray(embeddings if embeddings is not None else self.generate_embeddings_batch(texts),
+                              dtype='float32').reshape(len(doc_ids), self.dim)
+            id_arr = np.array([_str_to_id(d) for d in doc_ids], dtype='int64')
+        metadatas = metadatas or [None] * len(doc_ids)
+        id_field = f'{kind}_id'
+        meta = getattr(self, f'{kind}_meta')
+        with self._index_lock:
+            if scratch:
+                # faiss copies on add, so the shared rows can be overwritten by the next call
+                self._add_buf[0] = embeddings[0]
+                self._id_buf[0] = _str_to_id(doc_ids[0])
+                embs, id_arr = self._add_buf, self._id_buf
+            buffer = self._buffers.get(kind)
+            if buffer is not None:
+                # the mapped index is read-only; new vectors wait in the buffer until the next merge
+                buffer.add_with_ids(embs, id_arr)
+            else:
+                index = getattr(self, f'{kind}_index')
+                try:
+                    index.add_with_ids(embs, id_arr)
+                except Exception as e:
+                    logger.warning(f"Could not add {len(doc_ids)} ids directly: {e}. Rebuilding index and re-adding.")
+                    # fallback: recreate index, re-add existing vectors
+                    self._rebuild_index_from_meta(index, meta)
+                    index.add_with_ids(embs, id_arr)
+                index = self._maybe_upgrade_index(index)
+                setattr(self, f'{kind}_index', index)
+
+            for doc_id, id_int, metadata in zip(doc_ids, id_arr, metadatas):
+                meta[str(int(id_int))] = {id_field: doc_id, 'metadata': metadata or {}}
+            self._dirty[kind] += len(doc_ids)
+            if self._dirty[kind] >= Config.FAISS_FLUSH_EVERY:
+                self._persist(kind)
+            if scratch:
+                embs = embs.copy()
+        return embs
 
     def _rebuild_index_from_meta(self, index, meta):
         # best-effort: no-op currently; could be extended to re-encode stored documents
@@ -119,23 +489,40 @@ class EmbeddingService:
     def find_similar_resumes(self, job_embedding: List[float], top_k: int = 10) -> List[Dict]:
         if len(self.resume_meta) == 0:
             return []
-        q = np.array(self.generate_embeddings(job_embedding if isinstance(job_embedding, str) else " ".join(map(str, job_embedding))), dtype='float32') \
-            if isinstance(job_embedding, str) else np.array(job_embedding, dtype='float32')
+        q = self.generate_embeddings(job_embedding) if isinstance(job_embedding, str) \
+            else np.asarray(job_embedding, dtype='float32')
+        return self.find_similar_resumes_batch(q.reshape(1, -1), top_k)[0]
+
+    def find_similar_resumes_batch(self, job_embs_matrix: np.ndarray, top_k: int = 10) -> List[List[Dict]]:
+        """Search an (M, dim) matrix of job embeddings in one FAISS call; returns M result lists."""
+        q = np.asarray(job_embs_matrix, dtype='float32')
         if q.ndim == 1:
             q = q.reshape(1, -1)
+        if len(self.resume_meta) == 0:
+            return [[] for _ in range(q.shape[0])]
+        # stored vectors are unit-norm; normalising the (possibly dequantized) queries keeps inner product == cosine
+        norm = np.sqrt(np.einsum('ij,ij->i', q, q))[:, None]
+        q = np.ascontiguousarray(np.divide(q, norm, out=np.zeros_like(q), where=norm != 0))
+        # asking for more neighbours than the index holds only pads the result with -1 ids
+        k = min(top_k, self._ntotal('resume'))
+        if k <= 0:
+            return [[] for _ in range(q.shape[0])]
         try:
-            distances, ids = self.resume_index.search(q, top_k)
+            distances, ids = self._search('resume', q, k)
         except Exception as e:
             logger.error(f"FAISS search failed: {e}")
-            return []
-        results = []
-        for distance, id_val in zip(distances[0], ids[0]):
-            if id_val == -1:
-                continue
-            meta = self.resume_meta.get(str(int(id_val)), {})
-            results.append({
-                'resume_id': meta.get('resume_id'),
-                'similarity_score': float(distance) * 100.0,
-                'metadata': meta.get('metadata', {})
-            })
-        return results
+            return [[] for _ in range(q.shape[0])]
+        batch = []
+        for row_distances, row_ids in zip(distances, ids):
+            results = []
+            for distance, id_val in zip(row_distances, row_ids):
+                if id_val == -1:
+                    continue
+                meta = self.resume_meta.get(str(int(id_val)), {})
+                results.append({
+                    'resume_id': meta.get('resume_id'),
+                    'similarity_score': float(distance) * 100.0,
+                    'metadata': meta.get('metadata', {})
+                })
+            batch.append(results)
+        return batch
@@ -1,7 +1,9 @@
 # backend/services/job_service.py
 import os
 import json
+import asyncio
 import uuid
+import orjson
 import tempfile
 import logging
 from datetime import datetime
@@ -21,6 +23,9 @@ logger = logging.getLogger(__name__)
 os.makedirs(Config.DATA_DIR, exist_ok=True)
 
 JOB_DB_PATH = os.path.join(Config.DATA_DIR, "jobs_db.json")
+# uploads are appended here; folded back into JOB_DB_PATH on startup or once it passes the threshold
+JOB_WAL_PATH = JOB_DB_PATH + ".wal"
+WAL_COMPACT_THRESHOLD = int(os.getenv('WAL_COMPACT_THRESHOLD', 200))
 
 # configure genai if key present
 if Config.GEMINI_API_KEY:
@@ -34,16 +39,51 @@ class JobService:
     def __init__(self):
         self.parser = doc_parser_module.DocumentParser()
         self.embedding_service = EmbeddingService()
+        self.gemini_model = genai.GenerativeModel(Config.GEMINI_MODEL) if Config.GEMINI_API_KEY else None
 
         # load existing jobs
         if os.path.exists(JOB_DB_PATH):
             try:
-                with open(JOB_DB_PATH, "r", encoding="utf-8") as f:
-                    self._jobs = json.load(f)
+                with open(JOB_DB_PATH, "rb") as f:
+                    self._jobs = orjson.loads(f.read())
             except Exception:
                 self._jobs = {}
         else:
             self._jobs = {}
+        self._wal_count = 0
+        if os.path.exists(JOB_WAL_PATH):
+            with open(JOB_WAL_PATH, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        job = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # torn write from a crash mid-append; everything before it is intact
+                        logger.warning(f"Skipping corrupt WAL entry in {JOB_WAL_PATH}")
+                        continue
+                    self._jobs[job["job_id"]] = job
+                    self._wal_count += 1
+            if self._wal_count:
+                self._compact()
+
+    def _append_job(self, job: dict):
+        """Persist one job by appending it to the WAL instead of rewriting the whole DB."""
+        with open(JOB_WAL_PATH, "ab") as f:
+            f.write(orjson.dumps(job) + b"\n")
+        self._wal_count += 1
+        if self._wal_count > WAL_COMPACT_THRESHOLD:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the JSON snapshot atomically from memory and truncate the WAL."""
+        tmp_path = JOB_DB_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(self._jobs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, JOB_DB_PATH)
+        open(JOB_WAL_PATH, "wb").close()
+        self._wal_count = 0
 
     async def upload_job_description(self, job_title: str, company_name: str, location: str, posted_by: str, file: Optional[UploadFile], job_text: Optional[str]):
         """
@@ -57,36 +97,48 @@ class JobService:
             temp_path = None
             if file:
                 suffix = os.path.splitext(file.filename)[1].lower()
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(await file.read())
-                    temp_path = tmp.name
-                # use parser methods
-                if suffix == ".pdf":
-                    raw_text = self.parser.extract_text_from_pdf(temp_path)
-                else:
-                    raw_text = self.parser.extract_text_from_docx(temp_path)
-
-                # remove temp
                 try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
+                    # copy in 64 KiB chunks so memory stays flat regardless of upload size
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                        temp_path = tmp.name
+                        while True:
+                            chunk = await file.read(1 << 16)
+                            if not chunk:
+                                break
+                            tmp.write(chunk)
+                    # use parser methods
+                    if suffix == ".pdf":
+                        raw_text = self.parser.extract_text_from_pdf(temp_path)
+                    else:
+                        raw_text = self.parser.extract_text_from_docx(temp_path)
+                finally:
+                    # remove temp, including when the copy or extraction fails
+                    try:
+                        os.unlink(temp_path)
+                    except Exception:
+                        pass
 
             if not raw_text:
                 return {"status": "error", "message": "No text extracted from file or job_text empty."}
 
             # Step 2: try Gemini structured parsing
             parsed = None
-            if Config.GEMINI_API_KEY:
+            if self.gemini_model is not None:
                 try:
-                    model = genai.GenerativeModel(Config.GEMINI_MODEL or "gemini-1.5-flash")
                     prompt = self._build_prompt_for_gemini(raw_text)
-                    resp = model.generate_content(prompt)
+                    # the SDK call is blocking; keep it off the event loop and bound how long an upload waits on it
+                    resp = await asyncio.wait_for(
+                        asyncio.to_thread(self.gemini_model.generate_content, prompt),
+                        timeout=Config.GEMINI_TIMEOUT
+                    )
                     json_text = resp.text.strip()
                     # strip code fences if present
                     if json_text.startswith("```"):
                         json_text = json_text.split("```", 2)[-1]
                     parsed = json.loads(json_text)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Gemini parse timed out after {Config.GEMINI_TIMEOUT}s. Falling back to local parser.")
+                    parsed = None
                 except Exception as e:
                     logger.warning(f"Gemini parse failed: {e}. Falling back to local parser.")
                     parsed = None
@@ -126,9 +178,8 @@ class JobService:
                 logger.error(f"Embedding store failed: {e}")
 
             # Step 5: persist job to local DB
-            self._jobs[job_id] = json.loads(jd.json())
-            with open(JOB_DB_PATH, "w", encoding="utf-8") as f:
-                json.dump(self._jobs, f, ensure_ascii=False, indent=2)
+            self._jobs[job_id] = jd.dict()
+            self._append_job(self._jobs[job_id])
 
             return {"status": "ok", "job_id": job_id, "job": self._jobs[job_id]}
 
@@ -1,7 +1,7 @@
 from typing import Dict, List, Tuple, Any
-from rapidfuzz import fuzz
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+from rapidfuzz import fuzz, process
+from sklearn.feature_extraction.text import HashingVectorizer
 import numpy as np
 import re
 from backend.config import Config
@@ -9,13 +9,32 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_KEYWORD_STOP_WORDS = frozenset({
+    'the', 'is', 'at', 'which', 'on', 'and', 'a', 'an', 'as', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do',
+    'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might'
+})
+# checked in priority order: an explicit "N years of experience" wins over later phrasings
+_EXP_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+)[\+\s]*years?\s+(?:of\s+)?experience',
+    r'experience[:\s]+(\d+)[\+\s]*years?',
+    r'(\d+)[\+\s]*years?\s+working'
+))
+_YEAR_RE = re.compile(r'20\d{2}')
+
 class MatchingService:
     def __init__(self):
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=2000,
+        # stateless term-frequency vectors (L2-normalised), so nothing is refit per resume/job pair
+        self.tfidf_vectorizer = HashingVectorizer(
+            n_features=2 ** 18,
             stop_words='english',
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2'
         )
+        # the same job is scored against many resumes (and many batches); vectorize its text once
+        self._job_vector = lru_cache(maxsize=64)(lambda text: self.tfidf_vectorizer.transform([text]))
 
     def calculate_hard_match(self, resume: Dict, job_desc: Dict) -> Dict[str, Any]:
         """Calculate hard match score based on keywords and requirements"""
@@ -36,19 +55,12 @@ class MatchingService:
         required_skills = [s.lower() for s in job_desc.get('required_skills', [])]
         optional_skills = [s.lower() for s in job_desc.get('optional_skills', [])]
 
-        matched_required = []
-        missing_required = []
-
-        for skill in required_skills:
-            if self._fuzzy_skill_match(skill, resume_skills):
-                matched_required.append(skill)
-            else:
-                missing_required.append(skill)
+        required_mask = self._fuzzy_match_mask(required_skills, resume_skills)
+        matched_required = [s for s, hit in zip(required_skills, required_mask) if hit]
+        missing_required = [s for s, hit in zip(required_skills, required_mask) if not hit]
 
-        matched_optional = []
-        for skill in optional_skills:
-            if self._fuzzy_skill_match(skill, resume_skills):
-                matched_optional.append(skill)
+        optional_mask = self._fuzzy_match_mask(optional_skills, resume_skills)
+        matched_optional = [s for s, hit in zip(optional_skills, optional_mask) if hit]
 
         if required_skills:
             required_score = (len(matched_required) / len(required_skills)) * 70
@@ -98,14 +110,9 @@ class MatchingService:
         resume_certs = [c.lower() for c in resume.get('certifications', [])]
         required_certs = [c.lower() for c in job_desc.get('certifications_required', [])]
         
-        matched_certs = []
-        missing_certs = []
-
-        for cert in required_certs:
-            if self._fuzzy_skill_match(cert, resume_certs, threshold=70):
-                matched_certs.append(cert)
-            else:
-                missing_certs.append(cert)
+        cert_mask = self._fuzzy_match_mask(required_certs, resume_certs, threshold=70)
+        matched_certs = [c for c, hit in zip(required_certs, cert_mask) if hit]
+        missing_certs = [c for c, hit in zip(required_certs, cert_mask) if not hit]
 
         if required_certs:
             scores['certification_match'] = (len(matched_certs) / len(required_certs)) * 100
@@ -147,9 +154,7 @@ class MatchingService:
 
         # 1. TF-IDF similarity
         try:
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform([resume_text, job_text])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            scores['tfidf_similarity'] = similarity * 100
+            scores['tfidf_similarity'] = float(self.calculate_tfidf_similarities([resume_text], job_text)[0])
         except Exception as e:
             logger.error(f"TF-IDF calculation error: {e}")
             scores['tfidf_similarity'] = 0
@@ -161,7 +166,8 @@ class MatchingService:
 
         # 3. Keyword density
         job_keywords = self._extract_keywords(job_text)
-        keyword_matches = sum(1 for keyword in job_keywords if keyword in resume_text.lower())
+        resume_lower = resume_text.lower()
+        keyword_matches = sum(1 for keyword in job_keywords if keyword in resume_lower)
         if job_keywords:
             scores['keyword_density'] = (keyword_matches / len(job_keywords)) * 100
 
@@ -180,31 +186,35 @@ class MatchingService:
 
         return scores
 
+    def calculate_tfidf_similarities(self, resume_texts: List[str], job_text: str) -> np.ndarray:
+        """Term-vector cosine (0-100) of each resume against one job, as a single sparse product."""
+        resumes = self.tfidf_vectorizer.transform(resume_texts)
+        job = self._job_vector(job_text)
+        return (resumes @ job.T).toarray().ravel() * 100
+
     def _fuzzy_skill_match(self, skill: str, resume_skills: List[str], threshold: int = 80) -> bool:
         """Check if skill matches any resume skill using fuzzy matching"""
-        for resume_skill in resume_skills:
-            if fuzz.ratio(skill, resume_skill) >= threshold:
-                return True
-            if fuzz.partial_ratio(skill, resume_skill) >= threshold:
-                return True
-        return False
+        return bool(self._fuzzy_match_mask([skill], resume_skills, threshold)[0])
+
+    def _fuzzy_match_mask(self, skills: List[str], resume_skills: List[str], threshold: int = 80) -> np.ndarray:
+        """For each skill, whether ratio or partial_ratio reaches threshold against any resume skill.
+        Scores every pair in one rapidfuzz cdist call per scorer instead of a Python double loop."""
+        if not skills or not resume_skills:
+            return np.zeros(len(skills), dtype=bool)
+        ratio = process.cdist(skills, resume_skills, scorer=fuzz.ratio, score_cutoff=threshold)
+        partial = process.cdist(skills, resume_skills, scorer=fuzz.partial_ratio, score_cutoff=threshold)
+        return (np.maximum(ratio, partial) >= threshold).any(axis=1)
 
     def _extract_experience_years(self, text: str) -> int:
-        patterns = [
-            r'(\d+)[\+\s]*years?\s+(?:of\s+)?experience',
-            r'experience[:\s]+(\d+)[\+\s]*years?',
-            r'(\d+)[\+\s]*years?\s+working'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _EXP_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return int(match.group(1))
 
-        year_mentions = re.findall(r'20\d{2}', text)
+        year_mentions = _YEAR_RE.findall(text)
         if len(year_mentions) >= 2:
-            years = sorted([int(y) for y in year_mentions])
-            return years[-1] - years[0]
+            years = [int(y) for y in year_mentions]
+            return max(years) - min(years)
         return 0
 
     def _match_education(self, resume_education: List[Dict], job_requirements: List[str]) -> float:
@@ -227,25 +237,11 @@ class MatchingService:
         return matches / len(job_requirements) if job_requirements else 1.0
 
     def _extract_keywords(self, text: str, top_n: int = 20) -> List[str]:
-        stop_words = {'the', 'is', 'at', 'which', 'on', 'and', 'a', 'an', 'as', 'are',
-                      'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do',
-                      'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might'}
-
-        words = text.lower().split()
-        keywords = []
-        for word in words:
-            word = re.sub(r'[^\w\s]', '', word)
-            if len(word) > 3 and word not in stop_words:
-                keywords.append(word)
-
-        return list(dict.fromkeys(keywords))[:top_n]
+        # stripping punctuation before splitting gives the same tokens as stripping each word, in one pass
+        words = _PUNCT_RE.sub('', text.lower()).split()
+        keywords = dict.fromkeys(w for w in words if len(w) > 3 and w not in _KEYWORD_STOP_WORDS)
+        return list(keywords)[:top_n]
 
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        return float(dot_product / (norm1 * norm2))
\ No newline at end of file
+        # sentence embeddings are stored L2-normalised, so cosine is the dot product
+        return float(np.dot(np.asarray(vec1, dtype='float32'), np.asarray(vec2, dtype='float32')))
\ No newline at end of file
@@ -1,7 +1,15 @@
 import PyPDF2
-import pdfplumber
+import fitz  # PyMuPDF
 import docx2txt
+import ahocorasick
+try:
+    import hyperscan
+except ImportError:  # optional: contact extraction falls back to re
+    hyperscan = None
 from typing import Dict, List, Any, Optional
+from functools import cached_property
+from itertools import islice
+import io
 import re
 import spacy
 import nltk
@@ -10,37 +18,121 @@ import logging
 # Download required NLTK data (silent)
 nltk.download('punkt', quiet=True)
 
-# Load spaCy model (try to auto-download if missing)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except Exception:
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=False)
-    nlp = spacy.load("en_core_web_sm")
+# spaCy components the parser has no use for; loading only the tokenizer/tagger keeps start-up and RSS down
+SPACY_DISABLE = ["parser", "ner", "lemmatizer", "attribute_ruler"]
 
 logger = logging.getLogger(__name__)
 
+# Patterns compiled once; flags match what each call site used to pass (or embed) inline
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}')
+SKILLS_SECTION_RE = re.compile(r'(skills|technical skills|competencies)[:\s]*([^\n]+(?:\n[^\n]+)*)', re.IGNORECASE)
+EDU_SECTION_RE = re.compile(r'(education|academic|qualification)[:\s]*([^\n]+(?:\n[^\n]+)*)',
+                            re.IGNORECASE | re.MULTILINE)
+DEGREE_PATTERNS = (
+    r'B\.?Tech|B\.?E\.?|Bachelor',
+    r'M\.?Tech|M\.?E\.?|M\.?S\.?|Master',
+    r'PhD|Ph\.?D\.?|Doctorate',
+    r'Diploma|Certificate'
+)
+# all degree classes in one zero-width alternation: group i+1 reports where class i matches at each position
+DEGREE_RE = re.compile('(?=' + '|'.join(f'({p})' for p in DEGREE_PATTERNS) + ')', re.IGNORECASE)
+CERT_SECTION_RE = re.compile(r'(certifications|licenses|courses)[:\s]*([^\n]+(?:\n[^\n]+)*)', re.IGNORECASE)
+PROJ_SECTION_RE = re.compile(r'(projects|portfolio|personal projects)[:\s]*([^\n]+(?:\n[^\n]+)*)', re.IGNORECASE)
+PROJ_TITLE_RE = re.compile(r'([A-Z][\w\s]+)\n')
+LIST_SPLIT_RE = re.compile(r'[,;|•\n]')
+REQ_RE = re.compile(r'(required|must have|must\.have|mandatory)[:\s]*([^\n]+(?:\n[^\n]+)*)', re.IGNORECASE)
+OPT_RE = re.compile(r'(preferred|nice to have|nice.to.have|optional)[:\s]*([^\n]+(?:\n[^\n]+)*)', re.IGNORECASE)
+EXP_RE = re.compile(r'(\d+)[\s\-+]+(?:years?|yrs?)', re.IGNORECASE)
+# ASCII letters/digits survive preprocessing; every other ASCII char becomes a separator
+_PREPROC_TABLE = str.maketrans({c: ' ' for c in map(chr, range(128)) if not (c.isascii() and c.isalnum())})
+
+
+def _build_contact_db():
+    """Hyperscan database over EMAIL_RE (id 0) and PHONE_RE (id 1), or None when unavailable."""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[EMAIL_RE.pattern.encode(), PHONE_RE.pattern.encode()],
+            ids=[0, 1],
+            elements=2,
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * 2,
+        )
+        return db
+    except Exception as e:
+        logger.warning(f"Hyperscan compile failed, using re for contact extraction: {e}")
+        return None
+
+TECH_SKILLS = (
+    'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'NoSQL',
+    'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI',
+    'MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Docker', 'Kubernetes',
+    'AWS', 'Azure', 'GCP', 'Machine Learning', 'Deep Learning',
+    'NLP', 'Computer Vision', 'TensorFlow', 'PyTorch', 'Scikit-learn',
+    'Git', 'CI/CD', 'Agile', 'Scrum', 'REST API', 'GraphQL'
+)
+# one pass over the lowered text finds every vocabulary skill (plain substring matches, as before)
+_SKILL_AUTOMATON = ahocorasick.Automaton()
+for _idx, _skill in enumerate(TECH_SKILLS):
+    _SKILL_AUTOMATON.add_word(_skill.lower(), _idx)
+_SKILL_AUTOMATON.make_automaton()
+
+_CONTACT_DB = _build_contact_db()
+
+# section header keywords, scanned for together instead of one regex search per section
+_SECTION_RES = {
+    'skills': SKILLS_SECTION_RE,
+    'education': EDU_SECTION_RE,
+    'certifications': CERT_SECTION_RE,
+    'projects': PROJ_SECTION_RE,
+}
+_SECTION_AUTOMATON = ahocorasick.Automaton()
+for _name, _pattern in _SECTION_RES.items():
+    for _keyword in _pattern.pattern[1:_pattern.pattern.index(')')].split('|'):
+        _SECTION_AUTOMATON.add_word(_keyword, (_name, len(_keyword) - 1))
+_SECTION_AUTOMATON.make_automaton()
+# non-ASCII characters re.IGNORECASE equates with ASCII letters; lower() does not (or changes the length)
+_FOLD_SPECIAL = frozenset('\u0130\u0131\u017f\u212a')
+
+
+def _contact_match_starts(text: str) -> Dict[int, int]:
+    """Leftmost start offset per pattern id, from one Hyperscan scan of ASCII text."""
+    starts: Dict[int, int] = {}
+
+    def on_match(pattern_id, start, end, flags, context):
+        if start < starts.get(pattern_id, start + 1):
+            starts[pattern_id] = start
+
+    _CONTACT_DB.scan(text.encode('ascii'), match_event_handler=on_match)
+    return starts
+
+
 class DocumentParser:
-    def __init__(self):
-        self.nlp = nlp
+    @cached_property
+    def nlp(self):
+        """spaCy pipeline, loaded on first use (no extractor needs it today). Batch work should use nlp.pipe()."""
+        try:
+            return spacy.load("en_core_web_sm", disable=SPACY_DISABLE)
+        except Exception:
+            import subprocess
+            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=False)
+            return spacy.load("en_core_web_sm", disable=SPACY_DISABLE)
 
     def extract_text_from_pdf(self, file_path: str) -> str:
         text = ""
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            # MuPDF's plain-text extraction; no layout analysis is needed here
+            with fitz.open(file_path) as doc:
+                text = "\n".join(page.get_text("text") for page in doc)
         except Exception as e:
-            logger.warning(f"pdfplumber failed, trying PyPDF2 fallback: {e}")
+            logger.warning(f"PyMuPDF failed, trying PyPDF2 fallback: {e}")
             try:
                 with open(file_path, 'rb') as file:
                     reader = PyPDF2.PdfReader(file)
-                    for page in reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
+                    pages = (page.extract_text() for page in reader.pages)
+                    text = "\n".join(t for t in pages if t)
             except Exception as e2:
                 logger.error(f"PDF extraction failed: {e2}")
                 raise
@@ -61,111 +153,116 @@ class DocumentParser:
             'name': None,
             'location': None
         }
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
+        # Hyperscan (a DFA, no backtracking) finds where each pattern first matches; re.match at that offset
+        # then yields exactly the match re.search would. Non-ASCII text stays on re, since Hyperscan's
+        # \d/\s/\b classes are ASCII-only without UCP and offsets would be bytes.
+        if _CONTACT_DB is not None and text.isascii():
+            starts = _contact_match_starts(text)
+            email_match = EMAIL_RE.match(text, starts[0]) if 0 in starts else None
+            phone_match = PHONE_RE.match(text, starts[1]) if 1 in starts else None
+        else:
+            email_match = EMAIL_RE.search(text)
+            phone_match = PHONE_RE.search(text)
+
         if email_match:
             contact['email'] = email_match.group()
 
-        phone_pattern = r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}'
-        phone_match = re.search(phone_pattern, text)
         if phone_match:
             contact['phone'] = phone_match.group().strip()
 
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-        for line in lines[:8]:
+        # first 8 non-empty lines, read lazily instead of splitting the whole resume
+        lines = filter(None, map(str.strip, io.StringIO(text, newline='\n')))
+        for line in islice(lines, 8):
             if len(line.split()) <= 4 and not any(char.isdigit() for char in line) and '@' not in line:
                 contact['name'] = line
                 break
 
         return contact
 
-    def extract_skills(self, text: str) -> List[str]:
-        skills = []
-        tech_skills = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'NoSQL',
-            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI',
-            'MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Docker', 'Kubernetes',
-            'AWS', 'Azure', 'GCP', 'Machine Learning', 'Deep Learning',
-            'NLP', 'Computer Vision', 'TensorFlow', 'PyTorch', 'Scikit-learn',
-            'Git', 'CI/CD', 'Agile', 'Scrum', 'REST API', 'GraphQL'
-        ]
-        text_lower = text.lower()
-        for skill in tech_skills:
-            if skill.lower() in text_lower:
-                skills.append(skill)
+    def find_sections(self, text: str, text_lower: Optional[str] = None) -> Dict[str, Optional[re.Match]]:
+        """The match each *_SECTION_RE.search(text) would return, from one keyword scan of the text."""
+        if text_lower is None:
+            text_lower = text.lower()
+        if len(text_lower) != len(text) or not _FOLD_SPECIAL.isdisjoint(text):
+            return {name: pattern.search(text) for name, pattern in _SECTION_RES.items()}
 
-        skills_section_match = re.search(
-            r'(?i)(skills|technical skills|competencies)[:\s]*([^\n]+(?:\n[^\n]+)*)',
-            text
-        )
+        starts: Dict[str, List[int]] = {name: [] for name in _SECTION_RES}
+        for end, (name, offset) in _SECTION_AUTOMATON.iter(text_lower):
+            starts[name].append(end - offset)
+        sections: Dict[str, Optional[re.Match]] = {}
+        for name, pattern in _SECTION_RES.items():
+            # leftmost keyword whose full section pattern matches, i.e. what search() finds
+            sections[name] = next(filter(None, (pattern.match(text, pos) for pos in sorted(starts[name]))), None)
+        return sections
+
+    def extract_skills(self, text: str, text_lower: Optional[str] = None,
+                       sections: Optional[Dict[str, Optional[re.Match]]] = None) -> List[str]:
+        # first spelling wins per lowercased skill; dicts keep insertion order
+        unique_skills: Dict[str, str] = {}
+        for skill in self._emit_skills(text, text_lower, sections):
+            unique_skills.setdefault(skill.lower(), skill)
+        return list(unique_skills.values())
+
+    def _emit_skills(self, text: str, text_lower: Optional[str] = None,
+                     sections: Optional[Dict[str, Optional[re.Match]]] = None):
+        """Known vocabulary skills (in vocabulary order), then the entries of any skills section."""
+        found = {idx for _, idx in _SKILL_AUTOMATON.iter(text_lower if text_lower is not None else text.lower())}
+        for idx in sorted(found):
+            yield TECH_SKILLS[idx]
+
+        skills_section_match = sections['skills'] if sections is not None else SKILLS_SECTION_RE.search(text)
         if skills_section_match:
-            skills_text = skills_section_match.group(2)
-            additional_skills = re.split(r'[,;|•\n]', skills_text)
-            for skill in additional_skills:
+            for skill in LIST_SPLIT_RE.split(skills_section_match.group(2)):
                 skill = skill.strip()
                 if skill and len(skill) < 60:
-                    skills.append(skill)
-
-        seen = set()
-        unique_skills = []
-        for skill in skills:
-            if skill and skill.lower() not in seen:
-                seen.add(skill.lower())
-                unique_skills.append(skill)
-        return unique_skills
+                    yield skill
 
-    def extract_education(self, text: str) -> List[Dict[str, str]]:
+    def extract_education(self, text: str,
+                          sections: Optional[Dict[str, Optional[re.Match]]] = None) -> List[Dict[str, str]]:
         education = []
-        education_match = re.search(
-            r'(?i)(education|academic|qualification)[:\s]*([^\n]+(?:\n[^\n]+)*)',
-            text,
-            re.MULTILINE
-        )
+        education_match = sections['education'] if sections is not None else EDU_SECTION_RE.search(text)
         if education_match:
             edu_text = education_match.group(2)
-            degree_patterns = [
-                r'(B\.?Tech|B\.?E\.?|Bachelor)',
-                r'(M\.?Tech|M\.?E\.?|M\.?S\.?|Master)',
-                r'(PhD|Ph\.?D\.?|Doctorate)',
-                r'(Diploma|Certificate)'
-            ]
-            for pattern in degree_patterns:
-                matches = re.finditer(pattern, edu_text, re.IGNORECASE)
-                for match in matches:
-                    start = max(0, match.start() - 50)
-                    end = min(len(edu_text), match.end() + 100)
+            # one scan for every class; skipping hits inside the previous match of the same class gives
+            # exactly the spans a separate finditer per class would, reported class by class as before
+            spans: List[List[tuple]] = [[] for _ in DEGREE_PATTERNS]
+            for match in DEGREE_RE.finditer(edu_text):
+                cls_spans = spans[match.lastindex - 1]
+                span = match.span(match.lastindex)
+                if not cls_spans or span[0] >= cls_spans[-1][1]:
+                    cls_spans.append(span)
+            for cls_spans in spans:
+                for match_start, match_end in cls_spans:
+                    start = max(0, match_start - 50)
+                    end = min(len(edu_text), match_end + 100)
                     context = edu_text[start:end]
                     education.append({
-                        'degree': match.group(),
+                        'degree': edu_text[match_start:match_end],
                         'context': context.strip()
                     })
         return education
 
-    def extract_certifications(self, text: str) -> List[str]:
+    def extract_certifications(self, text: str,
+                               sections: Optional[Dict[str, Optional[re.Match]]] = None) -> List[str]:
         certifications = []
-        cert_section_match = re.search(
-            r'(?i)(certifications|licenses|courses)[:\s]*([^\n]+(?:\n[^\n]+)*)',
-            text
-        )
+        cert_section_match = sections['certifications'] if sections is not None else CERT_SECTION_RE.search(text)
         if cert_section_match:
             cert_text = cert_section_match.group(2)
-            certs = re.split(r'[,;|•\n]', cert_text)
+            certs = LIST_SPLIT_RE.split(cert_text)
             for cert in certs:
                 cert = cert.strip()
                 if cert and len(cert) < 100:
                     certifications.append(cert)
         return certifications
 
-    def extract_projects(self, text: str) -> List[Dict[str, Any]]:
+    def extract_projects(self, text: str,
+                         sections: Optional[Dict[str, Optional[re.Match]]] = None) -> List[Dict[str, Any]]:
         projects = []
-        proj_section_match = re.search(
-            r'(?i)(projects|portfolio|personal projects)[:\s]*([^\n]+(?:\n[^\n]+)*)',
-            text
-        )
+        proj_section_match = sections['projects'] if sections is not None else PROJ_SECTION_RE.search(text)
         if proj_section_match:
             proj_text = proj_section_match.group(2)
             # This is a simple implementation; a more advanced parser could be used here
-            project_titles = re.findall(r'([A-Z][\w\s]+)\n', proj_text)
+            project_titles = PROJ_TITLE_RE.findall(proj_text)
             for title in project_titles:
                 projects.append({'title': title.strip()})
         return projects
@@ -178,12 +275,15 @@ class DocumentParser:
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
 
+        # lowered once and shared by the extractors that work case-insensitively on plain text
+        raw_lower = raw_text.lower()
+        sections = self.find_sections(raw_text, raw_lower)
         contact = self.extract_contact_info(raw_text)
-        skills = self.extract_skills(raw_text)
-        education = self.extract_education(raw_text)
-        certifications = self.extract_certifications(raw_text)
-        projects = self.extract_projects(raw_text)
-        processed_text = self.preprocess_text(raw_text)
+        skills = self.extract_skills(raw_text, raw_lower, sections)
+        education = self.extract_education(raw_text, sections)
+        certifications = self.extract_certifications(raw_text, sections)
+        projects = self.extract_projects(raw_text, sections)
+        processed_text = self.preprocess_text(raw_text, raw_lower)
 
         return {
             'raw_text': raw_text,
@@ -202,23 +302,24 @@ class DocumentParser:
     def parse_job_description(self, text: str) -> Dict[str, Any]:
         required_skills = []
         optional_skills = []
-        req_match = re.search(r'(?i)(required|must have|must\.have|mandatory)[:\s]*([^\n]+(?:\n[^\n]+)*)', text)
+        req_match = REQ_RE.search(text)
         if req_match:
             skills_text = req_match.group(2)
             required_skills = self.extract_skills(skills_text)
-        opt_match = re.search(r'(?i)(preferred|nice to have|nice.to.have|optional)[:\s]*([^\n]+(?:\n[^\n]+)*)', text)
+        opt_match = OPT_RE.search(text)
         if opt_match:
             skills_text = opt_match.group(2)
             optional_skills = self.extract_skills(skills_text)
 
-        exp_match = re.search(r'(\d+)[\s\-+]+(?:years?|yrs?)', text, re.IGNORECASE)
+        exp_match = EXP_RE.search(text)
         min_experience = int(exp_match.group(1)) if exp_match else 0
-        processed_text = self.preprocess_text(text)
+        text_lower = text.lower()
+        processed_text = self.preprocess_text(text, text_lower)
 
         return {
             'raw_text': text,
             'processed_text': processed_text,
-            'required_skills': required_skills if required_skills else self.extract_skills(text)[:12],
+            'required_skills': required_skills if required_skills else self.extract_skills(text, text_lower)[:12],
             'optional_skills': optional_skills,
             'min_experience': min_experience,
             'education_requirements': [],
@@ -226,8 +327,9 @@ class DocumentParser:
             'projects_required': []
         }
 
-    def preprocess_text(self, text: str) -> str:
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
-        text = ' '.join(text.split())
-        return text
\ No newline at end of file
+    def preprocess_text(self, text: str, text_lower: Optional[str] = None) -> str:
+        text = text_lower if text_lower is not None else text.lower()
+        if not text.isascii():
+            # non-ASCII chars were either replaced or (whitespace) split on; '?' maps to a separator either way
+            text = text.encode('ascii', 'replace').decode('ascii')
+        return ' '.join(text.translate(_PREPROC_TABLE).split())
\ No newline at end of file
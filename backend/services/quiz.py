@@ -1,10 +1,10 @@
 # backend/services/quiz.py
+import os
 import random
-import uuid
 from typing import List, Dict, Any
 import google.generativeai as genai
 from backend.config import Config
-import json
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,11 +28,11 @@ class QuizService:
             logger.warning("GEMINI_API_KEY not configured. Skipping LLM question generation.")
             return []
 
-        job_skills = [self._normalize_skill(s) for s in job_desc.get("required_skills", [])]
-        resume_skills = [self._normalize_skill(s) for s in resume.get("skills", [])]
+        job_skills = list(dict.fromkeys(self._normalize_skill(s) for s in job_desc.get("required_skills", [])))
+        resume_skills = frozenset(self._normalize_skill(s) for s in resume.get("skills", []))
 
-        # Prioritize overlapping skills
-        overlapped = list(set(job_skills) & set(resume_skills))
+        # Prioritize overlapping skills (in the job's order, so the prompt is stable across calls)
+        overlapped = [s for s in job_skills if s in resume_skills]
 
         # Fallback to job skills if no overlap
         if not overlapped:
@@ -49,11 +49,12 @@ class QuizService:
             response = self.model.generate_content(prompt)
             # Clean the response to extract the JSON part
             cleaned_response = response.text.strip().replace('```json', '').replace('```', '').strip()
-            questions = json.loads(cleaned_response)
+            questions = orjson.loads(cleaned_response)
 
-            # Add unique IDs to the questions
-            for q in questions:
-                q['quiz_qid'] = str(uuid.uuid4())
+            # Add unique IDs to the questions: 128 random bits each, drawn from the OS RNG in one call
+            ids = os.urandom(16 * len(questions)).hex()
+            for i, q in enumerate(questions):
+                q['quiz_qid'] = ids[32 * i:32 * (i + 1)]
                 q['bank_qid'] = None  # No longer from a static bank
 
             return questions
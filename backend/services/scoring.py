@@ -1,5 +1,6 @@
 # backend/services/scoring.py
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from backend.config import Config
 from backend.services.matching import MatchingService
 from backend.services.embedding import EmbeddingService
@@ -17,16 +18,22 @@ class ScoringEngine:
         self.llm = None
         self.feedback_chain = None
 
-    def evaluate_resume(self, resume: Dict, job_desc: Dict) -> Dict[str, Any]:
+        # own pool: batch_evaluate itself usually runs on the app's to_thread executor, and waiting on
+        # that same pool from one of its workers could starve it
+        self._executor = ThreadPoolExecutor(max_workers=max(1, Config.SCORING_THREADS),
+                                            thread_name_prefix='scoring')
+
+    def evaluate_resume(self, resume: Dict, job_desc: Dict, soft_score: Optional[float] = None) -> Dict[str, Any]:
         """Complete evaluation of resume against job description."""
         # 1. Calculate hard match scores (keyword-based)
         hard_match_results = self.matching_service.calculate_hard_match(resume, job_desc)
 
-        # 2. Calculate soft match score using embeddings
-        resume_embedding = resume.get('embeddings') or self.embedding_service.generate_embeddings(resume.get('processed_text', ''))
-        job_embedding = job_desc.get('embeddings') or self.embedding_service.generate_embeddings(job_desc.get('processed_text', ''))
+        # 2. Calculate soft match score using embeddings (batch_evaluate precomputes it for all resumes)
+        if soft_score is None:
+            resume_embedding = self._embedding_for(resume)
+            job_embedding = self._embedding_for(job_desc)
 
-        soft_score = self.embedding_service.calculate_similarity(resume_embedding, job_embedding)  # already in 0-100
+            soft_score = self.embedding_service.calculate_similarity(resume_embedding, job_embedding)  # already in 0-100
 
         # 3. Combine using weights
         hard_score = hard_match_results.get('overall_hard_match', 0.0)
@@ -69,6 +76,23 @@ class ScoringEngine:
 
         return evaluation
 
+    def has_current_embedding(self, doc: Dict) -> bool:
+        """Whether doc carries a vector from the current model (records without a version predate versioning)."""
+        version = doc.get('embedding_version')
+        return bool(doc.get('embeddings')) and (version is None or version == self.embedding_service.version)
+
+    def _remember_embedding(self, doc: Dict, embedding) -> None:
+        # written back so later evaluations of the same record skip the forward pass; callers persist it
+        doc['embeddings'] = embedding.tolist()
+        doc['embedding_version'] = self.embedding_service.version
+
+    def _embedding_for(self, doc: Dict):
+        if self.has_current_embedding(doc):
+            return doc['embeddings']
+        embedding = self.embedding_service.generate_embeddings(doc.get('processed_text', ''))
+        self._remember_embedding(doc, embedding)
+        return embedding
+
     def generate_feedback(self, resume: Dict, job_desc: Dict, evaluation: Dict) -> Dict[str, List[str]]:
         feedback = {
             'strengths': [],
@@ -92,8 +116,25 @@ class ScoringEngine:
 
     def batch_evaluate(self, resumes: List[Dict], job_desc: Dict) -> List[Dict]:
         """Evaluate multiple resumes."""
-        evaluations = []
-        for resume in resumes:
-            evaluations.append(self.evaluate_resume(resume, job_desc))
+        # soft scores for every resume in one matrix-vector product instead of N dot products
+        resume_embeddings = [r.get('embeddings') if self.has_current_embedding(r) else None for r in resumes]
+        # resumes stored without a (current) vector are encoded together in one batched forward pass
+        missing = [i for i, emb in enumerate(resume_embeddings) if emb is None]
+        if missing:
+            fresh = self.embedding_service.generate_embeddings_batch(
+                [resumes[i].get('processed_text', '') for i in missing]
+            )
+            for i, emb in zip(missing, fresh):
+                resume_embeddings[i] = emb
+                self._remember_embedding(resumes[i], emb)
+        job_embedding = self._embedding_for(job_desc)
+        soft_scores = self.embedding_service.calculate_similarities(resume_embeddings, job_embedding)
+
+        # matching/feedback only read shared state, so resumes can be scored concurrently (map keeps input order)
+        evaluate = lambda pair: self.evaluate_resume(pair[0], job_desc, soft_score=float(pair[1]))
+        if Config.SCORING_THREADS > 1 and len(resumes) > 1:
+            evaluations = list(self._executor.map(evaluate, zip(resumes, soft_scores)))
+        else:
+            evaluations = [evaluate(pair) for pair in zip(resumes, soft_scores)]
         evaluations.sort(key=lambda x: x['relevance_score'], reverse=True)
         return evaluations
\ No newline at end of file
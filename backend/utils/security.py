@@ -0,0 +1,51 @@
+# backend/utils/security.py
+import hashlib
+import hmac
+import secrets
+from typing import Dict, Tuple
+
+# scrypt cost parameters (~16 MB, tens of ms per hash)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+PASSWORD_ALGO = "scrypt"
+
+
+def _scrypt(password: str, salt: str) -> str:
+    return hashlib.scrypt(
+        password.encode('utf-8'),
+        salt=bytes.fromhex(salt),
+        n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN
+    ).hex()
+
+
+def hash_password(password: str) -> Tuple[str, str]:
+    """Return (salt_hex, password_hash) for a new password."""
+    salt = secrets.token_hex(16)
+    return salt, _scrypt(password, salt)
+
+
+def verify_password(record: Dict, password: str) -> bool:
+    """
+    Check a password against a stored employee record.
+    Records without 'password_algo' predate scrypt and use salted SHA256.
+    """
+    salt = record.get('salt', '')
+    stored = record.get('password_hash') or ''
+    if record.get('password_algo') == PASSWORD_ALGO:
+        calc = _scrypt(password, salt)
+    else:
+        calc = hashlib.sha256((salt + password).encode('utf-8')).hexdigest()
+    # constant-time compare
+    return hmac.compare_digest(calc, stored)
+
+
+def needs_rehash(record: Dict) -> bool:
+    return record.get('password_algo') != PASSWORD_ALGO
+
+
+_dummy_salt, _dummy_hash = hash_password("unused")
+# verified against when no account matches, so an unknown email costs the same KDF call as a wrong password
+DUMMY_RECORD = {'salt': _dummy_salt, 'password_hash': _dummy_hash, 'password_algo': PASSWORD_ALGO}
@@ -1,10 +1,12 @@
 # frontend/ui/career.py
 import streamlit as st
-from frontend.ui.utils import fetch_jobs, apply_to_job_api
+from frontend.ui.utils import fetch_jobs_cached, clear_jobs_cache, apply_to_job_api
 
 def display():
     st.markdown("<h2 style='color:#0b5fff'>Career — Open Positions</h2>", unsafe_allow_html=True)
-    jobs = fetch_jobs(limit=50)
+    if st.button("🔄 Refresh jobs"):
+        clear_jobs_cache()
+    jobs = fetch_jobs_cached(limit=50)
     if not jobs:
         st.info("No active jobs available right now. Make sure the backend is running.")
     else:
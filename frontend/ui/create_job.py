@@ -1,27 +1,35 @@
 # frontend/ui/create_job.py
 import streamlit as st
 import os
-import tempfile
+import io
 import json
+import orjson
+import hashlib
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from frontend.ui.utils import create_job_api
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Configure Gemini AI
-try:
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    if GEMINI_API_KEY:
-        genai.configure(api_key=GEMINI_API_KEY)
-    else:
-        st.warning("⚠️ GEMINI_API_KEY not found in environment variables. Document parsing will be disabled.")
-        GEMINI_API_KEY = None
-except Exception as e:
-    st.error(f"❌ Error configuring Gemini AI: {str(e)}")
-    GEMINI_API_KEY = None
+from typing import Dict, Any, Optional, List, TypedDict
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from frontend.ui.utils import create_job_api, clear_jobs_cache
+
+
+# Gemini AI is imported and configured on first use, so app start-up doesn't pay for it
+@functools.cache
+def _gemini_api_key() -> Optional[str]:
+    """GEMINI_API_KEY from the environment (or .env), None when unset"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("GEMINI_API_KEY") or None
+
+
+@functools.cache
+def _genai():
+    """google.generativeai, configured with the API key; import errors propagate and are retried"""
+    import google.generativeai as genai
+    genai.configure(api_key=_gemini_api_key())
+    return genai
 
 
 # Safe helper for session state nested lookups
@@ -38,13 +46,152 @@ def ss_get_nested(session_key: str, nested_key: str, default=""):
         return default
 
 
+# fields and output rules shared by the single and batched job description prompts (no braces: used in templates)
+JD_FIELDS_PROMPT = """
+            Please extract:
+            1. job_title: The main job title/position (string)
+            2. company_name: Company or organization name (string)
+            3. location: Job location (string)
+            4. job_description: Complete job description text (string)
+            5. required_skills: List of required skills (array of strings)
+            6. optional_skills: List of preferred skills (array of strings)
+            7. experience_required: Years of experience required (string)
+            8. education_requirements: Education requirements (string)
+            9. employment_type: Full-time, Part-time, Contract, etc. (string)
+            10. salary_range: Salary information if mentioned (string)
+            11. benefits: List of benefits mentioned (array of strings)
+            12. responsibilities: List of key responsibilities (array of strings)
+            13. department: Department or team (string)
+            14. posted_by: Person or department posting the job (string)
+            
+            IMPORTANT: 
+            - Return ONLY valid JSON
+            - All arrays should contain only strings, no nested arrays
+            - Use empty string "" for missing string fields
+            - Use empty array [] for missing array fields
+            - Do not include any explanatory text
+"""
+
+# prompts are built once; everything before the job text is constant, so it forms a stable prompt prefix
+JD_PROMPT_TEMPLATE = """
+            Analyze the following job description and extract structured information in JSON format. 
+            """ + JD_FIELDS_PROMPT + """
+            Job Description Text:
+            {text}
+            """
+JD_BATCH_PROMPT_TEMPLATE = """
+            Analyze each of the job descriptions below and extract structured information in JSON format.
+            """ + JD_FIELDS_PROMPT + """
+            There are {count} job descriptions. Return a JSON array with exactly {count} objects,
+            one per job description, in the same order.
+            {sections}
+            """
+
+class JobDescriptionSchema(TypedDict):
+    """Shape Gemini is asked to return (response_schema), one key per field in JD_FIELDS_PROMPT"""
+    job_title: str
+    company_name: str
+    location: str
+    job_description: str
+    required_skills: List[str]
+    optional_skills: List[str]
+    experience_required: str
+    education_requirements: str
+    employment_type: str
+    salary_range: str
+    benefits: List[str]
+    responsibilities: List[str]
+    department: str
+    posted_by: str
+
+
+# fields validate_parsed_data keeps, by the type the form expects
+STRING_FIELDS = ('job_title', 'company_name', 'location', 'job_description',
+                 'experience_required', 'education_requirements', 'employment_type',
+                 'salary_range', 'department', 'posted_by')
+ARRAY_FIELDS = ('required_skills', 'optional_skills', 'benefits', 'responsibilities')
+
+
+def _flatten_str(items: List[Any]) -> List[str]:
+    """Flatten one level of nested lists and stringify every item"""
+    return list(map(str, chain.from_iterable(item if isinstance(item, list) else (item,) for item in items)))
+
+
+def _bullets(items) -> str:
+    """One "• item" line per list entry; a non-list value is shown as-is"""
+    if not items:
+        return ""
+    if isinstance(items, list):
+        return "\n".join(f"• {item}" for item in items)
+    return str(items)
+
+
+# job descriptions per Gemini prompt on multi-file uploads; returns diminish past a handful
+GEMINI_BATCH_SIZE = int(os.getenv("GEMINI_BATCH_SIZE", "5"))
+# concurrent Gemini calls for multi-file uploads; bounded to stay under the API's requests-per-minute quota
+GEMINI_MAX_WORKERS = int(os.getenv("GEMINI_MAX_WORKERS", "4"))
+
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _gemini_parse_cached(text_sha256: str, _model, _prompt: str, _generation_config: Dict[str, Any]) -> Any:
+    """
+    Decoded JSON Gemini returns for a job description, cached per SHA-256 of the extracted text
+    for an hour so re-uploads and repeated clicks skip the API call. Errors raise and are not cached.
+    """
+    # stream so decoding starts at the first token instead of after the whole generation
+    response = _model.generate_content(_prompt, generation_config=_generation_config, stream=True)
+    
+    # JSON response mode returns bare JSON, no markdown fences to strip
+    return orjson.loads("".join(chunk.text for chunk in response))
+
+
+def _pdf_text_pymupdf(data: bytes) -> str:
+    import fitz  # PyMuPDF reads the upload straight from memory
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def _pdf_text_pdfium(data: bytes) -> str:
+    import pypdfium2 as pdfium  # Apache-2 licensed, for deployments that can't ship AGPL PyMuPDF
+    pdf = pdfium.PdfDocument(data)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return "\n".join(pages)
+    finally:
+        pdf.close()
+
+
+def _pdf_text_pdfplumber(data: bytes) -> str:
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        pages = (page.extract_text() for page in pdf.pages)
+        return "\n".join(page_text for page_text in pages if page_text)
+
+
+# PDF text extractors, fastest first; ones whose library isn't installed are skipped
+PDF_BACKENDS = (_pdf_text_pymupdf, _pdf_text_pdfium, _pdf_text_pdfplumber)
+
+
 class JobDescriptionParser:
     """Enhanced job description parser using Gemini AI"""
     
+    # generation configs built once; deterministic, schema-constrained JSON so only the prompt varies per call
+    _GEN_CFG = {
+        "response_mime_type": "application/json",
+        "response_schema": JobDescriptionSchema,
+        "temperature": 0.0,
+    }
+    _BATCH_GEN_CFG = {**_GEN_CFG, "response_schema": list[JobDescriptionSchema]}
+    
     def __init__(self):
-        if GEMINI_API_KEY:
+        if _gemini_api_key():
             try:
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
+                self.model = _genai().GenerativeModel('gemini-1.5-flash')
             except Exception as e:
                 st.error(f"❌ Error initializing Gemini model: {str(e)}")
                 self.model = None
@@ -52,40 +199,30 @@ class JobDescriptionParser:
             self.model = None
     
     def extract_text_from_pdf(self, uploaded_file) -> str:
-        """Extract text from uploaded PDF using pdfplumber"""
-        try:
-            import pdfplumber
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-            
-            text = ""
-            with pdfplumber.open(tmp_file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            os.unlink(tmp_file_path)  # Clean up temp file
-            return text.strip()
+        """Extract text from uploaded PDF using PyMuPDF, then pypdfium2, then pdfplumber as fallbacks"""
+        data = uploaded_file.getvalue()
+        error = None
+        for backend in PDF_BACKENDS:
+            try:
+                return backend(data).strip()
+            except ImportError:
+                continue
+            except Exception as e:
+                # a library that chokes on this file may still leave a slower one that copes
+                error = e
         
-        except ImportError:
-            st.error("📦 pdfplumber not installed. Please install: pip install pdfplumber")
-            return ""
-        except Exception as e:
-            st.error(f"❌ Error extracting PDF text: {str(e)}")
-            return ""
+        if error is None:
+            st.error("📦 No PDF library installed. Please install: pip install pymupdf")
+        else:
+            st.error(f"❌ Error extracting PDF text: {str(error)}")
+        return ""
     
     def extract_text_from_docx(self, uploaded_file) -> str:
         """Extract text from uploaded DOCX using docx2txt"""
         try:
             import docx2txt
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-            
-            text = docx2txt.process(tmp_file_path)
-            os.unlink(tmp_file_path)  # Clean up temp file
+            # docx2txt hands its argument to zipfile, which reads a file-like object as well as a path
+            text = docx2txt.process(io.BytesIO(uploaded_file.getvalue()))
             return text.strip() if text else ""
         
         except ImportError:
@@ -96,7 +233,7 @@ class JobDescriptionParser:
             return ""
     
     def safe_join_list(self, data, separator=', ') -> str:
-        """Safely join list data, handling nested lists and non-string items"""
+        """Safely join list data; validate_parsed_data has already flattened and stringified the lists"""
         if not data:
             return ""
         
@@ -104,16 +241,7 @@ class JobDescriptionParser:
         if not isinstance(data, list):
             return str(data)
         
-        # Flatten and stringify all items
-        flattened = []
-        for item in data:
-            if isinstance(item, list):
-                # If item is a list, recursively flatten it
-                flattened.extend([str(x) for x in item])
-            else:
-                flattened.append(str(item))
-        
-        return separator.join(flattened)
+        return separator.join(map(str, data))
     
     def parse_with_gemini(self, text: str) -> Optional[Dict[str, Any]]:
         """Parse job description using Gemini AI to extract structured data"""
@@ -122,50 +250,10 @@ class JobDescriptionParser:
             return None
             
         try:
-            prompt = f"""
-            Analyze the following job description and extract structured information in JSON format. 
+            prompt = JD_PROMPT_TEMPLATE.format(text=text)
             
-            Please extract:
-            1. job_title: The main job title/position (string)
-            2. company_name: Company or organization name (string)
-            3. location: Job location (string)
-            4. job_description: Complete job description text (string)
-            5. required_skills: List of required skills (array of strings)
-            6. optional_skills: List of preferred skills (array of strings)
-            7. experience_required: Years of experience required (string)
-            8. education_requirements: Education requirements (string)
-            9. employment_type: Full-time, Part-time, Contract, etc. (string)
-            10. salary_range: Salary information if mentioned (string)
-            11. benefits: List of benefits mentioned (array of strings)
-            12. responsibilities: List of key responsibilities (array of strings)
-            13. department: Department or team (string)
-            14. posted_by: Person or department posting the job (string)
-            
-            IMPORTANT: 
-            - Return ONLY valid JSON
-            - All arrays should contain only strings, no nested arrays
-            - Use empty string "" for missing string fields
-            - Use empty array [] for missing array fields
-            - Do not include any explanatory text
-            
-            Job Description Text:
-            {text}
-            """
-            
-            response = self.model.generate_content(prompt)
-            
-            # Clean and parse the JSON response
-            json_text = response.text.strip()
-            
-            # Remove any markdown formatting if present
-            if json_text.startswith("```json"):
-                json_text = json_text[7:]
-            if json_text.endswith("```"):
-                json_text = json_text[:-3]
-            
-            json_text = json_text.strip()
-            
-            parsed_data = json.loads(json_text)
+            text_sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            parsed_data = _gemini_parse_cached(text_sha256, self.model, prompt, self._GEN_CFG)
             
             # Validate and clean the parsed data
             cleaned_data = self.validate_parsed_data(parsed_data)
@@ -173,44 +261,101 @@ class JobDescriptionParser:
             
         except json.JSONDecodeError as e:
             st.error(f"❌ Error parsing Gemini response as JSON: {str(e)}")
-            st.error(f"Raw response: {response.text[:500]}...")
+            st.error(f"Raw response: {e.doc[:500]}...")
             return None
         except Exception as e:
             st.error(f"❌ Error with Gemini AI parsing: {str(e)}")
             return None
     
-    def validate_parsed_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate and clean parsed data to ensure correct types"""
-        cleaned = {}
+    def parse_batch_with_gemini(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Parse several job descriptions with one Gemini prompt returning a JSON array, results in input order"""
+        if len(texts) <= 1 or not self.model:
+            return [self.parse_with_gemini(text) for text in texts]
         
-        # String fields
-        string_fields = ['job_title', 'company_name', 'location', 'job_description', 
-                        'experience_required', 'education_requirements', 'employment_type', 
-                        'salary_range', 'department', 'posted_by']
+        sections = "\n".join(f"---JD {i}---\n{text}" for i, text in enumerate(texts, 1))
+        prompt = JD_BATCH_PROMPT_TEMPLATE.format(count=len(texts), sections=sections)
         
-        for field in string_fields:
-            value = data.get(field, "")
-            cleaned[field] = str(value) if value else ""
+        batch_sha256 = hashlib.sha256("\x00".join(texts).encode("utf-8")).hexdigest()
+        try:
+            parsed_list = _gemini_parse_cached(f"batch:{batch_sha256}", self.model, prompt, self._BATCH_GEN_CFG)
+        except Exception:
+            parsed_list = None
+        if not isinstance(parsed_list, list) or len(parsed_list) != len(texts):
+            # malformed or mis-sized batch answer: fall back to one call per job description
+            return [self.parse_with_gemini(text) for text in texts]
+        
+        return [
+            self.validate_parsed_data(data) if isinstance(data, dict) else self.parse_with_gemini(text)
+            for data, text in zip(parsed_list, texts)
+        ]
+    
+    def parse_many_with_gemini(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Parse several job descriptions in batched prompts sent concurrently, results in input order"""
+        batches = [texts[i:i + GEMINI_BATCH_SIZE] for i in range(0, len(texts), GEMINI_BATCH_SIZE)]
+        if len(batches) <= 1:
+            return self.parse_batch_with_gemini(texts)
         
-        # Array fields
-        array_fields = ['required_skills', 'optional_skills', 'benefits', 'responsibilities']
+        # worker threads need the script run context for st.error (and the cache) to reach this session
+        ctx = get_script_run_ctx()
         
-        for field in array_fields:
+        def parse(batch: List[str]) -> List[Optional[Dict[str, Any]]]:
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return self.parse_batch_with_gemini(batch)
+        
+        with ThreadPoolExecutor(max_workers=min(GEMINI_MAX_WORKERS, len(batches))) as executor:
+            return [parsed for batch in executor.map(parse, batches) for parsed in batch]
+    
+    def validate_parsed_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and clean parsed data to ensure correct types"""
+        # String fields
+        cleaned = {field: str(data.get(field) or "") for field in STRING_FIELDS}
+        
+        # Array fields: flatten any nested lists and convert to strings; a scalar becomes a 1-item list
+        for field in ARRAY_FIELDS:
             value = data.get(field, [])
             if isinstance(value, list):
-                # Flatten any nested lists and convert to strings
-                flattened = []
-                for item in value:
-                    if isinstance(item, list):
-                        flattened.extend([str(x) for x in item])
-                    else:
-                        flattened.append(str(item))
-                cleaned[field] = flattened
+                cleaned[field] = _flatten_str(value)
             else:
                 cleaned[field] = [str(value)] if value else []
         
         return cleaned
 
+
+@st.cache_resource(show_spinner=False)
+def _get_parser() -> JobDescriptionParser:
+    """One parser (and Gemini model handle) shared across reruns and sessions"""
+    return JobDescriptionParser()
+
+
+# text extractor per file extension; browsers (notably on Windows) often mislabel the MIME type
+EXTRACTORS = {
+    "pdf": JobDescriptionParser.extract_text_from_pdf,
+    "docx": JobDescriptionParser.extract_text_from_docx,
+}
+
+
+class _NoTextExtracted(Exception):
+    """Raised out of _extract_text_cached_nonempty so an empty extraction is not cached (st.cache_data skips raised calls)"""
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _extract_text_cached_nonempty(file_sha256: str, kind: str, _parser: JobDescriptionParser, _uploaded_file) -> str:
+    text = EXTRACTORS[kind](_parser, _uploaded_file)
+    if not text:
+        raise _NoTextExtracted
+    return text
+
+
+def _extract_text_cached(file_sha256: str, kind: str, parser: JobDescriptionParser, uploaded_file) -> str:
+    """Extracted document text, cached per SHA-256 of the uploaded bytes so reruns and re-clicks skip re-extraction.
+
+    Empty results ("" from a scanned PDF, a missing backend or a read failure) are retried on the next call.
+    """
+    try:
+        return _extract_text_cached_nonempty(file_sha256, kind, parser, uploaded_file)
+    except _NoTextExtracted:
+        return ""
+
 def display():
     st.markdown("<h2 style='color:#0b5fff; margin-bottom: 2rem;'>Create Job Posting</h2>", unsafe_allow_html=True)
     
@@ -220,7 +365,7 @@ def display():
         st.stop()
 
     # Initialize parser
-    parser = JobDescriptionParser() if GEMINI_API_KEY else None
+    parser = _get_parser() if _gemini_api_key() else None
     
     # Tabs for different input methods
     tab1, tab2 = st.tabs(["📝 Manual Entry", "📄 Upload Document"])
@@ -305,26 +450,23 @@ def display_manual_entry():
 def display_document_upload(parser: JobDescriptionParser):
     """Display document upload and AI parsing interface"""
     st.markdown("### Upload Job Description Document")
-    st.markdown("Upload a PDF or DOCX file containing the job description. Our AI will extract and structure the information automatically.")
+    st.markdown("Upload one or more PDF or DOCX files containing job descriptions. Our AI will extract and structure the information automatically.")
     
     # File uploader
-    uploaded_file = st.file_uploader(
-        "📁 Choose a file",
+    uploaded_files = st.file_uploader(
+        "📁 Choose files",
         type=['pdf', 'docx', 'doc'],
+        accept_multiple_files=True,
         help="Upload PDF or DOCX files containing job descriptions"
     )
     
-    if uploaded_file is not None:
+    if uploaded_files:
         # Display file info
-        file_details = {
-            "Filename": uploaded_file.name,
-            "File size": f"{uploaded_file.size / 1024:.2f} KB",
-            "File type": uploaded_file.type
-        }
-        
         with st.expander("📋 File Details", expanded=False):
-            for key, value in file_details.items():
-                st.text(f"{key}: {value}")
+            for uploaded_file in uploaded_files:
+                st.text(f"Filename: {uploaded_file.name}")
+                st.text(f"File size: {uploaded_file.size / 1024:.2f} KB")
+                st.text(f"File type: {uploaded_file.type}")
         
         # Extract and parse button
         col1, col2 = st.columns([1, 1])
@@ -334,7 +476,7 @@ def display_document_upload(parser: JobDescriptionParser):
                 "🤖 Extract & Parse with AI", 
                 type="primary", 
                 use_container_width=True,
-                help="Use AI to extract job information from the uploaded document"
+                help="Use AI to extract job information from the uploaded documents"
             )
         
         with col2:
@@ -344,49 +486,82 @@ def display_document_upload(parser: JobDescriptionParser):
                 help="Show raw extracted text without AI parsing"
             )
         
-        # Process the file
+        # a new set of uploads invalidates the previous parse
+        uploads_key = tuple(uploaded_file.file_id for uploaded_file in uploaded_files)
+        if st.session_state.get("jd_last", {}).get("key") != uploads_key:
+            st.session_state.pop("jd_last", None)
+        
+        # Process the files
         if parse_button or preview_button:
-            with st.spinner("🔄 Processing document..."):
+            with st.spinner("🔄 Processing documents..."):
                 # Extract text based on file type
-                if uploaded_file.type == "application/pdf":
-                    extracted_text = parser.extract_text_from_pdf(uploaded_file)
-                elif uploaded_file.type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document", "application/msword"]:
-                    extracted_text = parser.extract_text_from_docx(uploaded_file)
-                else:
-                    st.error("❌ Unsupported file type")
-                    return
+                extracted = []
+                for uploaded_file in uploaded_files:
+                    kind = Path(uploaded_file.name).suffix[1:].lower()
+                    if kind == "doc":
+                        # docx2txt only reads the zip-based DOCX format
+                        st.error(f"❌ Legacy .doc files are not supported, please save {uploaded_file.name} as DOCX or PDF")
+                        continue
+                    if kind not in EXTRACTORS:
+                        st.error(f"❌ Unsupported file type: {uploaded_file.name}")
+                        continue
+                    file_sha256 = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+                    extracted_text = _extract_text_cached(file_sha256, kind, parser, uploaded_file)
+                    
+                    if not extracted_text:
+                        st.error(f"❌ Could not extract text from {uploaded_file.name}")
+                        continue
+                    extracted.append((uploaded_file, extracted_text))
                 
-                if not extracted_text:
-                    st.error("❌ Could not extract text from the document")
+                if not extracted:
                     return
                 
                 # Show preview if requested
                 if preview_button:
                     st.markdown("### 📄 Extracted Text Preview")
-                    with st.expander("Raw Text Content", expanded=True):
-                        st.text_area("", value=extracted_text, height=300, disabled=True)
+                    for uploaded_file, extracted_text in extracted:
+                        with st.expander(uploaded_file.name, expanded=len(extracted) == 1):
+                            st.text_area("", value=extracted_text, height=300, disabled=True,
+                                         key=f"preview_{uploaded_file.file_id}")
                     return
                 
                 # Parse with AI if requested
                 if parse_button:
                     with st.spinner("🧠 Analyzing with Gemini AI..."):
-                        parsed_data = parser.parse_with_gemini(extracted_text)
-                        
-                        if parsed_data:
-                            st.success("✅ Document successfully parsed!")
-                            display_parsed_job_form(parsed_data, extracted_text, parser)
-                        else:
-                            st.error("❌ Failed to parse document with AI")
-                            # Fallback: show raw text
-                            st.markdown("### 📝 Manual Entry Required")
-                            st.info("AI parsing failed. Please use the manual entry tab or check the document format.")
-
-def display_parsed_job_form(parsed_data: Dict[str, Any], original_text: str, parser: JobDescriptionParser):
+                        parsed_list = parser.parse_many_with_gemini([text for _, text in extracted])
+                    st.session_state["jd_last"] = {
+                        "key": uploads_key,
+                        "results": [(uploaded_file.file_id, extracted_text, parsed_data)
+                                    for (uploaded_file, extracted_text), parsed_data in zip(extracted, parsed_list)],
+                    }
+        
+        # Parsed results outlive the click, so editing and submitting the review forms on later
+        # reruns neither loses them nor re-runs extraction and Gemini
+        last = st.session_state.get("jd_last")
+        if last:
+            files_by_id = {uploaded_file.file_id: uploaded_file for uploaded_file in uploaded_files}
+            for file_id, extracted_text, parsed_data in last["results"]:
+                uploaded_file = files_by_id[file_id]
+                if parsed_data:
+                    st.success(f"✅ {uploaded_file.name} successfully parsed!")
+                    display_parsed_job_form(parsed_data, extracted_text, parser, uploaded_file)
+                else:
+                    st.error(f"❌ Failed to parse {uploaded_file.name} with AI")
+                    # Fallback: show raw text
+                    st.markdown("### 📝 Manual Entry Required")
+                    st.info("AI parsing failed. Please use the manual entry tab or check the document format.")
+    else:
+        st.session_state.pop("jd_last", None)
+
+def display_parsed_job_form(parsed_data: Dict[str, Any], original_text: str, parser: JobDescriptionParser,
+                            uploaded_file=None):
     """Display form with AI-parsed data for review and editing"""
-    st.markdown("### 🎯 AI-Parsed Job Information")
+    st.markdown(f"### 🎯 AI-Parsed Job Information{f' — {uploaded_file.name}' if uploaded_file else ''}")
     st.info("📝 Review and edit the AI-extracted information below before creating the job posting.")
     
-    with st.form("ai_parsed_job_form"):
+    # one form per uploaded file, so the form (and its widgets) need distinct keys
+    form_key = f"ai_parsed_job_form_{uploaded_file.file_id}" if uploaded_file else "ai_parsed_job_form"
+    with st.form(form_key):
         # Create expandable sections for better organization
         with st.expander("🏢 Basic Information", expanded=True):
             col1, col2 = st.columns(2)
@@ -477,13 +652,7 @@ def display_parsed_job_form(parsed_data: Dict[str, Any], original_text: str, par
                 )
             
             # FIXED: Handle responsibilities list properly
-            responsibilities_list = parsed_data.get('responsibilities', [])
-            responsibilities_text = ""
-            if responsibilities_list:
-                if isinstance(responsibilities_list, list):
-                    responsibilities_text = '\n'.join([f"• {str(resp)}" for resp in responsibilities_list])
-                else:
-                    responsibilities_text = str(responsibilities_list)
+            responsibilities_text = _bullets(parsed_data.get('responsibilities', []))
             
             responsibilities = st.text_area(
                 "Key Responsibilities", 
@@ -494,13 +663,7 @@ def display_parsed_job_form(parsed_data: Dict[str, Any], original_text: str, par
         
         with st.expander("🎁 Benefits & Additional Info", expanded=False):
             # FIXED: Handle benefits list properly
-            benefits_list = parsed_data.get('benefits', [])
-            benefits_text = ""
-            if benefits_list:
-                if isinstance(benefits_list, list):
-                    benefits_text = '\n'.join([f"• {str(benefit)}" for benefit in benefits_list])
-                else:
-                    benefits_text = str(benefits_list)
+            benefits_text = _bullets(parsed_data.get('benefits', []))
             
             benefits = st.text_area(
                 "Benefits", 
@@ -548,8 +711,7 @@ def display_parsed_job_form(parsed_data: Dict[str, Any], original_text: str, par
 
 def create_job_with_data(job_data: Dict[str, Any], uploaded_file=None):
     """Create job with the provided data. If uploaded_file provided, send file to backend."""
-    import requests
-    from frontend.ui.utils import API_BASE_URL  # adjust if your utils exposes base url
+    from frontend.ui.utils import API_BASE_URL, http_client  # adjust if your utils exposes base url
 
     with st.spinner("🔄 Creating job..."):
         try:
@@ -563,15 +725,16 @@ def create_job_with_data(job_data: Dict[str, Any], uploaded_file=None):
             }
 
             if uploaded_file:
-                # upload file as multipart
+                # upload file as multipart, streamed from the upload buffer rather than copied with getvalue()
+                uploaded_file.seek(0)
                 files = {
-                    "file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)
+                    "file": (uploaded_file.name, uploaded_file, uploaded_file.type)
                 }
-                resp = requests.post(url, data=payload, files=files, timeout=60)
+                resp = http_client().post(url, data=payload, files=files)
             else:
                 # send job_text in body
                 payload["job_text"] = job_data.get("job_description", "")
-                resp = requests.post(url, json=payload, timeout=60)
+                resp = http_client().post(url, json=payload)
 
             if resp is None:
                 st.error("❌ No response from server.")
@@ -583,6 +746,7 @@ def create_job_with_data(job_data: Dict[str, Any], uploaded_file=None):
                 except Exception:
                     body = {"status": "ok", "message": resp.text}
                 if body.get("status") == "ok":
+                    clear_jobs_cache()
                     st.success("✅ Job created successfully!")
                     created = body.get("job") or {}
                     with st.expander("📋 Created Job Summary", expanded=True):
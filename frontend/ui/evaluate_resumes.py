@@ -1,10 +1,18 @@
 # frontend/ui/evaluate_resumes.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import io
+import uuid
 from datetime import datetime
-from .utils import evaluate_single_api, evaluate_batch_api, fetch_jobs, fetch_resumes_api
+from typing import Any, Dict, List
+try:
+    from st_aggrid import AgGrid, GridOptionsBuilder
+except ImportError:  # optional: large tables fall back to st.dataframe
+    AgGrid = None
+from .utils import (
+    evaluate_single_api, evaluate_batch_api, fetch_dashboard_bundle, response_json,
+    clear_jobs_cache, clear_resumes_cache, save_batch_results, load_latest_batch_results
+)
 
 def display():
     st.markdown("<h2 style='color:#0b5fff; margin-bottom: 2rem;'>Resume Evaluation Dashboard</h2>", unsafe_allow_html=True)
@@ -16,7 +24,8 @@ def display():
 
     # Initialize session state for results
     if 'batch_results' not in st.session_state:
-        st.session_state.batch_results = None
+        # a browser refresh starts a new session; pick the last batch run back up from disk
+        set_batch_results(load_latest_batch_results())
     if 'single_result' not in st.session_state:
         st.session_state.single_result = None
 
@@ -55,13 +64,9 @@ def display():
             
             # Skills filter
             if st.session_state.batch_results:
-                all_skills = set()
-                for eval_data in st.session_state.batch_results.get('evaluations', []):
-                    all_skills.update(eval_data.get('analysis', {}).get('matched_skills', []))
-                
                 skill_filter = st.multiselect(
                     "Filter by Matched Skills",
-                    options=list(all_skills),
+                    options=prep_batch_results(st.session_state.batch_results)['skill_options'],
                     key="skill_filter"
                 )
 
@@ -79,7 +84,7 @@ def display():
             st.metric(
                 label="🎯 High Matches", 
                 value=summary.get('high_matches', 0),
-                delta=f"{(summary.get('high_matches', 0) / max(st.session_state.batch_results.get('total_evaluated', 1), 1) * 100):.1f}%"
+                delta=st.session_state.batch_summary_pct['high_matches']
             )
             st.metric(
                 label="⚡ Medium Matches", 
@@ -96,18 +101,28 @@ def display():
     with tab1:
         st.markdown("### Single Resume Evaluation")
         
+        # Job and resume lists are cached for a minute, so filter tweaks don't refetch them
+        if st.button("🔄 Refresh jobs & resumes"):
+            clear_jobs_cache()
+            clear_resumes_cache()
+        
         # Fetch data
         try:
             with st.spinner("Loading data..."):
-                jobs = fetch_jobs(limit=200)
-                resumes = fetch_resumes_api(limit=10)
+                jobs, resumes = fetch_dashboard_bundle(job_limit=200, resume_limit=10)
         except Exception as e:
             st.error(f"❌ Error loading data: {str(e)}")
             return
 
         # Create selection options
-        job_options = {f"{j.get('job_title', 'N/A')} — {j.get('company_name', 'N/A')} ({j.get('_id', 'N/A')})": j.get('_id') for j in jobs}
-        resume_options = {f"{r.get('candidate_name', 'N/A')} ({r.get('candidate_email', 'N/A')})": r.get('_id') for r in resumes}
+        job_options = dict(zip(
+            (f"{j.get('job_title', 'N/A')} — {j.get('company_name', 'N/A')} ({j.get('_id', 'N/A')})" for j in jobs),
+            (j.get('_id') for j in jobs)
+        ))
+        resume_options = dict(zip(
+            (f"{r.get('candidate_name', 'N/A')} ({r.get('candidate_email', 'N/A')})" for r in resumes),
+            (r.get('_id') for r in resumes)
+        ))
 
         # Selection inputs
         col1, col2 = st.columns(2)
@@ -137,7 +152,11 @@ def display():
                     try:
                         resp = evaluate_single_api(resume_id, job_id)
                         if resp and resp.status_code == 200:
-                            result = resp.json().get("evaluation", {})
+                            result = response_json(resp).get("evaluation", {})
+                            # de-duplicate matched skills once here (order kept) rather than on every rerun's display
+                            analysis = result.get('analysis')
+                            if isinstance(analysis, dict) and analysis.get('matched_skills'):
+                                analysis['matched_skills'] = list(dict.fromkeys(analysis['matched_skills']))
                             st.session_state.single_result = result
                             st.success("✅ Evaluation completed successfully!")
                         else:
@@ -170,7 +189,8 @@ def display():
                     try:
                         resp = evaluate_batch_api(job_id_batch)
                         if resp and resp.status_code == 200:
-                            st.session_state.batch_results = resp.json()
+                            set_batch_results(response_json(resp))
+                            save_batch_results(job_id_batch, resp.content)
                             st.success("✅ Batch evaluation completed successfully!")
                             st.rerun()  # Refresh to show results
                         else:
@@ -188,6 +208,73 @@ def display():
         else:
             st.info("📊 Run a batch evaluation first to see analytics")
 
+def set_batch_results(batch_results):
+    """Store new batch results in session state, with their identity and summary percentages worked out once"""
+    st.session_state.batch_results = batch_results
+    if batch_results:
+        st.session_state.batch_results_id = uuid.uuid4().hex
+        summary = batch_results.get('summary', {})
+        total = max(batch_results.get('total_evaluated', 1), 1)
+        st.session_state.batch_summary_pct = {
+            key: f"{summary.get(key, 0) / total * 100:.1f}%"
+            for key in ('high_matches', 'medium_matches', 'low_matches')
+        }
+
+VERDICT_ORDER = ['LOW', 'MEDIUM', 'HIGH']
+VERDICT_COLORS = {'HIGH': '#00CC96', 'MEDIUM': '#FFA15A', 'LOW': '#EF553B'}
+VERDICT_EMOJI = {'HIGH': '🟢', 'MEDIUM': '🟡', 'LOW': '🔴'}
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _prep_batch(results_id: str, _evaluations: List[dict]) -> Dict[str, Any]:
+    """DataFrame and aggregates for one batch result, shared by the results table, filters and analytics"""
+    df = pd.DataFrame(_evaluations)
+    
+    # Pull the nested analysis fields the filters need into columns once, instead of per filter per rerun
+    analysis = df.get('analysis', pd.Series(None, index=df.index, dtype=object))
+    analysis = analysis.map(lambda a: a if isinstance(a, dict) else {})
+    df['_resume_exp'] = pd.to_numeric(
+        analysis.map(lambda a: (a.get('experience_details') or {}).get('resume_experience', 0)),
+        errors='coerce'
+    ).fillna(0)
+    df['_matched_skills'] = analysis.map(lambda a: list(dict.fromkeys(a.get('matched_skills') or ())))
+    df['_matched_set'] = df['_matched_skills'].map(frozenset)
+    # display timestamps parsed in one vectorized call, once per batch rather than per rerun
+    df['_evaluated_at'] = (
+        pd.to_datetime(df['evaluated_at'], errors='coerce', format='ISO8601').dt.strftime('%Y-%m-%d %H:%M').fillna('N/A')
+        if 'evaluated_at' in df.columns else 'N/A'
+    )
+    if 'verdict' in df.columns:
+        # int8 codes for filtering/counting; ordered so a descending sort lists HIGH first
+        df['verdict'] = pd.Categorical(df['verdict'], categories=VERDICT_ORDER, ordered=True)
+    
+    # one row per matched skill across every evaluation, in evaluation order
+    all_skills = analysis.map(lambda a: a.get('matched_skills') or []).explode().dropna()
+    
+    # Experience vs score points; non-numeric experience and outliers above 50 years are left out
+    exp_data = []
+    for a, evaluation in zip(analysis, _evaluations):
+        resume_exp = (a.get('experience_details') or {}).get('resume_experience', 0)
+        if isinstance(resume_exp, (int, float)) and resume_exp <= 50:
+            exp_data.append({
+                'experience': resume_exp,
+                'relevance_score': evaluation.get('relevance_score', 0),
+                'verdict': evaluation.get('verdict', '')
+            })
+    
+    return {
+        'df': df,
+        'skill_options': all_skills.unique().tolist(),
+        'top_skills': all_skills.value_counts().head(10),
+        'verdict_counts': df['verdict'].value_counts().loc[lambda c: c > 0] if 'verdict' in df.columns else pd.Series(dtype=int),
+        'exp_df': pd.DataFrame(exp_data),
+    }
+
+def prep_batch_results(batch_results) -> Dict[str, Any]:
+    """_prep_batch for the session's current batch results; reruns reuse it until a new batch is run"""
+    if 'batch_results_id' not in st.session_state:
+        st.session_state.batch_results_id = uuid.uuid4().hex
+    return _prep_batch(st.session_state.batch_results_id, batch_results.get('evaluations', []))
+
 def display_single_evaluation_result(result):
     """Display single evaluation result in a professional format"""
     st.markdown("---")
@@ -203,7 +290,7 @@ def display_single_evaluation_result(result):
         st.metric("🌟 Soft Match", f"{result.get('soft_match_score', 0):.1f}%")
     with col4:
         verdict = result.get('verdict', 'N/A')
-        color = {"HIGH": "🟢", "MEDIUM": "🟡", "LOW": "🔴"}.get(verdict, "⚪")
+        color = VERDICT_EMOJI.get(verdict, "⚪")
         st.metric("📝 Verdict", f"{color} {verdict}")
 
     # Analysis details
@@ -215,7 +302,7 @@ def display_single_evaluation_result(result):
         st.markdown("#### ✅ Matched Skills")
         matched_skills = analysis.get('matched_skills', [])
         if matched_skills:
-            for skill in set(matched_skills):  # Remove duplicates
+            for skill in matched_skills:  # de-duplicated when the result was stored
                 st.markdown(f"• {skill}")
         else:
             st.markdown("*No matched skills found*")
@@ -272,33 +359,31 @@ def display_batch_evaluation_results(batch_results):
         st.warning("⚠️ No evaluation results found")
         return
     
-    df = pd.DataFrame(evaluations)
-    
-    # Apply filters from sidebar
-    filtered_df = df[
-        (df['relevance_score'] >= st.session_state.get('score_filter', [0, 100])[0]) &
-        (df['relevance_score'] <= st.session_state.get('score_filter', [0, 100])[1]) &
-        (df['verdict'].isin(st.session_state.get('verdict_filter', ['HIGH', 'MEDIUM', 'LOW'])))
-    ]
-    
-    # Experience filter
-    if 'experience_details' in df.columns:
-        exp_filter = st.session_state.get('exp_filter', [0, 50])
-        filtered_df = filtered_df[
-            filtered_df['analysis'].apply(
-                lambda x: exp_filter[0] <= x.get('experience_details', {}).get('resume_experience', 0) <= exp_filter[1]
-            )
-        ]
+    df = prep_batch_results(batch_results)['df']
+    
+    # Apply filters from sidebar, as one expression (numexpr evaluates the score range in a single pass)
+    score_lo, score_hi = st.session_state.get('score_filter', [0, 100])
+    verdicts = list(st.session_state.get('verdict_filter', ['HIGH', 'MEDIUM', 'LOW']))
+    filtered_df = df.query("@score_lo <= relevance_score <= @score_hi and verdict in @verdicts")
+    
+    # Experience filter (the full slider range means no filter, so outliers above 50 years stay listed)
+    exp_filter = st.session_state.get('exp_filter', [0, 50])
+    if tuple(exp_filter) != (0, 50):
+        filtered_df = filtered_df[filtered_df['_resume_exp'].between(exp_filter[0], exp_filter[1])]
     
     # Skill filter
     skill_filter = st.session_state.get('skill_filter', [])
     if skill_filter:
-        filtered_df = filtered_df[
-            filtered_df['analysis'].apply(
-                lambda x: any(skill in x.get('matched_skills', []) for skill in skill_filter)
-            )
-        ]
+        skill_filter_set = frozenset(skill_filter)
+        filtered_df = filtered_df[filtered_df['_matched_set'].map(lambda s: not skill_filter_set.isdisjoint(s))]
     
+    _batch_table(filtered_df, len(df))
+
+AGGRID_MIN_ROWS = 1000
+
+@st.fragment
+def _batch_table(filtered_df, total):
+    """Sort controls, results table and export; changing them reruns only this block, not the whole page"""
     # Sorting options
     col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
@@ -331,55 +416,63 @@ def display_batch_evaluation_results(batch_results):
     if show_count != 'All':
         filtered_df = filtered_df.head(show_count)
     
-    st.markdown(f"**Showing {len(filtered_df)} of {len(df)} total evaluations**")
+    st.markdown(f"**Showing {len(filtered_df)} of {total} total evaluations**")
     
     # Create display table
     display_df = create_display_dataframe(filtered_df)
     
-    # Display the table
-    st.dataframe(
-        display_df,
-        use_container_width=True,
-        height=600,
-        column_config={
-            "Relevance Score": st.column_config.ProgressColumn(
-                "Relevance Score",
-                help="Overall relevance score",
-                min_value=0,
-                max_value=100,
-                format="%.1f%%"
-            ),
-            "Hard Match": st.column_config.ProgressColumn(
-                "Hard Match",
-                help="Hard skills match score",
-                min_value=0,
-                max_value=100,
-                format="%.1f%%"
-            ),
-            "Soft Match": st.column_config.ProgressColumn(
-                "Soft Match", 
-                help="Soft skills match score",
-                min_value=0,
-                max_value=100,
-                format="%.1f%%"
-            ),
-            "Verdict": st.column_config.TextColumn(
-                "Verdict",
-                help="Final verdict",
-                width="small"
-            )
-        }
-    )
+    # Display the table; large ones go to AgGrid (when installed), which filters, sorts and pages in the browser
+    if AgGrid is not None and len(display_df) > AGGRID_MIN_ROWS:
+        gb = GridOptionsBuilder.from_dataframe(display_df)
+        gb.configure_default_column(filterable=True, sortable=True, resizable=True)
+        gb.configure_pagination(paginationAutoPageSize=True)
+        AgGrid(display_df, gridOptions=gb.build(), height=600, enable_enterprise_modules=False, key="batch_grid")
+    else:
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            height=600,
+            column_config={
+                "Relevance Score": st.column_config.ProgressColumn(
+                    "Relevance Score",
+                    help="Overall relevance score",
+                    min_value=0,
+                    max_value=100,
+                    format="%.1f%%"
+                ),
+                "Hard Match": st.column_config.ProgressColumn(
+                    "Hard Match",
+                    help="Hard skills match score",
+                    min_value=0,
+                    max_value=100,
+                    format="%.1f%%"
+                ),
+                "Soft Match": st.column_config.ProgressColumn(
+                    "Soft Match", 
+                    help="Soft skills match score",
+                    min_value=0,
+                    max_value=100,
+                    format="%.1f%%"
+                ),
+                "Verdict": st.column_config.TextColumn(
+                    "Verdict",
+                    help="Final verdict",
+                    width="small"
+                )
+            }
+        )
     
     # Export functionality
     if st.button("📥 Export Results to CSV", use_container_width=True):
-        csv = display_df.to_csv(index=False)
+        # gzip-compressed straight into a byte buffer, written in chunks, instead of one big CSV string
+        buf = io.BytesIO()
+        display_df.to_csv(buf, index=False, compression='gzip', chunksize=10000)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         st.download_button(
             label="💾 Download CSV File",
-            data=csv,
-            file_name=f"batch_evaluation_results_{timestamp}.csv",
-            mime="text/csv",
+            data=buf.getvalue(),
+            file_name=f"batch_evaluation_results_{timestamp}.csv.gz",
+            mime="application/gzip",
             use_container_width=True
         )
 
@@ -387,67 +480,79 @@ def create_display_dataframe(df):
     """Create a clean dataframe for display"""
     display_data = []
     
-    for _, row in df.iterrows():
-        analysis = row.get('analysis', {})
-        matched_skills = list(set(analysis.get('matched_skills', [])))  # Remove duplicates
+    # column arrays pulled once and zipped, rather than a pd.Series built per row by iterrows()
+    def column(name, default):
+        return df[name].to_numpy() if name in df.columns else [default] * len(df)
+    
+    # _matched_skills and _evaluated_at were prepared once per batch in _prep_batch
+    for resume_id, relevance, hard, soft, verdict, analysis, evaluated, matched_skills in zip(
+        column('resume_id', ''), column('relevance_score', 0), column('hard_match_score', 0),
+        column('soft_match_score', 0), column('verdict', ''), column('analysis', {}), column('_evaluated_at', 'N/A'),
+        column('_matched_skills', [])
+    ):
+        if not isinstance(analysis, dict):
+            analysis = {}
         missing_skills = analysis.get('missing_skills', [])
         exp_details = analysis.get('experience_details', {})
         
         display_data.append({
-            'Resume ID': row.get('resume_id', '')[:8] + '...',
-            'Relevance Score': row.get('relevance_score', 0),
-            'Hard Match': row.get('hard_match_score', 0),
-            'Soft Match': row.get('soft_match_score', 0),
-            'Verdict': row.get('verdict', ''),
+            'Resume ID': resume_id[:8] + '...',
+            'Relevance Score': relevance,
+            'Hard Match': hard,
+            'Soft Match': soft,
+            'Verdict': verdict,
             'Matched Skills': ', '.join(matched_skills[:3]) + ('...' if len(matched_skills) > 3 else ''),
             'Missing Skills': ', '.join(missing_skills[:2]) + ('...' if len(missing_skills) > 2 else ''),
             'Experience': f"{exp_details.get('resume_experience', 'N/A')} years",
-            'Evaluated At': pd.to_datetime(row.get('evaluated_at', '')).strftime('%Y-%m-%d %H:%M') if row.get('evaluated_at') else 'N/A'
+            'Evaluated At': evaluated
         })
     
     return pd.DataFrame(display_data)
 
-def display_analytics_dashboard(batch_results):
-    """Display analytics charts and insights"""
-    st.markdown("### 📈 Analytics Dashboard")
-    
-    evaluations = batch_results.get('evaluations', [])
-    if not evaluations:
-        st.warning("⚠️ No data available for analytics")
-        return
-    
-    df = pd.DataFrame(evaluations)
+SCATTER_MAX_POINTS = 2000
+
+def _scatter_sample(df: pd.DataFrame, limit: int = SCATTER_MAX_POINTS) -> pd.DataFrame:
+    """At most ~limit rows of df for a scatter plot, sampled evenly per verdict so small verdicts stay visible"""
+    if len(df) <= limit:
+        return df
+    per_verdict = max(1, limit // max(1, df['verdict'].nunique()))
+    # shuffle once, then keep the first per_verdict rows of each verdict (all of them for smaller verdicts)
+    return df.sample(frac=1, random_state=0).groupby('verdict', observed=True, dropna=False).head(per_verdict)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _analytics_figures(results_id: str, _prep: Dict[str, Any]) -> Dict[str, str]:
+    """Plotly figure JSON for one batch result's analytics charts; reruns skip building the figures"""
+    # plotly is only needed once there are batch results to chart; keep it off the page's import path
+    import plotly.express as px
     
-    # Summary statistics
-    col1, col2 = st.columns(2)
+    df = _prep['df']
+    figures = {}
     
-    with col1:
-        # Score distribution
-        fig_hist = px.histogram(
-            df, 
-            x='relevance_score',
-            nbins=20,
-            title='📊 Relevance Score Distribution',
-            labels={'relevance_score': 'Relevance Score (%)', 'count': 'Number of Candidates'}
-        )
-        fig_hist.update_layout(height=400)
-        st.plotly_chart(fig_hist, use_container_width=True)
+    # Score distribution
+    fig_hist = px.histogram(
+        df, 
+        x='relevance_score',
+        nbins=20,
+        title='📊 Relevance Score Distribution',
+        labels={'relevance_score': 'Relevance Score (%)', 'count': 'Number of Candidates'}
+    )
+    fig_hist.update_layout(height=400)
+    figures['hist'] = fig_hist.to_json()
     
-    with col2:
-        # Verdict distribution
-        verdict_counts = df['verdict'].value_counts()
-        fig_pie = px.pie(
-            values=verdict_counts.values,
-            names=verdict_counts.index,
-            title='🎯 Verdict Distribution',
-            color_discrete_map={'HIGH': '#00CC96', 'MEDIUM': '#FFA15A', 'LOW': '#EF553B'}
-        )
-        fig_pie.update_layout(height=400)
-        st.plotly_chart(fig_pie, use_container_width=True)
+    # Verdict distribution
+    verdict_counts = _prep['verdict_counts']
+    fig_pie = px.pie(
+        values=verdict_counts.values,
+        names=verdict_counts.index,
+        title='🎯 Verdict Distribution',
+        color_discrete_map=VERDICT_COLORS
+    )
+    fig_pie.update_layout(height=400)
+    figures['pie'] = fig_pie.to_json()
     
     # Score comparison
     fig_scatter = px.scatter(
-        df,
+        _scatter_sample(df),
         x='hard_match_score',
         y='soft_match_score',
         color='verdict',
@@ -457,19 +562,14 @@ def display_analytics_dashboard(batch_results):
             'hard_match_score': 'Hard Match Score (%)',
             'soft_match_score': 'Soft Match Score (%)'
         },
-        color_discrete_map={'HIGH': '#00CC96', 'MEDIUM': '#FFA15A', 'LOW': '#EF553B'}
+        color_discrete_map=VERDICT_COLORS
     )
     fig_scatter.update_layout(height=500)
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    figures['scatter'] = fig_scatter.to_json()
     
     # Top skills analysis
-    all_skills = []
-    for evaluation in evaluations:
-        matched_skills = evaluation.get('analysis', {}).get('matched_skills', [])
-        all_skills.extend(matched_skills)
-    
-    if all_skills:
-        skill_counts = pd.Series(all_skills).value_counts().head(10)
+    skill_counts = _prep['top_skills']
+    if not skill_counts.empty:
         fig_bar = px.bar(
             x=skill_counts.values,
             y=skill_counts.index,
@@ -478,30 +578,52 @@ def display_analytics_dashboard(batch_results):
             labels={'x': 'Frequency', 'y': 'Skills'}
         )
         fig_bar.update_layout(height=400)
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-    # Experience vs Score analysis
-    exp_data = []
-    for evaluation in evaluations:
-        exp_details = evaluation.get('analysis', {}).get('experience_details', {})
-        resume_exp = exp_details.get('resume_experience', 0)
-        if isinstance(resume_exp, (int, float)) and resume_exp <= 50:  # Filter outliers
-            exp_data.append({
-                'experience': resume_exp,
-                'relevance_score': evaluation.get('relevance_score', 0),
-                'verdict': evaluation.get('verdict', '')
-            })
+        figures['skills'] = fig_bar.to_json()
     
-    if exp_data:
-        exp_df = pd.DataFrame(exp_data)
+    # Experience vs Score analysis
+    exp_df = _prep['exp_df']
+    if not exp_df.empty:
         fig_exp = px.scatter(
-            exp_df,
+            _scatter_sample(exp_df),
             x='experience',
             y='relevance_score',
             color='verdict',
             title='💼 Experience vs Relevance Score',
             labels={'experience': 'Years of Experience', 'relevance_score': 'Relevance Score (%)'},
-            color_discrete_map={'HIGH': '#00CC96', 'MEDIUM': '#FFA15A', 'LOW': '#EF553B'}
+            color_discrete_map=VERDICT_COLORS
         )
         fig_exp.update_layout(height=400)
-        st.plotly_chart(fig_exp, use_container_width=True)
+        figures['experience'] = fig_exp.to_json()
+    
+    return figures
+
+def display_analytics_dashboard(batch_results):
+    """Display analytics charts and insights"""
+    import plotly.io as pio
+    
+    st.markdown("### 📈 Analytics Dashboard")
+    
+    evaluations = batch_results.get('evaluations', [])
+    if not evaluations:
+        st.warning("⚠️ No data available for analytics")
+        return
+    
+    prep = prep_batch_results(batch_results)  # also assigns batch_results_id if the batch predates it
+    figures = _analytics_figures(st.session_state.batch_results_id, prep)
+    
+    def chart(key):
+        if key in figures:
+            st.plotly_chart(pio.from_json(figures[key]), use_container_width=True)
+    
+    # Summary statistics
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        chart('hist')
+    
+    with col2:
+        chart('pie')
+    
+    chart('scatter')
+    chart('skills')
+    chart('experience')
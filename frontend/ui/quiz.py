@@ -11,13 +11,16 @@ def display():
 
     quiz_data = st.session_state.quiz_questions
     questions = quiz_data.get("questions", [])
-    answers = {}
+    answer_indices = []
 
     for i, q in enumerate(questions):
         st.markdown(f"**Question {i+1}:** {q['question']}")
         options = q['options']
-        answer = st.radio(f"Options for question {i+1}", options, key=f"question_{i}")
-        answers[i] = options.index(answer)
+        # the radio returns the chosen option's index directly; labels come from format_func
+        answer_indices.append(st.radio(
+            f"Options for question {i+1}", range(len(options)),
+            format_func=options.__getitem__, key=f"question_{i}"
+        ))
 
     if st.button("Submit Answers"):
         quiz_id = quiz_data.get("quiz_id")
@@ -25,7 +28,6 @@ def display():
 
         if quiz_id and resume_id:
             with st.spinner("Submitting answers..."):
-                answer_indices = [answers[i] for i in range(len(questions))]
                 resp = submit_quiz_api(quiz_id, resume_id, answer_indices)
 
                 if resp and resp.status_code == 200:
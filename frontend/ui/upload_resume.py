@@ -1,13 +1,13 @@
 # frontend/ui/upload_resume.py
 import streamlit as st
-from .utils import fetch_jobs, apply_to_job_api, bulk_upload_resumes_api
+from .utils import fetch_jobs_cached, apply_to_job_api, bulk_upload_resumes_api
 
 def display():
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("### Apply for a Job")
     st.caption("Upload a resume to apply")
 
-    jobs = fetch_jobs(limit=50)
+    jobs = fetch_jobs_cached(limit=50)
     job_map = {f"{j.get('job_title','Untitled')} — {j.get('company_name','Company')}": j for j in jobs}
     choice = st.selectbox("Select a job", list(job_map.keys()) or ["No jobs available"])
     job = job_map.get(choice)
@@ -50,10 +50,18 @@ def display():
         )
 
         if st.button("Upload Resumes", key="bulk_upload_button", disabled=not (bulk_job and uploaded_files)):
-            with st.spinner(f"Uploading {len(uploaded_files)} resumes..."):
-                resp = bulk_upload_resumes_api(job_id=bulk_job.get("_id", ""), files=uploaded_files)
-                if resp and resp.status_code == 200:
-                    st.success(f"Successfully uploaded {len(uploaded_files)} resumes.")
-                else:
-                    st.error("Bulk upload failed. Please try again.")
+            progress = st.progress(0.0, text=f"Uploading {len(uploaded_files)} resumes...")
+            responses = bulk_upload_resumes_api(
+                job_id=bulk_job.get("_id", ""),
+                files=uploaded_files,
+                on_progress=lambda done, total: progress.progress(done / total, text=f"Uploaded {done} of {total} resumes...")
+            )
+            progress.empty()
+            failed = sum(1 for resp in responses if resp is None or resp.status_code != 200)
+            if not failed:
+                st.success(f"Successfully uploaded {len(uploaded_files)} resumes.")
+            elif failed < len(responses):
+                st.warning(f"Some resumes were not uploaded ({failed} of {len(responses)} batches failed). Please retry the missing files.")
+            else:
+                st.error("Bulk upload failed. Please try again.")
         st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
@@ -1,10 +1,111 @@
 # frontend/ui/utils.py
 import streamlit as st
+import asyncio
+import functools
+import gzip
+import hashlib
+import os
+import re
+import threading
+import time
+import orjson
 import requests
-from typing import List, Optional
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, List, Optional, Tuple
 
 API_BASE_URL = "http://localhost:8000/api"
 
+# endpoint URLs, joined once at import rather than formatted on every call
+_URL = {
+    "jobs": f"{API_BASE_URL}/jobs",
+    "resumes": f"{API_BASE_URL}/resumes",
+    "apply": f"{API_BASE_URL}/apply",
+    "upload_job": f"{API_BASE_URL}/upload-job",
+    "evaluate_resume": f"{API_BASE_URL}/evaluate-resume",
+    "evaluate_batch": f"{API_BASE_URL}/evaluate-batch",
+    "bulk_upload": f"{API_BASE_URL}/bulk-upload-resumes",
+}
+
+# (connect, read) seconds per endpoint: a dead backend fails within the connect budget, while the
+# evaluation calls keep their long read allowance
+_CONNECT_TIMEOUT = 3.0
+_TIMEOUTS = {
+    "jobs": (_CONNECT_TIMEOUT, 8.0),
+    "resumes": (_CONNECT_TIMEOUT, 8.0),
+    "apply": (_CONNECT_TIMEOUT, 60.0),
+    "upload_job": (_CONNECT_TIMEOUT, 30.0),
+    "evaluate_resume": (_CONNECT_TIMEOUT, 120.0),
+    "evaluate_batch": (_CONNECT_TIMEOUT, 600.0),
+    "evaluations": (_CONNECT_TIMEOUT, 30.0),
+    "bulk_upload": (_CONNECT_TIMEOUT, 300.0),
+}
+
+@functools.lru_cache(maxsize=256)
+def _eval_url(job_id: str) -> str:
+    return f"{API_BASE_URL}/job-evaluations/{job_id}"
+
+@st.cache_resource(show_spinner=False)
+def http_client() -> httpx.Client:
+    """Pooled client shared across reruns and sessions: keep-alive connections, HTTP/2 where the backend offers it."""
+    return httpx.Client(http2=True, timeout=httpx.Timeout(60.0, connect=_CONNECT_TIMEOUT))
+
+@st.cache_resource(show_spinner=False)
+def _session() -> requests.Session:
+    """Shared requests session, so calls to the backend reuse pooled keep-alive connections."""
+    session = requests.Session()
+    session.headers.update({"Accept": "application/json"})
+    # Transient failures (connection drops, timeouts, gateway errors) are retried with capped, jittered
+    # exponential backoff for GETs only; the POST endpoints aren't idempotent. 4xx and other 5xx fail fast.
+    retry = Retry(
+        total=3,
+        backoff_factor=1.0,
+        backoff_max=30.0,
+        backoff_jitter=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# (url, params, api key) -> (ETag, parsed body) of the last 200, replayed as If-None-Match on the next fetch
+_ETAG_CACHE_MAX = 256
+_etag_cache: dict = {}
+
+def _conditional_get(url: str, params: dict, api_key: Optional[str], timeout: Tuple[float, float]) -> dict:
+    """GET url's JSON body; an unchanged listing comes back as a bodiless 304 and the stored body is reused."""
+    key = (url, tuple(sorted(params.items())), api_key)
+    etag, cached = _etag_cache.get(key, (None, None))
+    headers = {"X-API-Key": api_key} if api_key else {}
+    if etag:
+        headers["If-None-Match"] = etag
+    resp = _session().get(url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached is not None:
+        return cached
+    resp.raise_for_status()
+    body = response_json(resp)
+    if resp.headers.get("ETag"):
+        if len(_etag_cache) >= _ETAG_CACHE_MAX:
+            _etag_cache.clear()
+        _etag_cache[key] = (resp.headers["ETag"], body)
+    return body
+
+def response_json(resp):
+    """A response's JSON body, decoded by orjson straight from the raw bytes."""
+    return orjson.loads(resp.content)
+
+def _clean(params: dict) -> dict:
+    """params without the None values, so unset optional filters aren't sent."""
+    return {k: v for k, v in params.items() if v is not None}
+
 def _headers():
     """Gets authentication headers for API requests."""
     headers = {}
@@ -15,30 +116,80 @@ def _headers():
 def fetch_jobs(limit: int = 50) -> List[dict]:
     """Fetches a list of jobs from the API."""
     try:
-        resp = requests.get(f"{API_BASE_URL}/jobs", params={"limit": limit}, timeout=8)
+        resp = _session().get(_URL["jobs"], params={"limit": limit}, timeout=_TIMEOUTS["jobs"])
         if resp.ok:
-            return resp.json().get("jobs", [])
+            return response_json(resp).get("jobs", [])
     except requests.RequestException:
         pass
     return []
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_jobs_cached(limit: int) -> List[dict]:
+    # raises on failure so an unreachable backend is not cached as "no jobs"
+    return _conditional_get(_URL["jobs"], {"limit": limit}, None, timeout=_TIMEOUTS["jobs"]).get("jobs", [])
+
+def fetch_jobs_cached(limit: int = 50) -> List[dict]:
+    """fetch_jobs, reused across Streamlit reruns for up to a minute."""
+    try:
+        return _fetch_jobs_cached(limit)
+    except (requests.RequestException, ValueError):
+        return []
+
+def clear_jobs_cache():
+    """Drop the cached job list (after a job is posted, or on a manual refresh)."""
+    _fetch_jobs_cached.clear()
+
 def fetch_resumes_api(limit: int = 10) -> List[dict]:
     """Fetches a list of resumes from the API."""
     try:
         # Corrected: Added headers=_headers() to include the API key
-        resp = requests.get(f"{API_BASE_URL}/resumes", params={"limit": limit}, headers=_headers(), timeout=8)
+        resp = _session().get(_URL["resumes"], params={"limit": limit}, headers=_headers(), timeout=_TIMEOUTS["resumes"])
         if resp.ok:
-            return resp.json().get("resumes", [])
+            return response_json(resp).get("resumes", [])
     except requests.RequestException:
         pass
     return []
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_resumes_cached(limit: int, api_key: Optional[str]) -> List[dict]:
+    # keyed on the API key too, so one recruiter's cached list is never served to another
+    return _conditional_get(_URL["resumes"], {"limit": limit}, api_key, timeout=_TIMEOUTS["resumes"]).get("resumes", [])
+
+def fetch_resumes_cached(limit: int = 10) -> List[dict]:
+    """fetch_resumes_api, reused across Streamlit reruns for up to a minute."""
+    try:
+        return _fetch_resumes_cached(limit, st.session_state.get("api_key"))
+    except (requests.RequestException, ValueError):
+        return []
+
+def clear_resumes_cache():
+    """Drop the cached resume list (after uploads, or on a manual refresh)."""
+    _fetch_resumes_cached.clear()
+
+def fetch_dashboard_bundle(job_limit: int = 50, resume_limit: int = 10) -> Tuple[List[dict], List[dict]]:
+    """fetch_jobs_cached and fetch_resumes_cached side by side, so a cold load waits for the slower one, not both."""
+    ctx = get_script_run_ctx()
+
+    def run(fetch, limit):
+        # the cached fetchers read session state, which needs the page's script context in this thread
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch(limit)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        jobs = executor.submit(run, fetch_jobs_cached, job_limit)
+        resumes = executor.submit(run, fetch_resumes_cached, resume_limit)
+        return jobs.result(), resumes.result()
+
 def apply_to_job_api(job_id: str, file, candidate_email: str, candidate_name: str):
     """Submits a job application to the API."""
-    files = {'file': (file.name, file.getvalue())}
-    params = {'job_id': job_id, 'candidate_email': candidate_email, 'candidate_name': candidate_name}
+    file.seek(0)
+    files = {'file': (file.name, file, file.type or 'application/octet-stream')}
+    params = _clean({'job_id': job_id, 'candidate_email': candidate_email, 'candidate_name': candidate_name})
     try:
-        return requests.post(f"{API_BASE_URL}/apply", files=files, params=params, timeout=60)
+        resp = _session().post(_URL["apply"], files=files, params=params, timeout=_TIMEOUTS["apply"])
+        if resp.ok:
+            clear_resumes_cache()
+        return resp
     except requests.RequestException:
         return None
 
@@ -53,13 +204,16 @@ def create_job_api(job_text: str, job_title: str, company_name: str, location: s
     try:
         # Send job_text as form data with key 'job_text_form' to match backend Form(...)
         form_data = {'job_text_form': job_text}
-        return requests.post(
-            f"{API_BASE_URL}/upload-job",
+        resp = _session().post(
+            _URL["upload_job"],
             params=params,
             headers=_headers(),
             data=form_data,
-            timeout=30
+            timeout=_TIMEOUTS["upload_job"]
         )
+        if resp.ok:
+            clear_jobs_cache()
+        return resp
     except requests.RequestException:
         return None
 
@@ -67,7 +221,10 @@ def evaluate_single_api(resume_id: str, job_id: str):
     """Requests a single resume evaluation from the API."""
     params = {'resume_id': resume_id, 'job_id': job_id}
     try:
-        return requests.post(f"{API_BASE_URL}/evaluate-resume", params=params, headers=_headers(), timeout=120)
+        resp = _session().post(_URL["evaluate_resume"], params=params, headers=_headers(), timeout=_TIMEOUTS["evaluate_resume"])
+        if resp.ok:
+            clear_evaluations_cache()
+        return resp
     except requests.RequestException:
         return None
 
@@ -75,25 +232,105 @@ def evaluate_batch_api(job_id: str):
     """Requests a batch resume evaluation for a job from the API."""
     params = {'job_id': job_id}
     try:
-        return requests.post(f"{API_BASE_URL}/evaluate-batch", params=params, headers=_headers(), timeout=600)
+        resp = _session().post(_URL["evaluate_batch"], params=params, headers=_headers(), timeout=_TIMEOUTS["evaluate_batch"])
+        if resp.ok:
+            clear_evaluations_cache()
+        return resp
     except requests.RequestException:
         return None
 
+BATCH_CACHE_DIR = Path(os.getenv("BATCH_CACHE_DIR", ".cache"))
+BATCH_CACHE_TTL = int(os.getenv("BATCH_CACHE_TTL", str(24 * 3600)))  # seconds
+
+def _batch_cache_prefix() -> str:
+    # hashed so the API key itself never lands in a file name
+    api_key = st.session_state.get("api_key") or ""
+    return "batch_" + hashlib.sha256(api_key.encode()).hexdigest()[:16] + "_"
+
+def save_batch_results(job_id: str, content: bytes):
+    """Keep a batch evaluation response on disk so a browser refresh doesn't mean re-running it."""
+    try:
+        BATCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BATCH_CACHE_DIR / (_batch_cache_prefix() + re.sub(r"[^\w-]", "_", str(job_id)) + ".json.gz")
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(content))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # the cache is best effort; the results are still in session state
+
+def load_latest_batch_results() -> Optional[dict]:
+    """The recruiter's most recent saved batch evaluation younger than BATCH_CACHE_TTL, if any."""
+    cutoff = time.time() - BATCH_CACHE_TTL
+    try:
+        fresh = [(p.stat().st_mtime, p) for p in BATCH_CACHE_DIR.glob(_batch_cache_prefix() + "*.json.gz")]
+        fresh = [entry for entry in fresh if entry[0] >= cutoff]
+        if not fresh:
+            return None
+        return orjson.loads(gzip.decompress(max(fresh)[1].read_bytes()))
+    except (OSError, EOFError, ValueError):
+        return None
+
 def fetch_evaluations_api(job_id: str, min_score: Optional[int] = None, verdict: Optional[str] = None):
     """Fetches evaluation results for a job from the API."""
-    params = {'min_score': min_score, 'verdict': verdict}
-    # Filter out None values
-    params = {k: v for k, v in params.items() if v is not None}
+    params = _clean({'min_score': min_score, 'verdict': verdict})
     try:
-        return requests.get(f"{API_BASE_URL}/job-evaluations/{job_id}", params=params, headers=_headers(), timeout=30)
+        return _session().get(_eval_url(job_id), params=params, headers=_headers(), timeout=_TIMEOUTS["evaluations"])
     except requests.RequestException:
         return None
 
-def bulk_upload_resumes_api(job_id: str, files: List):
-    """Submits multiple resumes for bulk upload."""
-    upload_files = [('files', (file.name, file.getvalue())) for file in files]
-    params = {'job_id': job_id}
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_evaluations_cached(job_id: str, min_score: Optional[int], verdict: Optional[str],
+                              api_key: Optional[str]) -> dict:
+    params = _clean({'min_score': min_score, 'verdict': verdict})
+    return _conditional_get(_eval_url(job_id), params, api_key, timeout=_TIMEOUTS["evaluations"])
+
+def fetch_evaluations_cached(job_id: str, min_score: Optional[int] = None, verdict: Optional[str] = None) -> Optional[dict]:
+    """fetch_evaluations_api's JSON body, reused across Streamlit reruns for up to a minute; None on failure."""
     try:
-        return requests.post(f"{API_BASE_URL}/bulk-upload-resumes", files=upload_files, params=params, headers=_headers(), timeout=300)
-    except requests.RequestException:
-        return None
\ No newline at end of file
+        return _fetch_evaluations_cached(job_id, min_score, verdict, st.session_state.get("api_key"))
+    except (requests.RequestException, ValueError):
+        return None
+
+def clear_evaluations_cache():
+    """Drop cached evaluation listings (after new evaluations are run)."""
+    _fetch_evaluations_cached.clear()
+
+# bulk uploads go out as several multipart requests in flight at once; each stays big enough
+# for the backend's batched parse + embed, while the next chunk uploads as the last one is processed
+BULK_UPLOAD_CHUNK = 16
+BULK_UPLOAD_CONCURRENCY = 4
+
+async def _bulk_upload(job_id: str, chunks: List[List], headers: dict,
+                       on_progress: Optional[Callable[[int, int], None]]) -> List[Optional[httpx.Response]]:
+    total = sum(len(chunk) for chunk in chunks)
+    done = 0
+    semaphore = asyncio.Semaphore(BULK_UPLOAD_CONCURRENCY)
+
+    async def upload(client: httpx.AsyncClient, chunk: List) -> Optional[httpx.Response]:
+        nonlocal done
+        # the upload objects themselves, read as the body is sent, rather than a getvalue() copy of every file
+        for file in chunk:
+            file.seek(0)
+        upload_files = [('files', (file.name, file, file.type or 'application/octet-stream')) for file in chunk]
+        async with semaphore:
+            try:
+                resp = await client.post(_URL["bulk_upload"], files=upload_files,
+                                         params={'job_id': job_id}, headers=headers)
+            except httpx.HTTPError:
+                resp = None
+        done += len(chunk)
+        if on_progress:
+            on_progress(done, total)
+        return resp
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(_TIMEOUTS["bulk_upload"][1], connect=_CONNECT_TIMEOUT)) as client:
+        return await asyncio.gather(*(upload(client, chunk) for chunk in chunks))
+
+def bulk_upload_resumes_api(job_id: str, files: List,
+                            on_progress: Optional[Callable[[int, int], None]] = None) -> List[Optional[httpx.Response]]:
+    """Submits multiple resumes for bulk upload. Returns one response (None on connection failure) per chunk."""
+    chunks = [files[i:i + BULK_UPLOAD_CHUNK] for i in range(0, len(files), BULK_UPLOAD_CHUNK)]
+    responses = asyncio.run(_bulk_upload(job_id, chunks, _headers(), on_progress))
+    if any(resp is not None and resp.is_success for resp in responses):
+        clear_resumes_cache()
+    return responses
\ No newline at end of file